@@ -0,0 +1,86 @@
+"""
+Cold import time of the app's startup modules versus the ML stack.
+Every step runs in a fresh interpreter, so nothing is already cached in sys.modules.
+
+    python bench_imports.py
+    python bench_imports.py --repeat 5
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app2.py")
+
+
+def startup_modules(path=APP):
+    """
+    Modules the app imports at module level, i.e. before the user picks a view,
+    in import order. Imports inside functions are deferred and not counted.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+    return list(dict.fromkeys(names))
+
+
+STARTUP_MODULES = startup_modules()
+
+HEAVY_MODULES = ["xgboost", "sklearn", "joblib"]
+
+STEPS = {
+    "app startup": "for name in STARTUP_MODULES: importlib.import_module(name)",
+    "startup + ml": "for name in STARTUP_MODULES + ['ml']: importlib.import_module(name)",
+    "startup + model load": (
+        "for name in STARTUP_MODULES: importlib.import_module(name)\n"
+        "importlib.import_module('model_registry').get_registry().get()"
+    ),
+    "startup + trainer": (
+        "for name in STARTUP_MODULES + ['ml']: importlib.import_module(name)\n"
+        "importlib.import_module('ml').build_model()"
+    ),
+}
+
+CHILD = """
+import importlib, json, sys, time
+STARTUP_MODULES = {startup!r}
+start = time.perf_counter()
+{body}
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def run_step(body):
+    code = CHILD.format(startup=STARTUP_MODULES, heavy=HEAVY_MODULES, body=body)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="best-of runs per step")
+    args = parser.parse_args()
+
+    header = f"{'step':<24}{'seconds':>9}  heavy modules loaded"
+    print(header)
+    print("-" * len(header))
+
+    for label, body in STEPS.items():
+        runs = [run_step(body) for _ in range(args.repeat)]
+        best = min(r["seconds"] for r in runs)
+        print(f"{label:<24}{best:>9.2f}  {', '.join(runs[0]['heavy']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compares the native multi-output XGBoost model against the per-label
+MultiOutputRegressor wrapper: training time, predict latency, pickle size
+and hold-out accuracy.
+
+    python bench_models.py ready_to_label.csv
+    python bench_models.py --synthetic 5000
+"""
+import argparse
+import pickle
+import random
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import train_test_split
+
+from label_sheet import FEATURE_VECTORIZER, LABEL_COLUMNS, label_chunk
+from ml import MODEL_KINDS, build_model
+
+
+def synthetic_sheet(n, seed=0):
+    """
+    Label sheet built from shuffled demo-lead sentences, labelled by the heuristic auto-fill.
+    """
+    from mock_leads import MOCK_LEADS_BATCH_1, MOCK_LEADS_BATCH_2
+
+    rng = random.Random(seed)
+    leads = MOCK_LEADS_BATCH_1 + MOCK_LEADS_BATCH_2
+    sentences = [s.strip() for m in leads for s in m["snippet"].split(".") if s.strip()]
+
+    rows = []
+    for _ in range(n):
+        lead = rng.choice(leads)
+        rows.append({
+            "Title": lead["title"],
+            "Snippet": ". ".join(rng.sample(sentences, rng.randint(1, 4))),
+            "URL": lead["url"],
+        })
+
+    return label_chunk(pd.DataFrame(rows))
+
+
+def timed(fn, repeat=1):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sheet", nargs="?", help="labelled sheet (ready_to_label.csv layout)")
+    parser.add_argument("--synthetic", type=int, default=3000, help="rows to synthesise when no sheet is given")
+    parser.add_argument("--repeat", type=int, default=5, help="best-of runs for predict timings")
+    args = parser.parse_args()
+
+    data = pd.read_csv(args.sheet) if args.sheet else synthetic_sheet(args.synthetic)
+    X = data[FEATURE_VECTORIZER.columns].astype(np.float32)
+    y = data[LABEL_COLUMNS].astype(float)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    print(f"{len(X_train)} train / {len(X_test)} test rows, {X.shape[1]} features\n")
+    header = f"{'model':<44}{'train s':>9}{'batch ms':>10}{'row ms':>9}{'size KB':>9}{'MAE':>7}"
+    print(header)
+    print("-" * len(header))
+
+    for kind, label in MODEL_KINDS.items():
+        model = build_model(kind)
+        _, train_s = timed(lambda: model.fit(X_train, y_train))
+
+        preds, batch_s = timed(lambda: model.predict(X_test), args.repeat)
+        _, row_s = timed(lambda: model.predict(X_test.iloc[:1]), args.repeat)
+
+        size_kb = len(pickle.dumps(model)) / 1024
+        mae = mean_absolute_error(y_test, np.clip(preds, 1, 10))
+
+        print(f"{label:<44}{train_s:>9.2f}{batch_s * 1000:>10.1f}{row_s * 1000:>9.2f}{size_kb:>9.0f}{mae:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import json
+import os
+
+import numpy as np
+
+from feature_vectorizer import SignalVectorizer
+
+COMPACT_SCHEMA_PATH = "model_schema.json"
+COMPACT_FORMAT = 1
+
+
+class CompactModel:
+    """
+    Evaluates exported XGBoost boosters with NumPy only: no sklearn, no xgboost.
+    Each booster's trees are packed into padded arrays and walked level by level,
+    all trees at once.
+    """
+
+    def __init__(self, boosters):
+        # boosters: list of (base_score, left, right, feature, threshold, default_left, leaf_value)
+        self.boosters = boosters
+        self.n_targets = sum(b[0].size for b in boosters)
+
+    @staticmethod
+    def _pack(booster_json):
+        learner = booster_json["learner"]
+        params = learner["learner_model_param"]
+        base_score = np.array(json.loads(params["base_score"]), dtype=np.float32).ravel()
+        n_out = int(params.get("num_target", "1"))
+
+        trees = learner["gradient_booster"]["model"]["trees"]
+        n_trees = len(trees)
+        width = max(int(t["tree_param"]["num_nodes"]) for t in trees)
+
+        left = np.full((n_trees, width), -1, dtype=np.int32)
+        right = np.full((n_trees, width), -1, dtype=np.int32)
+        feature = np.zeros((n_trees, width), dtype=np.int32)
+        threshold = np.zeros((n_trees, width), dtype=np.float32)
+        default_left = np.zeros((n_trees, width), dtype=bool)
+        leaf_value = np.zeros((n_trees, width, n_out), dtype=np.float32)
+
+        for i, t in enumerate(trees):
+            n = int(t["tree_param"]["num_nodes"])
+            left[i, :n] = t["left_children"]
+            right[i, :n] = t["right_children"]
+            feature[i, :n] = t["split_indices"]
+            threshold[i, :n] = t["split_conditions"]
+            default_left[i, :n] = t["default_left"]
+
+            if int(t["tree_param"]["size_leaf_vector"]) > 1:
+                # Vector leaves (multi_output_tree) live in base_weights, one block per node
+                leaf_value[i, :n] = np.asarray(t["base_weights"], dtype=np.float32).reshape(n, n_out)
+            else:
+                # Scalar leaves reuse split_conditions for the leaf value
+                leaf_value[i, :n, 0] = t["split_conditions"]
+
+        return base_score, left, right, feature, threshold, default_left, leaf_value
+
+    @classmethod
+    def from_booster_files(cls, paths):
+        boosters = []
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                boosters.append(cls._pack(json.load(f)))
+        return cls(boosters)
+
+    @staticmethod
+    def _predict_booster(X, booster):
+        base_score, left, right, feature, threshold, default_left, leaf_value = booster
+        n_rows = X.shape[0]
+        n_trees = left.shape[0]
+        tree_idx = np.arange(n_trees)
+
+        node = np.zeros((n_rows, n_trees), dtype=np.int32)
+        while True:
+            child_left = left[tree_idx, node]
+            active = child_left != -1
+            if not active.any():
+                break
+
+            value = X[np.arange(n_rows)[:, None], feature[tree_idx, node]]
+            go_left = np.where(np.isnan(value), default_left[tree_idx, node], value < threshold[tree_idx, node])
+            nxt = np.where(go_left, child_left, right[tree_idx, node])
+            node = np.where(active, nxt, node)
+
+        return base_score + leaf_value[tree_idx, node].sum(axis=1)
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        return np.hstack([self._predict_booster(X, b) for b in self.boosters])
+
+
+def _boosters(model):
+    # Native multi-output model: one booster; MultiOutputRegressor: one per label
+    if hasattr(model, "estimators_"):
+        return [est.get_booster() for est in model.estimators_]
+    return [model.get_booster()]
+
+
+def export_compact(model, model_kind, vectorizer, schema_path=COMPACT_SCHEMA_PATH):
+    """
+    Writes the boosters as native XGBoost JSON next to a small schema file.
+    The schema is written last, so a reader that sees it can load every booster it lists.
+    """
+    base = os.path.splitext(schema_path)[0]
+    booster_files = []
+
+    for i, booster in enumerate(_boosters(model)):
+        path = f"{base}.booster{i}.json"
+        tmp = f"{path}.tmp.json"
+        booster.save_model(tmp)
+        os.replace(tmp, path)
+        booster_files.append(os.path.basename(path))
+
+    schema = {
+        "format": COMPACT_FORMAT,
+        "model_kind": model_kind,
+        "boosters": booster_files,
+        "schema_version": vectorizer.version,
+        "feature_columns": vectorizer.columns,
+    }
+
+    tmp = f"{schema_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(schema, f)
+    os.replace(tmp, schema_path)
+
+
+def load_compact(schema_path=COMPACT_SCHEMA_PATH):
+    """
+    Returns (CompactModel, SignalVectorizer, schema dict).
+    """
+    with open(schema_path, encoding="utf-8") as f:
+        schema = json.load(f)
+
+    folder = os.path.dirname(schema_path)
+    model = CompactModel.from_booster_files([os.path.join(folder, name) for name in schema["boosters"]])
+
+    vectorizer = SignalVectorizer.__new__(SignalVectorizer)
+    vectorizer.__setstate__({"version": schema["schema_version"], "columns": schema["feature_columns"]})
+
+    return model, vectorizer, schema
@@ -0,0 +1,195 @@
+import re
+
+from keyword_matcher import KeywordMatcher
+
+# -------------------------
+# Patterns (compiled once)
+# -------------------------
+
+SENTENCE_SPLIT = re.compile(r"[.\n]")
+
+# Possessive senior role → company (TMT Law's Chief Operating Officer)
+POSSESSIVE_ROLE = re.compile(
+    r"\b([A-Z][A-Za-z0-9&.\-]{2,40}(?:\s+[A-Z0-9][A-Za-z0-9&.\-]{1,25}){0,4})['’]s\s+"
+    r"(?:Chief|Senior|Managing|Executive|Head|Vice\s+President|VP)\s+"
+    r"(?:Operating\s+)?"
+    r"(?:Officer|Director|Partner)\b",
+    re.IGNORECASE
+)
+
+# Role @ Company (LinkedIn-style, case-insensitive company)
+ROLE_AT_COMPANY = re.compile(
+    r"\b(?:head|lead|director|manager|vp|chief|growth|role|partner|ceo|cio)\b[^@]{0,40}"
+    r"(?:@| at | for )\s*"
+    r"([A-Za-z][A-Za-z0-9 &.\-]{2,50})",
+    re.IGNORECASE
+)
+
+# Title format: "Name - Company | LinkedIn" or "Name @ Company"
+HEADLINE = re.compile(
+    r'^[^\n\-@]{2,100}\s*[-@]\s*(.*?)\s*(?:\|\s*LinkedIn)?(?:\||$)',
+    re.MULTILINE
+)
+
+# STRONG global founder / C-level patterns (allowed globally)
+FOUNDER_AT = re.compile(
+    r'\b(?:founder|co[- ]?founder|ceo|cto|cfo|coo|director|partner|President|Chairman|Director|Member)\b'
+    r'(?:\s*&\s*\w+)?'
+    r'\s+(?:at|@|of)\s+'
+    r'([A-Z][A-Za-z0-9 &\.\-]{2,50})',
+    re.IGNORECASE
+)
+
+# Pattern: | Role, Company | or | Role, Company
+PIPE_ROLE_COMPANY = re.compile(
+    r'\|\s*(?:CEO|CFO|COO|CTO|Founder|Co-Founder|Managing Director|Founder & CEO)'
+    r'(?:\s*[&,]\s*\w+)?'  # Handles "Founder & CEO"
+    r',\s+([A-Z][A-Za-z0-9 &\.\-]{2,50})',
+    re.IGNORECASE
+)
+
+# Angel / investor phrasing (explicit)
+ANGEL_AT = re.compile(
+    r"\bAngel Investor\s+(?:at|@)\s+([A-Z][A-Za-z0-9 &.\-]{2,50})",
+    re.IGNORECASE
+)
+
+# Venture-style phrasing
+FOUNDED_VENTURE = re.compile(
+    r'\b(?:started|founded)\s+(?:the\s+)?(?:own\s+)?'
+    r'(?:venture|company|startup)?\s*(?:of|called)?\s*[‘"\']?'
+    r'([A-Z][A-Za-z0-9 &\.\-]{2,50})',
+    re.IGNORECASE
+)
+
+GLOBAL_PATTERNS = [FOUNDER_AT, PIPE_ROLE_COMPANY, ANGEL_AT, FOUNDED_VENTURE]
+
+MULTI_SPACE = re.compile(r'\s{2,}')
+SYMBOLS = re.compile(r'[^\w\s\-\&\.\,]')
+
+MONTHS = re.compile(r"\b(january|february|march|april|may|june|july|august|september|october|november|december)\b")
+YEARS = re.compile(r"\b(19|20)\d{2}\b")
+DIGITS_ONLY = re.compile(r"\d+")
+
+STOP_PHRASES = [
+    "years of", "experience", "worked with", "experience in",
+    "services", "solutions", "expansion", "linkedin"
+]
+
+DESCRIPTOR_BLOCKS = {
+    "career", "experience", "background", "journey", "early",
+    "age", "years", "industry", "field", "space",
+    "company", "companies", "organization", "organizations",
+    "venture", "ventures", "startup", "startups",
+    "business", "businesses", "firm", "firms"
+}
+
+
+class CompanyExtractor:
+    """
+    Pulls company candidates out of a SERP title + snippet.
+    Each sentence is visited once; headline matches are computed once per text.
+    """
+
+    def __init__(self, reject_keywords):
+        # Headline segments containing one of these (whole word) are roles, not companies
+        self.reject_matcher = KeywordMatcher({
+            "reject": [k.lower() for k in reject_keywords],
+        })
+
+    def is_rejected(self, text):
+        return self.reject_matcher.any_match(text.lower(), whole_word=True)
+
+    def headline_candidates(self, text):
+        candidates = []
+
+        for item in HEADLINE.findall(text):
+            item = item.strip()
+            item = MULTI_SPACE.sub(' ', item)  # collapse spaces
+
+            # Remove emoji and weird symbols
+            item = SYMBOLS.sub('', item)
+
+            # If headline has pipes, take first segment only
+            if "|" in item:
+                item = item.split("|")[0].strip()
+
+            # If multiple dash segments, take LAST segment (often company)
+            if " - " in item:
+                item = item.split(" - ")[-1].strip()
+
+            if not self.is_rejected(item) and len(item.strip()) > 2:
+                candidates.append(item.strip())
+
+        return candidates
+
+    def candidates(self, text):
+        """
+        Raw candidates in priority order (before cleaning).
+        """
+        found = []
+        headlines_added = False
+
+        for sentence in SENTENCE_SPLIT.split(text):
+            s = sentence.strip()
+            if not s:
+                continue
+
+            found.extend(POSSESSIVE_ROLE.findall(s))
+            found.extend(ROLE_AT_COMPANY.findall(s))
+
+            # Headlines are a property of the whole text: they only need to
+            # follow the first sentence's matches, repeats would be deduplicated anyway
+            if not headlines_added:
+                found.extend(self.headline_candidates(text))
+                headlines_added = True
+
+        for pattern in GLOBAL_PATTERNS:
+            found.extend(pattern.findall(text))
+
+        return found
+
+    @staticmethod
+    def clean(candidate):
+        """
+        Returns the cleaned company name, or "" if the candidate is not a company.
+        """
+        comp_clean = candidate.strip(" .,-·")
+        comp_lower = comp_clean.lower()
+
+        if MONTHS.search(comp_lower):
+            return ""
+
+        # HARD BLOCK: temporal phrases
+        if YEARS.search(comp_lower):
+            return ""
+
+        # HARD BLOCK: sentence fragments masquerading as companies
+        if comp_lower.startswith("a "):
+            return ""
+
+        if len(comp_clean) < 3:
+            return ""
+        if any(bad in comp_lower for bad in STOP_PHRASES):
+            return ""
+        if DIGITS_ONLY.fullmatch(comp_clean):
+            return ""
+
+        first_words = comp_lower.split()[:3]
+        if any(w in DESCRIPTOR_BLOCKS for w in first_words):
+            return ""
+
+        return comp_clean
+
+    def extract(self, text):
+        """
+        Ranked, deduplicated company names. The first entry is the enriched company.
+        """
+        companies = {}
+
+        for candidate in self.candidates(text):
+            cleaned = self.clean(candidate)
+            if cleaned:
+                companies.setdefault(cleaned, None)
+
+        return list(companies)
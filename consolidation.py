@@ -0,0 +1,211 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from first_pass import uae_keywords, mena_keywords
+from signals import Code, has_code
+
+# -------------------------
+# Patterns
+# -------------------------
+
+PERSONAL_EMAIL_PATTERN = re.compile(
+    r'\b[A-Za-z0-9._%+-]+@(?:gmail\.com|yahoo\.com|outlook\.com|hotmail\.com)\b',
+    re.IGNORECASE
+)
+
+COMPANY_MENTION = re.compile(r"\b(at|with)\s+([A-Z][A-Za-z0-9 &]{3,})")
+
+GEO_PATTERN = re.compile("|".join(re.escape(k) for k in uae_keywords + mena_keywords))
+
+ADDRESS_WORDS = [
+    "building", "street", "road", "avenue",
+    "precinct", "floor", "office", "po box"
+]
+
+# Source URL fragment -> label shown in "Enriched Social", in display order
+ENRICHMENT_DOMAINS = [
+    ("rocketreach.co", "RocketReach"),
+    ("zoominfo.com", "ZoomInfo"),
+    ("yello.ae", "Yello.ae"),
+    ("linkedin.com/company/", "Company information inside LinkedIn"),
+]
+
+EMAIL_LABEL = "Email Detected"
+SOCIAL_LABELS = ["Instagram Presence", "Twitter/X Presence", "Facebook Presence"]
+
+SECOND_PASS_CAP = 10.0
+PENDING_MIN_SCORE = 5
+
+
+def is_address_like(text):
+    if not text: return False
+    return any(k in text.lower() for k in ADDRESS_WORDS)
+
+
+def truncate_company(name):
+    if not name: return ""
+    # Split by spaces and take only the first 5 words
+    words = name.split()
+    if len(words) > 5:
+        return " ".join(words[:5]) + "..."
+    return name
+
+
+def verdict_for(final_scores):
+    """
+    Verdict Logic (Based on Average)
+    GREAT: high confidence on both, or perfect on one and good on the other
+    GOOD: solid lead, maybe second pass was weak but first pass was great
+    """
+    return np.select(
+        [final_scores >= 8.4, final_scores >= 5.0],
+        ["GREAT", "GOOD"],
+        default="REJECT"
+    )
+
+
+def second_pass_totals(df_second):
+    """
+    Cumulative second-pass score per name, capped at 10.
+    """
+    if df_second.empty:
+        return pd.Series(dtype=float)
+    return df_second.groupby("Name")["Second Pass Score"].sum().clip(upper=SECOND_PASS_CAP)
+
+
+def final_scores(names, first_scores, df_second):
+    """
+    Average of first pass and capped second-pass total; unverified leads only get half
+    their first-pass score. names / first_scores are aligned sequences.
+    """
+    totals = pd.Series(names).map(second_pass_totals(df_second)).to_numpy(dtype=float)
+    first = np.asarray(first_scores, dtype=float)
+    return np.where(np.isnan(totals), first / 2, (first + np.nan_to_num(totals)) / 2)
+
+
+def _merge_signals(groups):
+    # Order-preserving union of every evidence row's breakdown
+    return list(dict.fromkeys(sig for breakdown in groups for sig in breakdown))
+
+
+def _first_company(mentions):
+    for matches in mentions:
+        for _, company in matches:
+            if not is_address_like(company):
+                return company.strip()
+    return ""
+
+
+def _evidence_flags(df_second):
+    """
+    One boolean column per enrichment source, aggregated per name.
+    """
+    urls = df_second["Source URL"].fillna("").astype(str).str.lower()
+    snippets = df_second["Snippet"].fillna("").astype(str)
+
+    flags = pd.DataFrame(index=df_second.index)
+    for fragment, label in ENRICHMENT_DOMAINS:
+        flags[label] = urls.str.contains(fragment, regex=False)
+
+    flags[EMAIL_LABEL] = snippets.str.contains(PERSONAL_EMAIL_PATTERN)
+
+    # A URL counts towards one social network only (first match wins)
+    instagram = urls.str.contains("instagram.com/", regex=False)
+    twitter = ~instagram & (urls.str.contains("twitter.com/", regex=False) | urls.str.contains("x.com/", regex=False))
+    facebook = ~instagram & ~twitter & urls.str.contains("facebook.com/", regex=False)
+    flags[SOCIAL_LABELS[0]] = instagram
+    flags[SOCIAL_LABELS[1]] = twitter
+    flags[SOCIAL_LABELS[2]] = facebook
+
+    return flags.groupby(df_second["Name"]).any()
+
+
+def consolidate(df_first, df_second, ml_score=None):
+    """
+    Builds the consolidation table: one row per verified name (sorted by name),
+    then pending leads with a decent first-pass score, in discovery order.
+
+    ml_score, if given, is called once as ml_score(first_pass_signals, second_pass_signals)
+    with aligned lists and returns an (n, 3) array of identity / behavior / geo predictions.
+    """
+    first = df_first.drop_duplicates("Name")
+    first = first.set_axis(first["Name"].to_numpy())
+
+    rows = []
+    verified_names = []
+
+    if not df_second.empty:
+        evidence = df_second[df_second["Name"].isin(first.index)]
+        groups = evidence.groupby("Name")
+
+        second_total = second_pass_totals(evidence)
+        verified_names = second_total.index
+        lead = first.loc[verified_names]
+
+        first_score = lead["Score"].astype(float)
+        final_score = (first_score + second_total) / 2
+
+        sp_signals = groups["Score Breakdown"].agg(_merge_signals)
+        investor_confirmed = sp_signals.map(lambda s: "Yes" if has_code(s, Code.INVESTOR_IDENTITY) else "No")
+        uae_confirmed = sp_signals.map(lambda s: "Yes" if has_code(s, Code.GEO_SUPPORT) else "No")
+
+        # Enrichment Check
+        flags = _evidence_flags(evidence)
+        labels = np.array(flags.columns)
+        enriched_social = pd.Series(
+            [f"Yes ({', '.join(labels[row])})" if row.any() else "" for row in flags.to_numpy()],
+            index=flags.index
+        )
+
+        # Company cleanup: first-pass company, else first non-address mention in the evidence
+        mentions = evidence["Snippet"].fillna("").astype(str).str.findall(COMPANY_MENTION)
+        fallback_company = mentions.groupby(evidence["Name"]).agg(_first_company)
+        company = lead["Enriched Company"].fillna("").astype(str)
+        company = company.where(company != "", fallback_company).map(truncate_company)
+
+        # Leads without any UAE / MENA mention in either pass are rejected
+        second_snippets = groups["Snippet"].agg(lambda s: " ".join(str(x) for x in s.dropna()))
+        geo_text = (lead["Snippet"].fillna("").astype(str) + " " + second_snippets).str.lower()
+        has_geo = geo_text.str.contains(GEO_PATTERN).to_numpy()
+
+        verdict = np.where(has_geo, verdict_for(final_score.to_numpy()), "REJECT")
+
+        ml_preds = np.zeros((len(verified_names), 3))
+        if ml_score is not None:
+            ml_preds = np.asarray(ml_score(list(lead["Signals"]), list(sp_signals)), dtype=float).reshape(-1, 3)
+
+        rows.append(pd.DataFrame({
+            "Name": verified_names,
+            "Investor Confirmed": investor_confirmed.to_numpy(),
+            "UAE Confirmed": uae_confirmed.to_numpy(),
+            "Enriched Company": company.to_numpy(),
+            "Enriched Social": enriched_social.to_numpy(),
+            "First Pass Score": first_score.round(1).to_numpy(),
+            "Second Pass Score": second_total.round(1).to_numpy(),
+            "Final Score": final_score.round(1).to_numpy(),
+            "AI Powered Score": np.round(ml_preds[:, 0], 1),
+            "ML_Behavior": np.round(ml_preds[:, 1], 1),
+            "ML_Geo": np.round(ml_preds[:, 2], 1),
+            "Final Verdict": verdict,
+        }))
+
+    # Process leads that were SKIPPED (Pending)
+    pending = first[~first.index.isin(verified_names) & (first["Score"] >= PENDING_MIN_SCORE)]
+    if not pending.empty:
+        rows.append(pd.DataFrame({
+            "Name": pending["Name"].to_numpy(),
+            "First Pass Score": pending["Score"].round(1).to_numpy(),
+            "Second Pass Score": 0.0,
+            "Final Score": (pending["Score"] / 2).round(1).to_numpy(),
+            "Investor Confirmed": "Pending",
+            "UAE Confirmed": "Pending",
+            "Enriched Company": pending["Enriched Company"].to_numpy(),
+            "Enriched Social": "No",
+            "Final Verdict": "PENDING",
+        }))
+
+    if not rows:
+        return pd.DataFrame()
+    return pd.concat(rows, ignore_index=True)
@@ -1,12 +1,15 @@
 import streamlit as st
-from ddgs import DDGS
 import pandas as pd
-import re
-import time
-import random
 
-from first_pass import (score_text, identity_keywords, behavior_keywords, uae_keywords, mena_keywords, seniority_keywords)
-import second_pass
+from engine import Pipeline, Stage
+from lead_index import LeadIndex
+from pipeline import discovery_pipeline, verification_pipeline
+from search_provider import SearchProvider
+from lead_store import canonical_url, get_store
+from jobs import get_runner
+from job_view import is_running, show_job
+from consolidation import final_scores
+from signals import Code, Signal, IDENTITY_CODES, SENIORITY_CODES, GEO_KEYWORD_CODES, has_code, signal_keywords
 
 # Demo mode will be checked inside the function
 # Import mock leads here so they're always available
@@ -19,6 +22,155 @@ except ImportError:
     MOCK_LEADS_BATCH_2 = []
 
 
+# ==================== HELPER FUNCTIONS ====================
+def extract_keywords_from_signals(signals, codes):
+    """Extract exact keywords carried by structured signals"""
+    found = signal_keywords(signals, codes)
+
+    # Remove "angel" if "angel investor" is present
+    if "angel investor" in found and "angel" in found:
+        found.remove("angel")
+
+    if "advisor" in found and "advisory" in found:
+        found.remove("advisory")
+
+    return list(set(found))
+
+
+def extract_geo_keywords(signals):
+    """Geo keywords, plus UAE when the profile sits on the UAE LinkedIn domain"""
+    found = extract_keywords_from_signals(signals, GEO_KEYWORD_CODES)
+    if has_code(signals, Code.UAE_DOMAIN) and "uae" not in found:
+        found.append("uae")
+    return found
+
+
+def consolidate_results(results, verified):
+    """Attach final scores and verdicts to every discovered lead"""
+    scores = final_scores(
+        [person["Name"] for person in results],
+        [person["Score"] for person in results],
+        pd.DataFrame(verified)
+    )
+
+    consolidated = []
+    for person, final_score in zip(results, scores):
+        signals = person.get("Signals", [])
+
+        consolidated.append({
+            "Name": person["Name"],
+            "Company": person.get("Enriched Company", ""),
+            "Identity Keywords": extract_keywords_from_signals(signals, IDENTITY_CODES),
+            "Geo Keywords": extract_geo_keywords(signals),
+            "Seniority Keywords": extract_keywords_from_signals(signals, SENIORITY_CODES),
+            "Score": final_score,
+            "Final Verdict": "Green List" if final_score >= 5.0 else "Red List",
+            "URL": person.get("URL", ""),
+            "Title": person.get("Title", ""),
+            "Snippet": person.get("Snippet", ""),
+            "Signals": signals,
+            "Confidence": person.get("Confidence", "Low")
+        })
+
+    return consolidated
+
+
+# ==================== DISCOVERY JOB ====================
+class MockLeadProvider(SearchProvider):
+    """Serves a batch of mock leads as the results of any query (demo mode)"""
+
+    # Demo batches must never reach the search cache
+    cacheable = False
+
+    def __init__(self, leads):
+        self.leads = leads
+
+    def text(self, query, max_results=10, backend="auto", **kwargs):
+        return [{"title": m["title"], "href": m["url"], "body": m["snippet"]} for m in self.leads][:max_results]
+
+
+def simulated_verification(person):
+    """Demo verification stage: one simulated evidence row per lead, no searches"""
+    yield person, [{
+        "Name": person["Name"],
+        "Query Used": f'"{person["Name"]}" UAE investor',
+        "Snippet": person["Snippet"][:200],
+        "Second Pass Score": min(person["Score"] * 0.8, 10.0),
+        "Score Breakdown": [Signal(Code.SIMULATED)],
+        "Source URL": person["URL"]
+    }]
+
+
+def run_dashboard_discovery(job, store, workspace, demo_leads=None):
+    """
+    First pass on the fixed query, verification of the new leads and consolidation
+    into the lead store. Runs on the job runner, outside the Streamlit script.
+    With demo_leads, the same stages run on those mock leads instead of search
+    results, and verification is simulated.
+    """
+    # Fixed query for UAE angel investors
+    query = '"angel investor" UAE site:linkedin.com/in'
+    demo = demo_leads is not None
+    max_results = len(demo_leads) if demo else 5
+
+    dashboard_results = store.leads(workspace)
+    first_new = len(dashboard_results)
+
+    # Indexed once per run; keyed like the lead store, so both front ends merge leads the same way
+    lead_index = LeadIndex(dashboard_results, canonical_url)
+    discovery = discovery_pipeline(lead_index, max_results, provider=MockLeadProvider(demo_leads) if demo else None)
+
+    job.progress(0, max_results, "Searching LinkedIn profiles...")
+
+    # Each result is scored and shown as soon as it arrives
+    for done, (position, is_new) in enumerate(discovery.run([query]), 1):
+        if is_new:
+            job.progress(done, max_results, f"Found: **{dashboard_results[position]['Name']}**")
+
+    temp_first_pass = dashboard_results[first_new:]
+    stages = discovery.stats_table()
+
+    if demo:
+        # Mock leads may carry a hand-checked company
+        companies = {canonical_url(m["url"]): m.get("enriched_company") for m in demo_leads}
+        for person in temp_first_pass:
+            person["Enriched Company"] = companies.get(canonical_url(person["URL"])) or person["Enriched Company"]
+
+    # Second pass
+    temp_second_pass = []
+    if temp_first_pass:
+        job.progress(0, len(temp_first_pass), "Verifying investor credentials...")
+
+        if demo:
+            verification = Pipeline(Stage("verify", simulated_verification))
+        else:
+            verification = verification_pipeline(
+                max_results=3,
+                backend="lite",
+                max_queries=2,
+                stop_early=False,
+                dedupe_urls=False,
+            )
+        # Candidates come out as they finish; each one's rows arrive together
+        for done, (person, rows) in enumerate(verification.run(temp_first_pass), 1):
+            if rows is None:
+                # Search failed after retries: no evidence beats partial evidence
+                job.progress(done, len(temp_first_pass), f"Could not verify **{person['Name']}**")
+                continue
+            job.progress(done, len(temp_first_pass), f"Verified: **{person['Name']}**")
+            temp_second_pass.extend(rows)
+        stages += verification.stats_table()
+
+    # Consolidation
+    store.add_evidence(workspace, temp_second_pass)
+
+    consolidated = consolidate_results(dashboard_results, store.evidence(workspace))
+    store.replace_leads(workspace, consolidated)
+    store.put_verdicts(workspace, consolidated, score_key="Score")
+
+    return {"new_leads": len(temp_first_pass), "leads": len(consolidated), "stages": stages}
+
+
 def run_dashboard():
     """
     Premium UAE Investor Discovery Dashboard
@@ -269,79 +421,19 @@ def run_dashboard():
     st.markdown("---")
     
     # ==================== SESSION STATE INITIALIZATION ====================
-    if "dashboard_results" not in st.session_state:
-        st.session_state.dashboard_results = []
-    if "dashboard_verified" not in st.session_state:
-        st.session_state.dashboard_verified = []
+    # Leads, evidence and verdicts live in the shared lead store; demo leads are kept apart
+    store = get_store()
+    workspace = "dashboard_demo" if st.session_state.get("demo_mode", False) else "dashboard"
+    dashboard_results = store.leads(workspace)
+
     if "trigger_discovery" not in st.session_state:
         st.session_state.trigger_discovery = False
     if "first_discovery_done" not in st.session_state:
-        st.session_state.first_discovery_done = False
+        st.session_state.first_discovery_done = bool(dashboard_results)
     if "demo_batch_index" not in st.session_state:
         st.session_state.demo_batch_index = 0  # Track which batch to use (0=batch1, 1=batch2)    
     
     # ==================== HELPER FUNCTIONS ====================
-    blocked_urls = [
-        "bing.com/aclick",
-        "bing.com/ck/a",
-        "doubleclick.net"
-    ]
-    
-    def normalize_url(url):
-        return url.split("?")[0].lower().strip()
-    
-    def soft_truncate_ellipsis(text: str) -> str:
-        if not text: return text
-        if "..." in text: return text.split("...")[0].strip()
-        return text
-    
-    def is_duplicate_url(url, existing_results, title, snippet):
-        norm = normalize_url(url)
-        for r in existing_results:
-            if normalize_url(r.get("URL", "")) == norm:
-                old_text = (r.get("Title","") + r.get("Snippet","")).lower()
-                new_text = (title + snippet).lower()
-                if len(set(new_text.split()) - set(old_text.split())) < 5:
-                    return True
-        return False
-    
-    def find_existing_person(url, existing_results):
-        norm = normalize_url(url)
-        for i, r in enumerate(existing_results):
-            if normalize_url(r.get("URL", "")) == norm:
-                return i
-        return None
-    
-    def is_valid_person_name(name):
-        if not name: return False
-        if len(name.split()) < 2: return False
-        if re.fullmatch(r"[A-Z][a-z]+\s*\.", name): return False
-        if name.lower() in {"angel investor", "venture capital"}: return False
-        return True
-    
-    def extract_name(title):
-        for sep in [" - ", " | ", " – ", " — "]:
-            if sep in title:
-                return title.split(sep)[0].strip()
-        return title.strip()
-    
-    def extract_keywords_from_signals(signals_text, keyword_list):
-        """Extract exact keywords found from signal breakdown"""
-        found = []
-        signals_lower = signals_text.lower()
-        for kw in keyword_list:
-            if kw in signals_lower:
-                found.append(kw)
-        
-        # Remove "angel" if "angel investor" is present
-        if "angel investor" in found and "angel" in found:
-            found.remove("angel")
-
-        if "advisor" in found and "advisory" in found:
-            found.remove("advisory")
-        
-        return list(set(found))
-    
     def format_badge_text(keyword):
         """Format keyword for badge display, keeping acronyms uppercase"""
         acronyms = ["ceo", "cio", "cfo", "cto", "coo", "vp", "uae", "gcc", "mena", "ai", "usa", "uk"]
@@ -355,29 +447,24 @@ def run_dashboard():
     # ==================== METRICS SECTION ====================
     col1, col2, col3, col4 = st.columns(4)
 
-    total_discovered = len(st.session_state.dashboard_results)
+    total_discovered = len(dashboard_results)
 
     # Fix: Count unique verified names, not total verification records
-    verified_names = set()
-    if st.session_state.dashboard_verified:
-        df_verified = pd.DataFrame(st.session_state.dashboard_verified)
-        verified_names = set(df_verified["Name"].unique())
-    verified_count = len(verified_names)
+    verified_count = len(store.verified_names(workspace))
 
     # UAE-Connected: Count leads with UAE keywords
     uae_connected_count = sum(
-        1 for r in st.session_state.dashboard_results 
+        1 for r in dashboard_results 
         if r.get("Geo Keywords") and len(r.get("Geo Keywords", [])) > 0
     )
 
     # High-Value: Count leads with score >= 7
     high_value_count = sum(
-        1 for r in st.session_state.dashboard_results 
+        1 for r in dashboard_results 
         if r.get("Score", 0) >= 7.0
     )
 
-    green_list_count = sum(1 for r in st.session_state.dashboard_results 
-                        if r.get("Final Verdict") == "Green List")
+    green_list_count = store.verdict_counts(workspace).get("Green List", 0)
 
     with col1:
         st.metric(
@@ -422,11 +509,17 @@ def run_dashboard():
         col_info1, col_info2, col_info3 = st.columns([1, 2, 1])
         with col_info2:
             st.info("Scroll down and use 'Discover More' to find additional leads.")
-            if st.button("Reset Search", use_container_width=True, key="reset_search"):
-                st.session_state.first_discovery_done = False
-                st.session_state.dashboard_results = []
-                st.session_state.dashboard_verified = []
-                st.rerun()
+            # A running discovery job would keep writing into the cleared workspace
+            discovery_running = is_running(workspace)
+            if st.button("Reset Search", use_container_width=True, key="reset_search", disabled=discovery_running):
+                if is_running(workspace):
+                    st.warning("Discovery is still running; reset once it has finished.")
+                else:
+                    st.session_state.first_discovery_done = False
+                    store.clear(workspace)
+                    st.rerun()
+            if discovery_running:
+                st.caption("Reset is available once the running discovery has finished.")
         
         should_discover = False
     
@@ -451,9 +544,6 @@ def run_dashboard():
             if not MOCK_LEADS_AVAILABLE or not MOCK_LEADS_BATCH_1:
                 st.error("❌ Mock leads not found! Make sure mock_leads.py is in the same folder.")
                 st.stop()
-            # Use mock data instead of DDGS
-            query = '"angel investor" UAE site:linkedin.com/in'
-            
             # Select which batch to use
             if st.session_state.demo_batch_index == 0:
                 mock_leads_to_use = MOCK_LEADS_BATCH_1
@@ -462,349 +552,26 @@ def run_dashboard():
             
             # Increment batch index for next time
             st.session_state.demo_batch_index += 1
-            
-            # First Pass Container (simulated)
-            first_pass_status = st.status("Running Public Lead Discovery...", expanded=True)
-            with first_pass_status:
-                st.write("Searching LinkedIn profiles...")
-                progress_bar = st.progress(0)
-                current_name_display = st.empty()
-                
-                temp_first_pass = []
-                
-                # Simulate delay
-                time.sleep(2)
-                
-                total = len(mock_leads_to_use)
-                for idx, mock_lead in enumerate(mock_leads_to_use):
-                    # Process through first_pass scoring
-                    combined = f"{mock_lead['title']} {mock_lead['snippet']}"
-                    score, conf, breakdown, enriched_company = score_text(combined, query, mock_lead["url"])
-                    
-                    # Use mock enriched company if provided
-                    if mock_lead.get("enriched_company"):
-                        enriched_company = mock_lead["enriched_company"]
-                    
-                    name = mock_lead["name"]
-                    
-                    temp_first_pass.append({
-                        "Name": name,
-                        "Title": mock_lead["title"],
-                        "Snippet": mock_lead["snippet"],
-                        "URL": mock_lead["url"],
-                        "Score": score,
-                        "Confidence": conf,
-                        "Signals": " | ".join(breakdown),
-                        "Enriched Company": enriched_company
-                    })
-                    
-                    # Update display (clears previous)
-                    current_name_display.write(f"Found: **{name}**")
-                    progress_bar.progress((idx + 1) / total)
-                    time.sleep(0.1)
-                
-                first_pass_status.update(label="Public Lead Discovery Complete", state="complete")
-            
-            # Second Pass Container (simulated)
-            temp_second_pass = []
-            if temp_first_pass:
-                second_pass_status = st.status("Running Automated Verification...", expanded=True)
-                with second_pass_status:
-                    st.write("Verifying investor credentials...")
-                    verify_progress = st.progress(0)
-                    current_verify_display = st.empty()
-                    
-                    for idx, person in enumerate(temp_first_pass):
-                        name = person["Name"]
-                        
-                        # Update display
-                        current_verify_display.write(f"Verifying: **{name}**")
-                        
-                        # Simulate verification delay (random 1-3 seconds per name)
-                        delay = random.uniform(0.7, 2.1)
-                        time.sleep(delay)
-                        
-                        # Simulate second pass scoring (simplified for demo)
-                        temp_second_pass.append({
-                            "Name": name,
-                            "Query Used": f'"{name}" UAE investor',
-                            "Snippet": person["Snippet"][:200],
-                            "Second Pass Score": min(person["Score"] * 0.8, 10.0),
-                            "Score Breakdown": "Simulated verification",
-                            "Source URL": person["URL"]
-                        })
-                        
-                        verify_progress.progress((idx + 1) / len(temp_first_pass))
-                    
-                    second_pass_status.update(label="Automated Verification Complete", state="complete")
-            
-            # Consolidation (same as live)
-            st.session_state.dashboard_results.extend(temp_first_pass)
-            st.session_state.dashboard_verified.extend(temp_second_pass)
-            
-            # Create consolidated results
-            consolidated = []
-            df_second = pd.DataFrame(st.session_state.dashboard_verified)
-            
-            for person in st.session_state.dashboard_results:
-                name = person["Name"]
-                first_pass_score = person["Score"]
-                enriched_company = person.get("Enriched Company", "")
-                url = person.get("URL", "")
-                signals = person.get("Signals", "")
-                title = person.get("Title", "")
-                snippet = person.get("Snippet", "")
-                
-                # Extract keywords
-                identity_kws = extract_keywords_from_signals(signals, identity_keywords)
-                geo_kws = extract_keywords_from_signals(signals, uae_keywords + mena_keywords)
-                seniority_kws = extract_keywords_from_signals(signals, seniority_keywords)
-                
-                # Check if verified
-                if not df_second.empty and name in df_second["Name"].values:
-                    person_verified = df_second[df_second["Name"] == name]
-                    second_pass_total = min(person_verified["Second Pass Score"].sum(), 10.0)
-                    final_score = (first_pass_score + second_pass_total) / 2
-                else:
-                    second_pass_total = 0.0
-                    final_score = first_pass_score / 2
-                
-                # Determine verdict
-                verdict = "Green List" if final_score >= 5.0 else "Red List"
-                
-                consolidated.append({
-                    "Name": name,
-                    "Company": enriched_company,
-                    "Identity Keywords": identity_kws,
-                    "Geo Keywords": geo_kws,
-                    "Seniority Keywords": seniority_kws,
-                    "Score": final_score,
-                    "Final Verdict": verdict,
-                    "URL": url,
-                    "Title": title,
-                    "Snippet": snippet,
-                    "Signals": signals,
-                    "Confidence": person.get("Confidence", "Low")
-                })
-            
-            # Update results
-            st.session_state.dashboard_results = []
-            for item in consolidated:
-                st.session_state.dashboard_results.append(item)
-            
-            st.success("Discovery Complete!")
-            time.sleep(1)
+
+            # Same job and stages as live mode, served from the mock batch
+            get_runner().submit("discovery", workspace, run_dashboard_discovery, store, workspace, mock_leads_to_use)
             st.rerun()
         
         # ==================== LIVE MODE (DDGS) BRANCH ====================
         else:
-            # Fixed query for UAE angel investors
-            query = '"angel investor" UAE site:linkedin.com/in'
-            max_results = 5
-        
-            # First Pass Container
-            first_pass_status = st.status("Running First Pass Discovery...", expanded=True)
-            with first_pass_status:
-                st.write("Searching LinkedIn profiles...")
-                progress_bar = st.progress(0)
-                current_name_display = st.empty()  # For clearing previous names
-                
-                temp_first_pass = []
-                
-                with DDGS(timeout=10) as ddgs:
-                    results_list = list(ddgs.text(query, max_results=max_results, backend="lite"))
-                    total = len(results_list)
-                    
-                    for idx, r in enumerate(results_list):
-                        url = r.get("href", "")
-                        if not url:
-                            continue
-                        
-                        if any(bad in normalize_url(url) for bad in blocked_urls):
-                            continue
-                        
-                        title = soft_truncate_ellipsis(r.get("title", ""))
-                        snippet = soft_truncate_ellipsis(r.get("body", ""))
-                        
-                        if " | LinkedIn" in title:
-                            match = re.search(r'(\s*[-–—]?\s*\|\s*LinkedIn)', title)
-                            if match:
-                                cut_idx = match.start()
-                                title = title[:cut_idx + len(match.group(0))].strip()
-                            else:
-                                parts = title.split(" | LinkedIn")
-                                title = parts[0].strip() + " | LinkedIn"
-                        
-                        if is_duplicate_url(url, st.session_state.dashboard_results, title, snippet):
-                            continue
-                        
-                        combined = f"{title} {snippet}"
-                        score, conf, breakdown, enriched_company = score_text(combined, query, url)
-                        name = extract_name(title)
-                        
-                        if not is_valid_person_name(name):
-                            continue
-                        
-                        existing_idx = find_existing_person(url, st.session_state.dashboard_results)
-                        if existing_idx is not None:
-                            existing = st.session_state.dashboard_results[existing_idx]
-                            # Safely update existing entry with .get() methods
-                            if "Snippet" in existing:
-                                existing["Snippet"] += "\n---\n" + snippet
-                            existing["Score"] = max(existing.get("Score", 0), score)
-                            old_signals = set(existing.get("Signals", "").split(" | "))
-                            new_signals = set(breakdown)
-                            existing["Signals"] = " | ".join(sorted(old_signals | new_signals))
-                            if conf == "High":
-                                existing["Confidence"] = "High"
-                            elif conf == "Medium" and existing.get("Confidence") == "Low":
-                                existing["Confidence"] = "Medium"
-                        else:
-                            temp_first_pass.append({
-                                "Name": name,
-                                "Title": title,
-                                "Snippet": snippet,
-                                "URL": url,
-                                "Score": score,
-                                "Confidence": conf,
-                                "Signals": " | ".join(breakdown),
-                                "Enriched Company": enriched_company
-                            })
-                            # Update the display with current name (clears previous)
-                            current_name_display.write(f"Found: **{name}**")
-                        
-                        progress_bar.progress((idx + 1) / total)
-                        time.sleep(0.1)
-                
-                first_pass_status.update(label="First Pass Complete", state="complete")
-            
-            # Second Pass Container
-            temp_second_pass = []  # Initialize here to prevent NameError if temp_first_pass is empty
-            if temp_first_pass:
-                second_pass_status = st.status("Running Second Pass Verification...", expanded=True)
-                with second_pass_status:
-                    st.write("Verifying investor credentials. Please wait...")
-                    verify_progress = st.progress(0)
-                    current_verify_display = st.empty()  # For clearing previous names
-                    
-                    temp_second_pass = []  # Reset for this verification run
-                    
-                    for idx, person in enumerate(temp_first_pass):
-                        name = person["Name"]
-                        enriched_company = person.get("Enriched Company", "")
-                        snippet = person.get("Snippet", "")
-                        
-                        # Update the display with current name (clears previous)
-                        current_verify_display.write(f"Verifying: **{name}**")
-                        
-                        anchors = second_pass.extract_anchors(snippet)
-                        queries = second_pass.build_second_pass_queries(name, anchors, enriched_company)
-                        
-                        state = {
-                            "identity_confirmed": False,
-                            "geo_hits": 0,
-                            "linkedin_hits": 0,
-                            "domain_hits": set(),
-                            "expected_name": name
-                        }
-                        
-                        with DDGS(timeout=10) as ddgs:
-                            for q in queries[:2]:
-                                try:
-                                    verification_results = list(ddgs.text(q, max_results=3, backend="lite"))
-                                    
-                                    for vr in verification_results:
-                                        url = vr.get("href", "")
-                                        if not url:
-                                            continue
-                                        
-                                        text = f"{vr.get('title', '')} {vr.get('body', '')}"
-                                        score2, breakdown2, confirmed = second_pass.score_second_pass(text, url, state)
-                                        
-                                        if score2 > 0:
-                                            temp_second_pass.append({
-                                                "Name": name,
-                                                "Query Used": q,
-                                                "Snippet": text,
-                                                "Second Pass Score": score2,
-                                                "Score Breakdown": " | ".join(breakdown2),
-                                                "Source URL": url
-                                            })
-                                    
-                                    time.sleep(0.5)
-                                except Exception as e:
-                                    continue
-                        
-                        verify_progress.progress((idx + 1) / len(temp_first_pass))
-                        time.sleep(0.1)
-                    
-                    second_pass_status.update(label="Verification Complete", state="complete")
-            
-            # Consolidation
-            st.session_state.dashboard_results.extend(temp_first_pass)
-            st.session_state.dashboard_verified.extend(temp_second_pass)
-            
-            # Create consolidated results
-            consolidated = []
-            df_second = pd.DataFrame(st.session_state.dashboard_verified)
-            
-            for person in st.session_state.dashboard_results:
-                name = person["Name"]
-                first_pass_score = person["Score"]
-                enriched_company = person.get("Enriched Company", "")
-                url = person.get("URL", "")
-                signals = person.get("Signals", "")
-                title = person.get("Title", "") # Added to preserve metadata
-                snippet = person.get("Snippet", "") # Added to preserve metadata
-                
-                # Extract keywords
-                identity_kws = extract_keywords_from_signals(signals, identity_keywords)
-                geo_kws = extract_keywords_from_signals(signals, uae_keywords + mena_keywords)
-                seniority_kws = extract_keywords_from_signals(signals, seniority_keywords)
-                
-                # Check if verified
-                if not df_second.empty and name in df_second["Name"].values:
-                    person_verified = df_second[df_second["Name"] == name]
-                    second_pass_total = min(person_verified["Second Pass Score"].sum(), 10.0)
-                    final_score = (first_pass_score + second_pass_total) / 2
-                else:
-                    second_pass_total = 0.0
-                    final_score = first_pass_score / 2
-                
-                # Determine verdict
-                verdict = "Green List" if final_score >= 5.0 else "Red List"
-                
-                consolidated.append({
-                                "Name": name,
-                                "Company": enriched_company,
-                                "Identity Keywords": identity_kws,
-                                "Geo Keywords": geo_kws,
-                                "Seniority Keywords": seniority_kws,
-                                "Score": final_score,
-                                "Final Verdict": verdict,
-                                "URL": url,
-                                "Title": person.get("Title", ""),
-                                "Snippet": person.get("Snippet", ""),
-                                "Signals": signals,
-                                "Confidence": person.get("Confidence", "Low")
-                            })
-        
-        # Update results in session state
-        st.session_state.dashboard_results = []
-        for item in consolidated:
-            st.session_state.dashboard_results.append(item)
-        
-        st.success("Discovery Complete!")
-        time.sleep(3)
-        st.rerun()
+            # Runs in the background; progress and partial results are polled below
+            get_runner().submit("discovery", workspace, run_dashboard_discovery, store, workspace)
+            st.rerun()
+    
+    show_job(workspace, "discovery", "Discovery")
     
     # ==================== FILTER TOGGLE ====================
-    if st.session_state.dashboard_results:
+    if dashboard_results:
         st.markdown("---")
         show_green_only = st.checkbox("Show Green List Only", value=False)
         
         # Filter results
-        display_results = st.session_state.dashboard_results
+        display_results = dashboard_results
         if show_green_only:
             display_results = [r for r in display_results if r.get("Final Verdict") == "Green List"]
         
@@ -0,0 +1,241 @@
+import itertools
+import queue
+import threading
+import time
+
+DEFAULT_QUEUE_SIZE = 64
+
+_END = object()
+
+
+class StageStats:
+    """
+    Counters for one stage of one run. busy is the time spent inside the stage
+    function summed over workers; waiting on a full or empty queue does not count.
+    """
+
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.items_in = 0
+        self.items_out = 0
+        self.busy = 0.0
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def add(self, items_in=0, items_out=0, busy=0.0):
+        with self._lock:
+            self.items_in += items_in
+            self.items_out += items_out
+            self.busy += busy
+
+    @property
+    def seconds(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    def as_dict(self):
+        seconds = self.seconds
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "in": self.items_in,
+            "out": self.items_out,
+            "busy_s": round(self.busy, 3),
+            "wall_s": round(seconds, 3),
+            "out_per_s": round(self.items_out / seconds, 1) if seconds else 0.0,
+        }
+
+
+class Stage:
+    """
+    One step of a pipeline. fn(item) returns an iterable of output items (a generator
+    streams them) or None for no output. workers > 1 runs fn on that many threads;
+    with ordered=True the outputs still leave in input order, and the oldest
+    unfinished item streams its outputs while later ones are buffered.
+    Stateful stages (dedup) must keep workers=1.
+    """
+
+    def __init__(self, name, fn, workers=1, queue_size=DEFAULT_QUEUE_SIZE, ordered=True):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.ordered = ordered
+
+
+class _Collator:
+    # Restores input order for a multi-worker stage
+    def __init__(self, put):
+        self.put = put
+        self.next_seq = 0
+        self.pending = {}  # seq -> [outputs, finished]
+        self.lock = threading.Lock()
+
+    def emit(self, seq, item):
+        with self.lock:
+            if seq == self.next_seq:
+                self.put(item)
+            else:
+                self.pending.setdefault(seq, [[], False])[0].append(item)
+
+    def finish(self, seq):
+        with self.lock:
+            self.pending.setdefault(seq, [[], False])[1] = True
+            while self.next_seq in self.pending:
+                outputs, finished = self.pending[self.next_seq]
+                for item in outputs:
+                    self.put(item)
+                outputs.clear()
+                if not finished:
+                    break
+                del self.pending[self.next_seq]
+                self.next_seq += 1
+
+
+class Pipeline:
+    """
+    Chains stages with bounded queues; each stage runs on its own worker threads,
+    so a slow stage back-pressures the ones before it instead of buffering everything.
+    run(source) is a generator over the last stage's outputs. Closing it early stops
+    the workers: a stage generator is closed at its next output, so an item's remaining
+    work (further searches) is skipped and only a call already in progress finishes.
+    An exception in any stage is re-raised in the consumer.
+    stats holds a StageStats per stage for the latest run.
+    """
+
+    def __init__(self, *stages):
+        self.stages = stages
+        self.stats = []
+
+    def stats_table(self):
+        return [s.as_dict() for s in self.stats]
+
+    def run(self, source):
+        stop = threading.Event()
+        failure = []
+        self.stats = [StageStats(s.name, s.workers) for s in self.stages]
+
+        def put(q, item):
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(q):
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _END
+
+        def fail(e):
+            if not failure:
+                failure.append(e)
+            stop.set()
+
+        queues = [queue.Queue(maxsize=s.queue_size) for s in self.stages]
+        out_q = queue.Queue(maxsize=DEFAULT_QUEUE_SIZE)
+
+        def feed():
+            try:
+                for item in source:
+                    if not put(queues[0], item):
+                        return
+            except BaseException as e:
+                fail(e)
+                return
+            put(queues[0], _END)
+
+        def start_stage(stage, stats, in_q, next_q):
+            read_lock = threading.Lock()
+            counter = itertools.count()
+            exhausted = [False]
+            remaining = [stage.workers]
+
+            collator = _Collator(lambda item: put(next_q, item)) if stage.ordered and stage.workers > 1 else None
+
+            def emit(seq, item):
+                # False once the run has been stopped
+                if collator is None:
+                    return put(next_q, item)
+                collator.emit(seq, item)
+                return not stop.is_set()
+
+            def work():
+                while not stop.is_set():
+                    with read_lock:
+                        if exhausted[0]:
+                            break
+                        item = get(in_q)
+                        if item is _END:
+                            exhausted[0] = True
+                            break
+                        seq = next(counter)
+                        if stats.started is None:
+                            stats.started = time.perf_counter()
+
+                    busy = 0.0
+                    produced = 0
+                    outputs = None
+                    try:
+                        t = time.perf_counter()
+                        outputs = iter(stage.fn(item) or ())
+                        busy += time.perf_counter() - t
+                        while True:
+                            t = time.perf_counter()
+                            try:
+                                out = next(outputs)
+                            except StopIteration:
+                                busy += time.perf_counter() - t
+                                break
+                            busy += time.perf_counter() - t
+                            produced += 1
+                            if not emit(seq, out):
+                                break
+                    except BaseException as e:
+                        fail(e)
+                        return
+                    finally:
+                        # A stopped run must not drain the rest of the item's generator
+                        close = getattr(outputs, "close", None)
+                        if close is not None:
+                            close()
+                        stats.add(1, produced, busy)
+
+                    if collator is not None:
+                        collator.finish(seq)
+
+                with read_lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    stats.finished = time.perf_counter()
+                    put(next_q, _END)
+
+            for i in range(stage.workers):
+                threading.Thread(target=work, name=f"{stage.name}-{i}", daemon=True).start()
+
+        for i, (stage, stats) in enumerate(zip(self.stages, self.stats)):
+            next_q = queues[i + 1] if i + 1 < len(self.stages) else out_q
+            start_stage(stage, stats, queues[i], next_q)
+
+        threading.Thread(target=feed, name="pipeline-source", daemon=True).start()
+
+        try:
+            while True:
+                item = get(out_q)
+                if item is _END:
+                    break
+                yield item
+        finally:
+            stop.set()
+
+        if failure:
+            raise failure[0]
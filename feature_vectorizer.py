@@ -0,0 +1,96 @@
+import numpy as np
+
+from first_pass import (identity_keywords, behavior_keywords, seniority_keywords,
+                        uae_keywords, mena_keywords)
+from signals import Code, KEYWORDS
+
+SCHEMA_VERSION = 1
+
+FIRST_PASS_CODES = [c for c in Code if c < 100]
+SECOND_PASS_CODES = [c for c in Code if c > 100]
+
+# Keywords a first-pass signal can carry; dynamic details (companies, locations,
+# hashtags, domains) are deliberately not features, so the width never grows
+LEXICON = list(dict.fromkeys(
+    identity_keywords + behavior_keywords + seniority_keywords + uae_keywords + mena_keywords
+))
+
+
+class SignalVectorizer:
+    """
+    Fixed, versioned feature layout over structured signals:
+    one column per signal code of each pass plus one per lexicon keyword.
+    Pickled next to the model so inference always uses the training layout.
+    """
+
+    def __init__(self, version=SCHEMA_VERSION):
+        self.version = version
+        self.columns = (
+            [f"FP_{c.name}" for c in FIRST_PASS_CODES]
+            + [f"FP_KW_{k}" for k in LEXICON]
+            + [f"SP_{c.name}" for c in SECOND_PASS_CODES]
+        )
+        self._build_index()
+
+    def _build_index(self):
+        # Lookups come from the stored column names, so codes added to the
+        # enum later do not shift the layout of an already trained model
+        self._fp_code = {}
+        self._sp_code = {}
+        self._keyword = {}
+
+        for j, col in enumerate(self.columns):
+            prefix, _, rest = col.partition("_")
+            if rest.startswith("KW_"):
+                self._keyword[rest[3:]] = j
+            elif prefix == "FP":
+                self._fp_code[Code[rest]] = j
+            else:
+                self._sp_code[Code[rest]] = j
+
+    def __getstate__(self):
+        return {"version": self.version, "columns": self.columns}
+
+    def __setstate__(self, state):
+        self.version = state["version"]
+        self.columns = state["columns"]
+        self._build_index()
+
+    @property
+    def width(self):
+        return len(self.columns)
+
+    def _row_entries(self, fp_signals, sp_signals):
+        for sig in fp_signals:
+            j = self._fp_code.get(sig.code)
+            if j is not None:
+                yield j
+            if sig.keyword >= 0:
+                j = self._keyword.get(KEYWORDS[sig.keyword])
+                if j is not None:
+                    yield j
+
+        for sig in sp_signals:
+            j = self._sp_code.get(sig.code)
+            if j is not None:
+                yield j
+
+    def transform(self, fp_signal_lists, sp_signal_lists, sparse=False):
+        """
+        Binary (n, width) matrix; a scipy CSR matrix with sparse=True.
+        """
+        rows, cols = [], []
+        for i, (fp_signals, sp_signals) in enumerate(zip(fp_signal_lists, sp_signal_lists)):
+            for j in set(self._row_entries(fp_signals, sp_signals)):
+                rows.append(i)
+                cols.append(j)
+
+        shape = (len(fp_signal_lists), self.width)
+
+        if sparse:
+            from scipy.sparse import csr_matrix
+            return csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=shape)
+
+        X = np.zeros(shape, dtype=np.float32)
+        X[rows, cols] = 1
+        return X
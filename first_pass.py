@@ -1,4 +1,12 @@
 import re
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+
+from keyword_matcher import KeywordMatcher
+from company_extractor import CompanyExtractor
+from signals import Code, Signal, keyword_id
 
 BASE_SCORE = 2.0
 IDENTITY_WEIGHT = 2.5
@@ -46,330 +54,387 @@ NON_MENA_HUBS = [
     "san francisco", "new york", "nyc", "canada", "australia", "berlin", "europe"
 ]
 
-def contains_whole_word(text, word):
-    return re.search(r'\b' + re.escape(word) + r'\b', text) is not None
-
-def contains_bucket_keyword(text):
-    text_lower = text.lower()
+# Compiled once at import: one pass over the text returns every bucket's hits
+KEYWORD_MATCHER = KeywordMatcher({
+    "identity": identity_keywords,
+    "behavior": behavior_keywords,
+    "seniority": seniority_keywords,
+    "geo": uae_keywords + mena_keywords,
+    "non_mena": NON_MENA_HUBS,
+})
 
-    for bucket in [identity_keywords, filter_list]:
-        for keyword in bucket:
-            if contains_whole_word(text_lower, keyword.lower()):
-                return True
+COMPANY_EXTRACTOR = CompanyExtractor(identity_keywords + filter_list)
 
-    return False
+# Every lexicon word gets a stable keyword id for structured signals
+KEYWORD_IDS = {
+    k: keyword_id(k)
+    for k in identity_keywords + behavior_keywords + seniority_keywords
+    + uae_keywords + mena_keywords + NON_MENA_HUBS
+}
 
-
-def score_text(text, query, url=""):
-    breakdown = []
+def contains_bucket_keyword(text):
+    return COMPANY_EXTRACTOR.is_rejected(text)
+
+
+# -------------------------
+# Feature columns & weights
+# -------------------------
+
+# One count per lead and column; the score is a dot product with a ScoringConfig
+FEATURE_NAMES = (
+    "base",
+    "hashtag_identity", "hashtag_behavior", "hashtag_seniority", "hashtag_geo",
+    "mena_location", "non_mena_location", "suspicious_location",
+    "primary_identity", "additional_identity",
+    "behavior_keyword", "behavior_synergy",
+    "seniority_keyword", "seniority_bonus",
+    "company", "geo_group", "uae_city",
+    "uae_domain", "no_geo_penalty", "outside_region_domain",
+    "geo_confirmed",
+)
+F = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+# Columns summed one unit at a time before the geography bonus; hashtags of
+# different kinds are summed kind by kind rather than in text order
+PRE_GEO_ORDER = FEATURE_NAMES[:F["company"] + 1]
+
+NO_GEO_THRESHOLD = 5.0
+
+
+@dataclass
+class ScoringConfig:
+    base_score: float = BASE_SCORE
+    identity_weight: float = IDENTITY_WEIGHT
+    identity_diminishing_weight: float = IDENTITY_DIMINISHING_WEIGHT
+    behavior_weight: float = BEHAVIOR_WEIGHT
+    behavior_group_bonus: float = BEHAVIOR_GROUP_BONUS
+    seniority_weight: float = SENIORITY_WEIGHT
+    seniority_group_bonus: float = SENIORITY_GROUP_BONUS
+    geo_group_bonus: float = GEO_GROUP_BONUS
+    hashtag_multiplier: float = 1.0
+    mena_location_bonus: float = 1.0
+    non_mena_location_penalty: float = -4.0
+    suspicious_location_penalty: float = -2.0
+    company_bonus: float = 0.3
+    uae_city_bonus: float = 0.3
+    no_geo_penalty: float = -1.3  # changed from 1.1 because Matt H. got 5 with Location United States
+    outside_region_penalty: float = -0.3
+
+    def weights(self):
+        """
+        Weight vector aligned with FEATURE_NAMES.
+        """
+        w = np.zeros(len(FEATURE_NAMES))
+        w[F["base"]] = self.base_score
+        w[F["hashtag_identity"]] = self.identity_weight * self.hashtag_multiplier
+        w[F["hashtag_behavior"]] = self.behavior_weight * self.hashtag_multiplier
+        w[F["hashtag_seniority"]] = self.seniority_weight * self.hashtag_multiplier
+        w[F["hashtag_geo"]] = self.geo_group_bonus * self.hashtag_multiplier
+        w[F["mena_location"]] = self.mena_location_bonus
+        w[F["non_mena_location"]] = self.non_mena_location_penalty
+        w[F["suspicious_location"]] = self.suspicious_location_penalty
+        w[F["primary_identity"]] = self.identity_weight
+        w[F["additional_identity"]] = self.identity_diminishing_weight
+        w[F["behavior_keyword"]] = self.behavior_weight
+        w[F["behavior_synergy"]] = self.behavior_group_bonus
+        w[F["seniority_keyword"]] = self.seniority_weight
+        w[F["seniority_bonus"]] = self.seniority_group_bonus
+        w[F["company"]] = self.company_bonus
+        w[F["geo_group"]] = self.geo_group_bonus
+        w[F["uae_city"]] = self.uae_city_bonus
+        w[F["uae_domain"]] = self.geo_group_bonus
+        w[F["no_geo_penalty"]] = self.no_geo_penalty
+        w[F["outside_region_domain"]] = self.outside_region_penalty
+        return w
+
+
+DEFAULT_CONFIG = ScoringConfig()
+
+
+class LeadFeatures(NamedTuple):
+    counts: np.ndarray      # aligned with FEATURE_NAMES
+    group_count: int
+    slots: tuple            # (code, keyword id, detail, feature column) per signal, in display order
+    enriched_company: str
+
+
+def extract_features(text, url=""):
+    """
+    One-time text processing: keyword hits, location, company, domains.
+    Everything weight-dependent is left to score_features.
+    """
+    counts = np.zeros(len(FEATURE_NAMES))
+    counts[F["base"]] = 1
+    slots = []
     signal_groups = set()
 
     text_original = text
     text = text.lower()
-    score = BASE_SCORE
         
     hashtags = re.findall(r'#(\w+)', text.lower())
-    hashtag_hits = []
-
-    HASHTAG_MULTIPLIER = 1.0
 
     for tag in hashtags:
         tag_text = tag.replace("_", " ")
 
         if tag_text in identity_keywords:
-            boost = IDENTITY_WEIGHT * HASHTAG_MULTIPLIER
-            score += boost
-            hashtag_hits.append(f"#{tag} = identity (+{round(boost,1)})")
-            signal_groups.add("Identity")
-
+            column, code, group = "hashtag_identity", Code.HASHTAG_IDENTITY, "Identity"
         elif tag_text in behavior_keywords:
-            boost = BEHAVIOR_WEIGHT * HASHTAG_MULTIPLIER
-            score += boost
-            hashtag_hits.append(f"#{tag} = behavior (+{round(boost,1)})")
-            signal_groups.add("Behavior")
-
+            column, code, group = "hashtag_behavior", Code.HASHTAG_BEHAVIOR, "Behavior"
         elif tag_text in seniority_keywords:
-            boost = SENIORITY_WEIGHT * HASHTAG_MULTIPLIER
-            score += boost
-            hashtag_hits.append(f"#{tag} = seniority (+{round(boost,1)})")
-            signal_groups.add("Seniority")
-
+            column, code, group = "hashtag_seniority", Code.HASHTAG_SENIORITY, "Seniority"
         elif tag_text in uae_keywords + mena_keywords:
-            boost = GEO_GROUP_BONUS * HASHTAG_MULTIPLIER
-            score += boost
-            hashtag_hits.append(f"#{tag} = geography (+{round(boost,1)})")
-            signal_groups.add("Geography")
+            column, code, group = "hashtag_geo", Code.HASHTAG_GEO, "Geography"
+        else:
+            continue
+
+        counts[F[column]] += 1
+        slots.append((code, KEYWORD_IDS[tag_text], tag, F[column]))
+        signal_groups.add(group)
 
-    if hashtag_hits:
-        breakdown.append("Hashtag signals: " + " | ".join(hashtag_hits))
-        
     location_match = re.search(r"location:\s*([^\n|·]+)", text, re.IGNORECASE)
-    #if location_match:
-     #   loc = location_match.group(1)
-      #  if any(k in loc for k in uae_keywords + mena_keywords):
-       #     score += 0.5
-        #    breakdown.append("Explicit UAE location (+0.5)")
-        #elif any(bad in loc for bad in ["Singapore", "New York City", "United States", "UK", "London", "India", "Ahmedabad", "Mumbai"]):
-         #   score -= 1.5 
-          #  breakdown.append("Non-MENA location detected (-1.5)")
 
     if location_match:
         loc_text = location_match.group(1).strip().lower()
+        loc_hits = KEYWORD_MATCHER.match(loc_text)
         
         # Check if it's a GOOD location first
-        is_uae_mena = any(k in loc_text for k in uae_keywords + mena_keywords)
-        
-        if is_uae_mena:
-            score += 1.0  # Increased boost for confirmed target location
-            breakdown.append(f"Confirmed MENA Location: {loc_text} (+1.0)")
+        if loc_hits["geo"]:
+            column, code = "mena_location", Code.MENA_LOCATION
+        # Check if it's explicitly in our known "Bad Hubs" list (heavy penalty to kill the lead)
+        elif loc_hits["non_mena"]:
+            column, code = "non_mena_location", Code.NON_MENA_LOCATION
+        # If a location is mentioned but it's NOT MENA, it's suspicious
         else:
-            # Check if it's explicitly in our known "Bad Hubs" list
-            is_bad_hub = any(bad in loc_text for bad in NON_MENA_HUBS)
-            
-            if is_bad_hub:
-                score -= 4.0  # Heavy penalty to kill the lead
-                breakdown.append(f"Non-MENA Country ({loc_text}) (-4.0)")
-            else:
-                # If a location is mentioned but it's NOT MENA, it's suspicious
-                score -= 2.0
-                breakdown.append(f"Suspicious Location: {loc_text} (-2.0)") 
-
-    identity_hits = [k for k in identity_keywords if k in text]
+            column, code = "suspicious_location", Code.SUSPICIOUS_LOCATION
+
+        counts[F[column]] = 1
+        slots.append((code, -1, loc_text, F[column]))
+
+    hits = KEYWORD_MATCHER.match(text)
+
+    identity_hits = hits["identity"]
     if identity_hits:
-        score += IDENTITY_WEIGHT
-        breakdown.append(f"Primary identity '{identity_hits[0]}' (+{IDENTITY_WEIGHT})")
+        counts[F["primary_identity"]] = 1
+        slots.append((Code.PRIMARY_IDENTITY, KEYWORD_IDS[identity_hits[0]], "", F["primary_identity"]))
         for k in identity_hits[1:]:
-            score += IDENTITY_DIMINISHING_WEIGHT
-            breakdown.append(f"Additional identity '{k}' (+{IDENTITY_DIMINISHING_WEIGHT})")
+            counts[F["additional_identity"]] += 1
+            slots.append((Code.ADDITIONAL_IDENTITY, KEYWORD_IDS[k], "", F["additional_identity"]))
         signal_groups.add("Identity")
 
-    behavior_hits = [k for k in behavior_keywords if k in text]
+    behavior_hits = hits["behavior"]
     for k in behavior_hits:
-        score += BEHAVIOR_WEIGHT
-        breakdown.append(f"Behavior keyword '{k}' (+{BEHAVIOR_WEIGHT})")
+        counts[F["behavior_keyword"]] += 1
+        slots.append((Code.BEHAVIOR_KEYWORD, KEYWORD_IDS[k], "", F["behavior_keyword"]))
 
     if behavior_hits and "Identity" in signal_groups:
-        score += BEHAVIOR_GROUP_BONUS
-        breakdown.append(f"Identity + behavior synergy (+{BEHAVIOR_GROUP_BONUS})")
+        counts[F["behavior_synergy"]] = 1
+        slots.append((Code.BEHAVIOR_SYNERGY, -1, "", F["behavior_synergy"]))
         signal_groups.add("Behavior")
 
-    seniority_hits = [k for k in seniority_keywords if k in text]
+    seniority_hits = hits["seniority"]
     for k in seniority_hits:
-        score += SENIORITY_WEIGHT
-        breakdown.append(f"Seniority keyword '{k}' (+{SENIORITY_WEIGHT})")
+        counts[F["seniority_keyword"]] += 1
+        slots.append((Code.SENIORITY_KEYWORD, KEYWORD_IDS[k], "", F["seniority_keyword"]))
 
     if seniority_hits:
-        score += SENIORITY_GROUP_BONUS
-        breakdown.append(f"Seniority group bonus (+{SENIORITY_GROUP_BONUS})")
+        counts[F["seniority_bonus"]] = 1
+        slots.append((Code.SENIORITY_BONUS, -1, "", F["seniority_bonus"]))
         signal_groups.add("Seniority")
 
     # -------------------------
     # Company enrichment (robust)
     # -------------------------
 
-    company_candidates = []
+    cleaned_companies = COMPANY_EXTRACTOR.extract(text_original)
 
-    sentences = re.split(r"[.\n]", text_original)
-    for sentence in sentences:
-        s = sentence.strip()
-        if not s:
-            continue
+    enriched_company = ""
+    if cleaned_companies:
+        enriched_company = cleaned_companies[0]
+        counts[F["company"]] = 1
+        slots.append((Code.COMPANY_AFFILIATION, -1, enriched_company, F["company"]))
 
-        # HARD BLOCK: multi-company or list-like sentences
-        #if re.search(r"\band\b", s.lower()):
-        #    continue
-
-        # Possessive senior role → company (TMT Law's Chief Operating Officer)
-        company_candidates.extend(re.findall(
-            r"\b([A-Z][A-Za-z0-9&.\-]{2,40}(?:\s+[A-Z0-9][A-Za-z0-9&.\-]{1,25}){0,4})['’]s\s+"
-            r"(?:Chief|Senior|Managing|Executive|Head|Vice\s+President|VP)\s+"
-            r"(?:Operating\s+)?"
-            r"(?:Officer|Director|Partner)\b",
-            s,
-            re.IGNORECASE
-        ))
-
-        # Role @ Company (LinkedIn-style, case-insensitive company)
-        company_candidates.extend(re.findall(
-            r"\b(?:head|lead|director|manager|vp|chief|growth|role|partner|ceo|cio)\b[^@]{0,40}"
-            r"(?:@| at | for )\s*"
-            r"([A-Za-z][A-Za-z0-9 &.\-]{2,50})",
-            s,
-            re.IGNORECASE
-        ))
-
-        # Title format: "Name - Company | LinkedIn" or "Name @ Company"
-        headline_matches = re.findall(
-            r'^[^\n\-@]{2,100}\s*[-@]\s*(.*?)\s*(?:\|\s*LinkedIn)?(?:\||$)',
-            text_original,
-            re.MULTILINE
-        )
-
-        cleaned_headlines = []
-
-        for item in headline_matches:
-            item = item.strip()
-            item = re.sub(r'\s{2,}', ' ', item)  # collapse spaces
-
-            # Remove emoji and weird symbols
-            item = re.sub(r'[^\w\s\-\&\.\,]', '', item)
-
-            cleaned_headlines.append(item)
-
-        processed_candidates = []
-
-        for item in cleaned_headlines:
-
-            # If headline has pipes, take first segment only
-            if "|" in item:
-                item = item.split("|")[0].strip()
-
-            # If multiple dash segments, take LAST segment (often company)
-            if " - " in item:
-                segments = item.split(" - ")
-                item = segments[-1].strip()
-
-            processed_candidates.append(item)
-
-        for candidate in processed_candidates:
-            if not contains_bucket_keyword(candidate):
-                if len(candidate.strip()) > 2:
-                    company_candidates.append(candidate.strip())
-    
-    # STRONG global founder / C-level patterns (allowed globally)
-    company_candidates.extend(re.findall(
-        r'\b(?:founder|co[- ]?founder|ceo|cto|cfo|coo|director|partner|President|Chairman|Director|Member)\b'
-        r'(?:\s*&\s*\w+)?'
-        r'\s+(?:at|@|of)\s+'
-        r'([A-Z][A-Za-z0-9 &\.\-]{2,50})',
-        text_original,
-        re.IGNORECASE
-    ))
-
-    # Pattern: | Role, Company | or | Role, Company
-    company_candidates.extend(re.findall(
-        r'\|\s*(?:CEO|CFO|COO|CTO|Founder|Co-Founder|Managing Director|Founder & CEO)'
-        r'(?:\s*[&,]\s*\w+)?'  # Handles "Founder & CEO"
-        r',\s+([A-Z][A-Za-z0-9 &\.\-]{2,50})',
-        text_original,
-        re.IGNORECASE
-    ))
-
-    # Angel / investor phrasing (explicit)
-    company_candidates.extend(re.findall(
-        r"\bAngel Investor\s+(?:at|@)\s+([A-Z][A-Za-z0-9 &.\-]{2,50})",
-        text_original,
-        re.IGNORECASE
-    ))
-
-    # Venture-style phrasing
-    company_candidates.extend(re.findall(
-        r'\b(?:started|founded)\s+(?:the\s+)?(?:own\s+)?'
-        r'(?:venture|company|startup)?\s*(?:of|called)?\s*[‘"\']?'
-        r'([A-Z][A-Za-z0-9 &\.\-]{2,50})',
-        text_original,
-        re.IGNORECASE
-    ))
+    if hits["geo"]:
+        signal_groups.add("Geography")
+        counts[F["geo_group"]] = 1
+        
+        cities = [k for k in ("dubai", "abu dhabi") if k in hits["geo"]]
+        if cities:
+            counts[F["uae_city"]] = 1
+            slots.append((Code.UAE_CITY, KEYWORD_IDS[cities[0]], "", F["uae_city"]))
+        
+        slots.append((Code.GEO_SIGNALS, KEYWORD_IDS[hits["geo"][0]], "", F["geo_group"]))
 
-    # -------------------------
-    # Cleaning & validation
-    # -------------------------
+    if "ae.linkedin.com/in" in url:
+        counts[F["uae_domain"]] = 1
+        slots.append((Code.UAE_DOMAIN, -1, "", F["uae_domain"]))
+    else:
+        # Only fires if the weighted score turns out high (see score_features)
+        slots.append((Code.NO_GEO_PENALTY, -1, "", F["no_geo_penalty"]))
 
-    stop_phrases = [
-        "years of", "experience", "worked with", "experience in",
-        "services", "solutions", "expansion", "linkedin"
-    ]
+    if any(dom in url for dom in ["in.linkedin.com/in", "br.linkedin.com/in", "pk.linkedin.com/in"]):
+        counts[F["outside_region_domain"]] = 1
+        slots.append((Code.OUTSIDE_REGION_DOMAIN, -1, "", F["outside_region_domain"]))
 
-    cleaned_companies = []
-    for comp in company_candidates:
-        comp_clean = comp.strip(" .,-·")
-        comp_lower = comp_clean.lower()
+    counts[F["geo_confirmed"]] = "Geography" in signal_groups
 
-        if re.search(r"\b(january|february|march|april|may|june|july|august|september|october|november|december)\b", comp_lower):
-            continue
+    return LeadFeatures(counts, len(signal_groups), tuple(slots), enriched_company)
 
-        # HARD BLOCK: temporal phrases
-        if re.search(r"\b(19|20)\d{2}\b", comp_lower):
-            continue
 
-        # HARD BLOCK: sentence fragments masquerading as companies
-        if comp_lower.startswith(("a ")):
-            continue
+def _score_matrix(X, w):
+    """
+    Returns (scores, no_geo_penalty_fired) for a feature matrix.
+    """
+    X = np.atleast_2d(X)
 
-        if len(comp_clean) < 3:
-            continue
-        if any(bad in comp_lower for bad in stop_phrases):
-            continue
-        if re.fullmatch(r"\d+", comp_clean):
-            continue
+    # Everything scored before the geography confirmation check, added one term
+    # at a time in the order score_text always used: the no-geo check compares a
+    # float sum against exactly 5.0, so a dot product (different rounding) would
+    # flip the penalty for leads that sum to 4.999... or 5.0
+    score = np.zeros(len(X))
+    for name in PRE_GEO_ORDER:
+        column = X[:, F[name]]
+        for j in range(int(column.max(initial=0))):
+            score = score + (column > j) * w[F[name]]
+    score = score + (X[:, F["geo_group"]] * w[F["geo_group"]] + X[:, F["uae_city"]] * w[F["uae_city"]])
 
-        descriptor_blocks = {
-            "career", "experience", "background", "journey", "early",
-            "age", "years", "industry", "field", "space",
-            "company", "companies", "organization", "organizations",
-            "venture", "ventures", "startup", "startups",
-            "business", "businesses", "firm", "firms"
-        }
+    penalty = (
+        (X[:, F["uae_domain"]] == 0)
+        & (score >= NO_GEO_THRESHOLD)
+        & (X[:, F["geo_confirmed"]] == 0)
+    )
 
-        first_words = comp_lower.split()[:3]
-        if any(w in descriptor_blocks for w in first_words):
-            continue
+    score = (
+        score
+        + X[:, F["uae_domain"]] * w[F["uae_domain"]]
+        + penalty * w[F["no_geo_penalty"]]
+        + X[:, F["outside_region_domain"]] * w[F["outside_region_domain"]]
+    )
 
-        cleaned_companies.append(comp_clean)
+    return np.clip(score, 0.0, 10.0), penalty
 
-    # FINAL GLOBAL FILTER PASS
-    filtered_companies = []
 
-    for candidate in company_candidates:
-        candidate_clean = candidate.strip()
+def score_features(X, config=None):
+    """
+    Scores a (n_leads, n_features) count matrix against a ScoringConfig.
+    Caps, penalties and group bonuses match score_text; no text is touched.
+    """
+    config = config or DEFAULT_CONFIG
+    return _score_matrix(X, config.weights())[0]
 
-        if len(candidate_clean) <= 2:
-            continue
 
-        if contains_bucket_keyword(candidate_clean):
+def confidence_label(group_count):
+    return "High" if group_count >= 3 else "Medium" if group_count == 2 else "Low"
+
+
+def build_signals(features, config=None, penalty=None):
+    """
+    Structured signals for one lead with weights taken from config.
+    """
+    config = config or DEFAULT_CONFIG
+    w = config.weights()
+    if penalty is None:
+        penalty = _score_matrix(features.counts, w)[1][0]
+
+    signals = [Signal(Code.GROUPS_FIRED, -1, 0.0, features.group_count)]
+
+    for code, kw, detail, column in features.slots:
+        if code == Code.NO_GEO_PENALTY and not penalty:
             continue
 
-        filtered_companies.append(candidate_clean)
+        weight = w[column]
+        if code == Code.GEO_SIGNALS:
+            weight += features.counts[F["uae_city"]] * w[F["uae_city"]]
 
-    company_candidates = filtered_companies
-        
+        signals.append(Signal(code, kw, float(weight), detail))
 
-    # Deduplicate while preserving order
-    cleaned_companies = list(dict.fromkeys(cleaned_companies))
+    return signals
 
-    enriched_company = ""
-    if cleaned_companies:
-        enriched_company = cleaned_companies[0]
-        score += 0.3
-        breakdown.append(f"Company affiliation: {enriched_company} (+0.3)")
 
-    geo_boost = 0
-    if any(k in text for k in uae_keywords + mena_keywords):
-        signal_groups.add("Geography")
-        geo_boost += GEO_GROUP_BONUS
-        
-        if "dubai" in text or "abu dhabi" in text:
-            geo_boost += 0.3
-            breakdown.append("Explicit UAE city mentioned (+0.3)")
-        
-        breakdown.append(f"Geography signals (+{round(geo_boost, 1)})")
-        score += geo_boost
+def score_text(text, query, url="", config=None):
+    config = config or DEFAULT_CONFIG
+    features = extract_features(text, url)
 
-    if "ae.linkedin.com/in" in url:
-        score += GEO_GROUP_BONUS
-        breakdown.append("UAE LinkedIn domain (+0.6)")
-    elif score >= 5.0 and "Geography" not in signal_groups:
-        score -= 1.3 #changed from 1.1 because Matt H. got 5 with Location United States
-        breakdown.append("High score without geography confirmation (-1.3)")
+    scores, penalty = _score_matrix(features.counts, config.weights())
+    score = float(scores[0])
 
-    if any(dom in url for dom in ["in.linkedin.com/in", "br.linkedin.com/in", "pk.linkedin.com/in"]):
-        score -= 0.3
-        breakdown.append("Outside Region LinkedIn country domain (-0.3)")
-    
-   
-    score = max(0.0, min(score, 10.0))
+    breakdown = build_signals(features, config, penalty[0])
+    confidence = confidence_label(features.group_count)
 
-    confidence = "High" if len(signal_groups) >= 3 else "Medium" if len(signal_groups) == 2 else "Low"
-    breakdown.insert(0, f"Signal groups fired: {len(signal_groups)}")
+    return score, confidence, breakdown, features.enriched_company
 
-    return score, confidence, breakdown, enriched_company
+
+def _batch_columns(texts, urls):
+    """
+    Resolves (texts, urls) into two plain lists.
+    A DataFrame may carry a "text" column or Title/Snippet columns, plus URL.
+    """
+    if hasattr(texts, "columns"):
+        df = texts
+        cols = {c.lower(): c for c in df.columns}
+
+        if "text" in cols:
+            text_col = df[cols["text"]].astype(str)
+        else:
+            title = df[cols["title"]].astype(str) if "title" in cols else ""
+            snippet = df[cols["snippet"]].astype(str) if "snippet" in cols else ""
+            text_col = title + " " + snippet
+
+        if urls is None and "url" in cols:
+            urls = df[cols["url"]].astype(str)
+
+        texts = text_col.tolist()
+    else:
+        texts = [str(t) for t in texts]
+
+    if urls is None:
+        urls = [""] * len(texts)
+    else:
+        urls = [str(u) for u in urls]
+
+    if len(urls) != len(texts):
+        raise ValueError(f"Got {len(texts)} texts but {len(urls)} urls")
+
+    return texts, urls
+
+
+def score_text_batch(texts, urls=None, config=None):
+    """
+    Scores many snippets in one call.
+    Identical (text, url) pairs are processed once; the keyword matcher and
+    company patterns are shared by every row, and all scores come from one
+    pass over the feature matrix.
+    Returns columnar arrays: score, confidence, signals, enriched_company and
+    the feature count matrix (for re-scoring with another ScoringConfig).
+    """
+    config = config or DEFAULT_CONFIG
+    texts, urls = _batch_columns(texts, urls)
+    n = len(texts)
+
+    seen = {}
+    rows = []
+    for key in zip(texts, urls):
+        features = seen.get(key)
+        if features is None:
+            features = extract_features(key[0], key[1])
+            seen[key] = features
+        rows.append(features)
+
+    X = np.vstack([f.counts for f in rows]) if rows else np.zeros((0, len(FEATURE_NAMES)))
+    scores, penalties = _score_matrix(X, config.weights())
+
+    confidences = np.empty(n, dtype=object)
+    signals = np.empty(n, dtype=object)
+    companies = np.empty(n, dtype=object)
+
+    for i, features in enumerate(rows):
+        confidences[i] = confidence_label(features.group_count)
+        signals[i] = build_signals(features, config, penalties[i])
+        companies[i] = features.enriched_company
+
+    return {
+        "score": scores,
+        "confidence": confidences,
+        "signals": signals,
+        "enriched_company": companies,
+        "features": X,
+    }
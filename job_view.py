@@ -0,0 +1,61 @@
+import pandas as pd
+import streamlit as st
+
+from jobs import ACTIVE, get_runner
+
+POLL_SECONDS = 1.0
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _poll(job_id, label):
+    job = get_runner().get(job_id)
+
+    # Rerun the whole page whenever the job reports progress, so the tables
+    # pick up the partial results it has written to the store
+    seen_key = f"job_seen_{job_id}"
+    seen = (job["status"], job["done"], job["message"])
+    if seen_key not in st.session_state:
+        st.session_state[seen_key] = seen
+    elif st.session_state[seen_key] != seen:
+        st.session_state[seen_key] = seen
+        st.rerun()
+
+    if job["status"] == "queued":
+        st.info(f"{label}: queued behind another job")
+    elif job["status"] == "running":
+        st.progress(job["done"] / job["total"] if job["total"] else 0.0, text=f"{label}: {job['done']}/{job['total']}")
+        if job["message"]:
+            st.write(job["message"])
+
+
+def show_job(workspace, kind, label):
+    """
+    Status of the newest job of this kind. Active jobs are polled without blocking
+    the script; finished ones leave a one-line summary.
+    """
+    job = get_runner().latest(workspace, kind)
+    if job is None:
+        return
+
+    if job["status"] in ACTIVE:
+        _poll(job["id"], label)
+    elif job["status"] == "done":
+        st.success(f"{label} complete.")
+        show_stage_stats((job["result"] or {}).get("stages"))
+    elif job["status"] == "failed":
+        st.error(f"{label} failed: {job['error']}")
+    else:
+        st.warning(f"{label} was interrupted by a restart.")
+
+
+def show_stage_stats(stages):
+    """
+    Per-stage counters of a pipeline run, as returned by engine.Pipeline.stats_table().
+    """
+    if stages:
+        with st.expander("Stage throughput"):
+            st.dataframe(pd.DataFrame(stages), hide_index=True, use_container_width=True)
+
+
+def is_running(workspace):
+    return bool(get_runner().active(workspace))
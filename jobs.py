@@ -0,0 +1,195 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from lead_store import STORE_PATH
+
+ACTIVE = ("queued", "running")
+
+log = logging.getLogger(__name__)
+
+
+class Job:
+    """
+    Handle a job function receives; progress() is persisted so any session can poll it.
+    """
+
+    def __init__(self, runner, job_id):
+        self.runner = runner
+        self.id = job_id
+
+    def progress(self, done=None, total=None, message=None):
+        self.runner._update(self.id, done=done, total=total, message=message)
+
+
+class JobRunner:
+    """
+    Runs discovery / verification jobs on a small thread pool, outside Streamlit's
+    script threads, so a rerun or a closed browser tab does not stop them.
+    Status, progress and a result summary live in SQLite next to the lead store;
+    the leads themselves are written to the store by the job as it goes.
+
+    Jobs of the same workspace run one after another; the others wait as "queued"
+    in a per-workspace queue and only reach the pool once the previous one is done,
+    so they never hold a pool worker that another workspace could use.
+    """
+
+    def __init__(self, path=STORE_PATH, max_workers=2):
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                workspace TEXT NOT NULL,
+                status TEXT NOT NULL,
+                done INTEGER NOT NULL DEFAULT 0,
+                total INTEGER NOT NULL DEFAULT 0,
+                message TEXT NOT NULL DEFAULT '',
+                result TEXT,
+                error TEXT,
+                created REAL NOT NULL,
+                started REAL,
+                finished REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_workspace ON jobs (workspace, kind)")
+
+        # Jobs of a previous process can no longer finish
+        self._conn.execute(
+            "UPDATE jobs SET status = 'interrupted', finished = ? WHERE status IN (?, ?)",
+            (time.time(),) + ACTIVE
+        )
+        self._conn.commit()
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._futures = {}                  # job id -> Future set when the job has finished
+        self._pending = defaultdict(deque)  # workspace -> queued (job id, fn, args, kwargs)
+        self._busy = set()                  # workspaces with a job in the pool
+
+    def submit(self, kind, workspace, fn, *args, **kwargs):
+        """
+        Queues fn(job, *args, **kwargs) and returns the job id. The function's
+        return value (a small JSON-serializable summary) is stored as the result.
+        """
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO jobs (kind, workspace, status, created) VALUES (?, ?, 'queued', ?)",
+                (kind, workspace, time.time())
+            )
+            self._conn.commit()
+            job_id = cur.lastrowid
+
+            self._futures[job_id] = Future()
+            self._pending[workspace].append((job_id, fn, args, kwargs))
+            start = workspace not in self._busy
+            self._busy.add(workspace)
+
+        if start:
+            self._start_next(workspace)
+        return job_id
+
+    def _start_next(self, workspace):
+        # Hands the workspace's oldest queued job to the pool, or marks the workspace idle
+        with self._lock:
+            if not self._pending[workspace]:
+                self._busy.discard(workspace)
+                return
+            job_id, fn, args, kwargs = self._pending[workspace].popleft()
+        self._pool.submit(self._run, job_id, workspace, fn, args, kwargs)
+
+    def _run(self, job_id, workspace, fn, args, kwargs):
+        try:
+            self._update(job_id, status="running", started=time.time())
+            try:
+                # Serialized here so a result that cannot be stored fails the job
+                result = json.dumps(fn(Job(self, job_id), *args, **kwargs))
+            except Exception as e:
+                log.exception("Job %d failed", job_id)
+                self._update(job_id, status="failed", error=f"{type(e).__name__}: {e}", finished=time.time())
+            else:
+                self._update(job_id, status="done", result=result, finished=time.time())
+        finally:
+            with self._lock:
+                future = self._futures.pop(job_id, None)
+            if future is not None:
+                future.set_result(None)
+            self._start_next(workspace)
+
+    def _update(self, job_id, **fields):
+        fields = {k: v for k, v in fields.items() if v is not None}
+        if not fields:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET {', '.join(f'{k} = ?' for k in fields)} WHERE id = ?",
+                tuple(fields.values()) + (job_id,)
+            )
+            self._conn.commit()
+
+    def _rows(self, where, params, limit=None):
+        query = f"SELECT * FROM jobs WHERE {where} ORDER BY id DESC"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            cur = self._conn.execute(query, params)
+            names = [d[0] for d in cur.description]
+            rows = cur.fetchall()
+
+        jobs = []
+        for row in rows:
+            job = dict(zip(names, row))
+            job["result"] = json.loads(job["result"]) if job["result"] else None
+            jobs.append(job)
+        return jobs
+
+    def get(self, job_id):
+        jobs = self._rows("id = ?", (job_id,))
+        return jobs[0] if jobs else None
+
+    def latest(self, workspace, kind=None):
+        """
+        Newest job of a workspace (and kind), or None.
+        """
+        if kind is None:
+            jobs = self._rows("workspace = ?", (workspace,), limit=1)
+        else:
+            jobs = self._rows("workspace = ? AND kind = ?", (workspace, kind), limit=1)
+        return jobs[0] if jobs else None
+
+    def active(self, workspace):
+        return self._rows("workspace = ? AND status IN (?, ?)", (workspace,) + ACTIVE)
+
+    def wait(self, job_id, timeout=None):
+        """
+        Blocks until the job has finished; returns its row.
+        """
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout)
+        return self.get(job_id)
+
+
+_default_runner = None
+_default_lock = threading.Lock()
+
+
+def get_runner():
+    """
+    Process-wide job runner, created on first use.
+    """
+    global _default_runner
+    with _default_lock:
+        if _default_runner is None:
+            _default_runner = JobRunner()
+    return _default_runner
@@ -0,0 +1,111 @@
+from collections import deque
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over several keyword buckets.
+    Built once, then finds every bucket's hits in a single pass over the text.
+    """
+
+    def __init__(self, buckets):
+        # buckets: {"identity": [...], "behavior": [...], ...}
+        self.buckets = {name: list(words) for name, words in buckets.items()}
+
+        # Keyword -> list of (bucket, position in that bucket)
+        self.owners = {}
+        for name, words in self.buckets.items():
+            for pos, word in enumerate(words):
+                self.owners.setdefault(word, []).append((name, pos))
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for word in self.owners:
+            node = 0
+            for ch in word:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(word)
+
+        # Breadth-first fail links; outputs are merged so every match is reported
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text):
+        """
+        Yields (end_index, keyword) for every occurrence, overlapping ones included.
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        node = 0
+
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for word in out[node]:
+                yield i + 1, word
+
+    def found(self, text, whole_word=False):
+        """
+        Returns the set of keywords present in text.
+        With whole_word=True, applies the same boundary rule as r'\\b' + word + r'\\b'.
+        """
+        hits = set()
+
+        for end, word in self.iter_matches(text):
+            if word in hits:
+                continue
+            if whole_word and not self._at_boundary(text, end - len(word), end, word):
+                continue
+            hits.add(word)
+
+        return hits
+
+    def match(self, text, whole_word=False):
+        """
+        Returns {bucket: [hits]} with hits kept in lexicon order, like
+        [k for k in bucket if k in text].
+        """
+        hits = {name: [] for name in self.buckets}
+
+        for word in self.found(text, whole_word):
+            for name, pos in self.owners[word]:
+                hits[name].append((pos, word))
+
+        return {name: [w for _, w in sorted(found)] for name, found in hits.items()}
+
+    def any_match(self, text, whole_word=False):
+        return bool(self.found(text, whole_word))
+
+    @staticmethod
+    def _at_boundary(text, start, end, word):
+        before = text[start - 1] if start > 0 else ""
+        after = text[end] if end < len(text) else ""
+
+        if _is_word_char(word[0]) == (bool(before) and _is_word_char(before)):
+            return False
+        if _is_word_char(word[-1]) == (bool(after) and _is_word_char(after)):
+            return False
+        return True
@@ -0,0 +1,188 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import first_pass
+import second_pass
+from signals import Code, has_code, render_text
+from feature_vectorizer import SignalVectorizer
+
+# Fixed feature layout for new models; saved inside model.pkl
+FEATURE_VECTORIZER = SignalVectorizer()
+
+LABEL_COLUMNS = ["LABEL_Identity", "LABEL_Behavior", "LABEL_Geo"]
+
+SHEET_COLUMNS = (
+    ["Name", "Title", "Snippet", "URL", "FP_Score", "SP_Score", "FP_Signals", "SP_Signals"]
+    + FEATURE_VECTORIZER.columns
+    + LABEL_COLUMNS
+)
+
+CHUNK_ROWS = 2000
+
+
+def extract_name(title):
+    for sep in [" - ", " | ", " – ", " — "]:
+        if sep in title:
+            return title.split(sep)[0].strip()
+    return title.strip()
+
+# --- HEURISTIC AUTO-FILL LOGIC ---
+def estimate_manual_labels(row, fp_score, sp_score, fp_signals, sp_signals):
+    # Fix: Fetching keys with case-insensitivity
+    t_val = str(row.get('Title', row.get('title', ''))).lower()
+    s_val = str(row.get('Snippet', row.get('snippet', ''))).lower()
+    combined_text = f"{t_val} {s_val}"
+
+    # IDENTITY ESTIMATE
+    est_id = 1
+    # Strong signals in title text
+    if any(k in t_val for k in ["angel investor", "founding partner", "managing partner", "family office"]):
+        est_id = 9
+    elif any(k in t_val for k in ["ceo", "private equity", "partner", "incubator", "angel", "founder", "co-founder"]):
+        est_id = 8
+    elif has_code(fp_signals, Code.BEHAVIOR_SYNERGY):
+        est_id = 7
+
+    # BEHAVIOR ESTIMATE
+    est_beh = 1
+    if any(k in combined_text for k in ["portfolio", "invested in", "funding", "exits", "series a", "seed"]):
+        est_beh = 8
+    elif has_code(fp_signals, Code.BEHAVIOR_KEYWORD):
+        est_beh = 7
+    elif sp_score > 3.0:
+        est_beh = 5
+
+    # GEOGRAPHY ESTIMATE
+    est_geo = 1
+    if any(k in combined_text for k in ["dubai", "abu dhabi", "uae", "united arab emirates"]):
+        est_geo = 10
+    elif any(k in combined_text for k in ["middle east", "emirates", "mena", "gcc"]):
+        est_geo = 9
+    elif has_code(fp_signals, Code.GEO_SIGNALS):
+        est_geo = 8
+    elif has_code(fp_signals, Code.UAE_DOMAIN):
+        est_geo = 7
+
+    # Penalty for mismatch
+    if any(k in combined_text for k in ["new york", "london", "india", "united states"]):
+        if est_geo < 8:
+            est_geo = 2
+
+    return est_id, est_beh, est_geo
+
+
+def label_chunk(raw_df):
+    """
+    Scores one chunk of the raw SERP export into label-sheet rows.
+    Top-level and free of Streamlit so it can run in a worker process.
+    """
+    records = []
+    for row in raw_df.to_dict("records"):
+        title = str(row.get("Title", row.get("title", "")))
+        snippet = str(row.get("Snippet", row.get("snippet", "")))
+        url = str(row.get("URL", row.get("url", "")))
+        name = extract_name(title)
+        if not name or len(name.split()) < 2:
+            continue
+        records.append((row, title, snippet, url, name))
+
+    if not records:
+        return pd.DataFrame(columns=SHEET_COLUMNS)
+
+    # Run Logic: first pass for the whole chunk in one batch
+    fp = first_pass.score_text_batch(
+        [f"{title} {snippet}" for _, title, snippet, _, _ in records],
+        [url for _, _, _, url, _ in records]
+    )
+
+    sp_results = []
+    for row, title, snippet, url, name in records:
+        combined_text = f"{title} {snippet}"
+        state = second_pass.new_state(name)
+        sp_results.append(second_pass.score_second_pass(combined_text, url, state))
+
+    # Binary features for the whole chunk in one matrix
+    features = FEATURE_VECTORIZER.transform(
+        fp["signals"],
+        [sp_signals for _, sp_signals, _ in sp_results]
+    )
+
+    rows = []
+    for i, (row, title, snippet, url, name) in enumerate(records):
+        fp_score, fp_signals = fp["score"][i], fp["signals"][i]
+        sp_score, sp_signals, _ = sp_results[i]
+
+        est_id, est_beh, est_geo = estimate_manual_labels(row, fp_score, sp_score, fp_signals, sp_signals)
+
+        rows.append([
+            name, title, snippet, url,
+            round(fp_score, 2), round(sp_score, 2),
+            render_text(fp_signals, ", "), render_text(sp_signals, ", "),
+            *features[i].astype(int),
+            est_id, est_beh, est_geo
+        ])
+
+    return pd.DataFrame(rows, columns=SHEET_COLUMNS)
+
+
+def _default_workers():
+    return max(1, min(4, (os.cpu_count() or 1) - 1))
+
+
+def generate_label_sheet(source, out_path, chunk_rows=CHUNK_ROWS, workers=None, progress=None):
+    """
+    Streams the raw CSV in chunks, scores them across a process pool and appends
+    each finished chunk to out_path in input order. Returns the number of sheet rows.
+    progress(rows_read, rows_written) is called after every chunk.
+    """
+    workers = workers or _default_workers()
+    tmp_path = f"{out_path}.part"
+
+    reader = pd.read_csv(source, chunksize=chunk_rows)
+    rows_read = 0
+    rows_written = 0
+
+    def write(chunk_df):
+        nonlocal rows_written
+        if chunk_df.empty:
+            return
+        chunk_df.to_csv(tmp_path, mode="a", header=rows_written == 0, index=False)
+        rows_written += len(chunk_df)
+
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    if workers == 1:
+        for raw_df in reader:
+            rows_read += len(raw_df)
+            write(label_chunk(raw_df))
+            if progress:
+                progress(rows_read, rows_written)
+    else:
+        # spawn: forking a process that runs Streamlit's threads is not safe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            pending = []
+            for raw_df in reader:
+                rows_read += len(raw_df)
+                pending.append(pool.submit(label_chunk, raw_df))
+
+                # Bound memory: keep at most two chunks per worker in flight
+                while len(pending) >= workers * 2:
+                    write(pending.pop(0).result())
+                    if progress:
+                        progress(rows_read, rows_written)
+
+            for future in pending:
+                write(future.result())
+                if progress:
+                    progress(rows_read, rows_written)
+
+    if rows_written == 0:
+        pd.DataFrame(columns=SHEET_COLUMNS).to_csv(tmp_path, index=False)
+
+    os.replace(tmp_path, out_path)
+    return rows_written
@@ -0,0 +1,51 @@
+class LeadIndex:
+    """
+    Hash index over a list of lead dicts, keyed on normalized URL.
+    Replaces the full-list scans in is_duplicate_url / find_existing_person:
+    each URL is normalized once, and word sets are cached per record until
+    its Title / Snippet changes.
+    """
+
+    def __init__(self, records, normalize):
+        self.records = records  # the caller's list; add() appends to it
+        self.normalize = normalize
+
+        self._by_url = {}   # normalized URL -> positions in records, in insertion order
+        self._words = {}    # position -> (text, word set)
+
+        for i, r in enumerate(records):
+            self._by_url.setdefault(normalize(r.get("URL", "")), []).append(i)
+
+    def add(self, record):
+        self._by_url.setdefault(self.normalize(record.get("URL", "")), []).append(len(self.records))
+        self.records.append(record)
+
+    def _record_words(self, i):
+        r = self.records[i]
+        text = (r.get("Title", "") + r.get("Snippet", "")).lower()
+
+        cached = self._words.get(i)
+        if cached is None or cached[0] != text:
+            cached = (text, set(text.split()))
+            self._words[i] = cached
+
+        return cached[1]
+
+    def find(self, url):
+        """
+        Position of the first record with the same normalized URL, or None.
+        """
+        positions = self._by_url.get(self.normalize(url))
+        return positions[0] if positions else None
+
+    def is_duplicate(self, url, title, snippet, min_new_words=5):
+        """
+        True if a record with the same normalized URL already carries
+        all but fewer than min_new_words of this result's words.
+        """
+        positions = self._by_url.get(self.normalize(url))
+        if not positions:
+            return False
+
+        new_words = set((title + snippet).lower().split())
+        return any(len(new_words - self._record_words(i)) < min_new_words for i in positions)
@@ -0,0 +1,294 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+from signals import Code, Signal, keyword_id, keyword_text
+
+STORE_PATH = "lead_store.sqlite3"
+
+
+def canonical_url(url):
+    """
+    Lower-case URL without query, protocol, www. or LinkedIn country subdomain.
+    """
+    url = url.lower().strip()
+    url = url.split("?")[0]
+    url = re.sub(r'^https?://', '', url)
+    url = re.sub(r'^([a-z]{2}\.)?linkedin\.com', 'linkedin.com', url)
+    url = re.sub(r'^www\.', '', url)
+    return url.rstrip('/')
+
+
+# --- RECORD ENCODING ---
+# Signal keyword ids are assigned per process, so signals are stored with their keyword text
+
+def _encode_value(value):
+    if isinstance(value, list) and value and all(isinstance(s, Signal) for s in value):
+        return {"__signals__": [[int(s.code), keyword_text(s) or None, s.weight, s.detail] for s in value]}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "__signals__" in value:
+        return [
+            Signal(Code(code), keyword_id(kw) if kw is not None else -1, weight, detail)
+            for code, kw, weight, detail in value["__signals__"]
+        ]
+    return value
+
+
+def _json_default(value):
+    # numpy scalars from the scoring code
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode_record(record):
+    return json.dumps({k: _encode_value(v) for k, v in record.items()}, default=_json_default)
+
+
+def decode_record(payload):
+    return {k: _decode_value(v) for k, v in json.loads(payload).items()}
+
+
+class LeadStore:
+    """
+    SQLite-backed store for discovered leads, verification evidence and verdicts.
+    Shared by every Streamlit session in the process and across restarts; sessions
+    only read views of it. Rows are grouped by workspace (one per app view).
+
+    Lead records keep their row id under "_id" so save_leads() can update them in place.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+
+        self._lock = threading.Lock()
+        # Bumped on every lead / evidence write; verdicts remember the revision they were computed from
+        self._revisions = defaultdict(int)
+        self._verdict_revisions = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS leads (
+                id INTEGER PRIMARY KEY,
+                workspace TEXT NOT NULL,
+                canonical_url TEXT NOT NULL,
+                name TEXT NOT NULL,
+                score REAL,
+                payload TEXT NOT NULL,
+                updated REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_leads_url ON leads (workspace, canonical_url);
+            CREATE INDEX IF NOT EXISTS idx_leads_name ON leads (workspace, name);
+
+            CREATE TABLE IF NOT EXISTS evidence (
+                id INTEGER PRIMARY KEY,
+                workspace TEXT NOT NULL,
+                name TEXT NOT NULL,
+                source_url TEXT,
+                payload TEXT NOT NULL,
+                created REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_evidence_name ON evidence (workspace, name);
+
+            CREATE TABLE IF NOT EXISTS verdicts (
+                workspace TEXT NOT NULL,
+                name TEXT NOT NULL,
+                score REAL,
+                verdict TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (workspace, name)
+            );
+            CREATE INDEX IF NOT EXISTS idx_verdicts_verdict ON verdicts (workspace, verdict);
+        """)
+        self._conn.commit()
+
+    # --- LEADS ---
+
+    def leads(self, workspace):
+        """
+        Lead records of a workspace in discovery order.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, payload FROM leads WHERE workspace = ? ORDER BY id", (workspace,)
+            ).fetchall()
+
+        records = []
+        for lead_id, payload in rows:
+            record = decode_record(payload)
+            record["_id"] = lead_id
+            records.append(record)
+        return records
+
+    def find_lead(self, workspace, url):
+        """
+        First lead with the same canonical URL, or None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, payload FROM leads WHERE workspace = ? AND canonical_url = ? ORDER BY id LIMIT 1",
+                (workspace, canonical_url(url))
+            ).fetchone()
+
+        if row is None:
+            return None
+        record = decode_record(row[1])
+        record["_id"] = row[0]
+        return record
+
+    def _lead_row(self, record, now):
+        payload = encode_record({k: v for k, v in record.items() if k != "_id"})
+        return (canonical_url(record.get("URL", "")), record.get("Name", ""), record.get("Score"), payload, now)
+
+    def save_leads(self, workspace, records):
+        """
+        Inserts records without an "_id" (and sets it on them), updates the others.
+        """
+        now = time.time()
+        with self._lock:
+            for record in records:
+                row = self._lead_row(record, now)
+                if record.get("_id") is None:
+                    cur = self._conn.execute(
+                        "INSERT INTO leads (workspace, canonical_url, name, score, payload, updated) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (workspace,) + row
+                    )
+                    record["_id"] = cur.lastrowid
+                else:
+                    self._conn.execute(
+                        "UPDATE leads SET canonical_url = ?, name = ?, score = ?, payload = ?, updated = ? "
+                        "WHERE id = ? AND workspace = ?",
+                        row + (record["_id"], workspace)
+                    )
+            self._conn.commit()
+            self._revisions[workspace] += 1
+
+    def replace_leads(self, workspace, records):
+        """
+        Swaps the workspace's leads for records in one transaction.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("DELETE FROM leads WHERE workspace = ?", (workspace,))
+            self._conn.executemany(
+                "INSERT INTO leads (workspace, canonical_url, name, score, payload, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                [(workspace,) + self._lead_row(r, now) for r in records]
+            )
+            self._conn.commit()
+            self._revisions[workspace] += 1
+
+    def count_leads(self, workspace):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM leads WHERE workspace = ?", (workspace,)).fetchone()[0]
+
+    # --- VERIFICATION EVIDENCE ---
+
+    def evidence(self, workspace):
+        """
+        Evidence rows of a workspace in the order they were added.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM evidence WHERE workspace = ? ORDER BY id", (workspace,)
+            ).fetchall()
+        return [decode_record(payload) for payload, in rows]
+
+    def add_evidence(self, workspace, rows):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO evidence (workspace, name, source_url, payload, created) VALUES (?, ?, ?, ?, ?)",
+                [(workspace, r.get("Name", ""), r.get("Source URL"), encode_record(r), now) for r in rows]
+            )
+            self._conn.commit()
+            self._revisions[workspace] += 1
+
+    def verified_names(self, workspace):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT name FROM evidence WHERE workspace = ?", (workspace,)
+            ).fetchall()
+        return {name for name, in rows}
+
+    # --- VERDICTS ---
+
+    def revision(self, workspace):
+        """
+        Counter of lead and evidence writes to the workspace in this process.
+        """
+        with self._lock:
+            return self._revisions[workspace]
+
+    def verdicts_stale(self, workspace):
+        """
+        True when leads or evidence changed after the verdicts were last computed
+        (or they were not computed in this process yet).
+        """
+        with self._lock:
+            return self._verdict_revisions.get(workspace) != self._revisions[workspace]
+
+    def put_verdicts(self, workspace, records, score_key="Final Score", verdict_key="Final Verdict", revision=None):
+        """
+        Upserts consolidated rows keyed by name. revision: store revision the rows
+        were computed from, which verdicts_stale() compares against.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (workspace, r["Name"], r.get(score_key), r[verdict_key], encode_record(r), now)
+                    for r in records
+                ]
+            )
+            self._conn.commit()
+            if revision is not None:
+                self._verdict_revisions[workspace] = revision
+
+    def verdicts(self, workspace, verdict=None):
+        query = "SELECT payload FROM verdicts WHERE workspace = ?"
+        params = (workspace,)
+        if verdict is not None:
+            query += " AND verdict = ?"
+            params += (verdict,)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [decode_record(payload) for payload, in rows]
+
+    def verdict_counts(self, workspace):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT verdict, COUNT(*) FROM verdicts WHERE workspace = ? GROUP BY verdict", (workspace,)
+            ).fetchall()
+        return dict(rows)
+
+    def clear(self, workspace):
+        with self._lock:
+            for table in ("leads", "evidence", "verdicts"):
+                self._conn.execute(f"DELETE FROM {table} WHERE workspace = ?", (workspace,))
+            self._conn.commit()
+            self._revisions[workspace] += 1
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_store():
+    """
+    Process-wide store instance, created on first use.
+    """
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = LeadStore()
+    return _default_store
@@ -1,62 +1,50 @@
-import streamlit as st
+from functools import lru_cache
+
 import pandas as pd
-import joblib
-
-from xgboost import XGBRegressor
-from sklearn.multioutput import MultiOutputRegressor
-
-import first_pass
-import second_pass
-
-def extract_name(title):
-    for sep in [" - ", " | ", " – ", " — "]:
-        if sep in title:
-            return title.split(sep)[0].strip()
-    return title.strip()
-
-# --- HEURISTIC AUTO-FILL LOGIC ---
-def estimate_manual_labels(row, fp_score, sp_score, fp_signals, sp_signals):
-    # Fix: Fetching keys with case-insensitivity
-    t_val = str(row.get('Title', row.get('title', ''))).lower()
-    s_val = str(row.get('Snippet', row.get('snippet', ''))).lower()
-    combined_text = f"{t_val} {s_val}"
-
-    # IDENTITY ESTIMATE
-    est_id = 1
-    # Strong signals in title text
-    if any(k in t_val for k in ["angel investor", "founding partner", "managing partner", "family office"]):
-        est_id = 9
-    elif any(k in t_val for k in ["ceo", "private equity", "partner", "incubator", "angel", "founder", "co-founder"]):
-        est_id = 8
-    elif any("Identity" in clean_signal(str(s)) for s in fp_signals):
-        est_id = 7
-    
-    # BEHAVIOR ESTIMATE
-    est_beh = 1
-    if any(k in combined_text for k in ["portfolio", "invested in", "funding", "exits", "series a", "seed"]):
-        est_beh = 8
-    elif any("Behavior" in clean_signal(str(s)) for s in fp_signals) or any("Behavior" in clean_signal(str(s)) for s in sp_signals):
-        est_beh = 7
-    elif sp_score > 3.0: 
-        est_beh = 5
-
-    # GEOGRAPHY ESTIMATE
-    est_geo = 1
-    if any(k in combined_text for k in ["dubai", "abu dhabi", "uae", "united arab emirates"]):
-        est_geo = 10
-    elif any(k in combined_text for k in ["middle east", "emirates", "mena", "gcc"]):
-        est_geo = 9
-    elif any("Geography" in clean_signal(str(s)) for s in fp_signals) or any("Geography" in clean_signal(str(s)) for s in sp_signals):
-        est_geo = 8
-    elif any("UAE LinkedIn domain" in clean_signal(str(s)) for s in fp_signals):
-        est_geo = 7   
-    
-    # Penalty for mismatch
-    if any(k in combined_text for k in ["new york", "london", "india", "united states"]):
-        if est_geo < 8:
-            est_geo = 2
-
-    return est_id, est_beh, est_geo
+import numpy as np
+
+from signals import render
+from model_registry import get_registry
+from compact_model import export_compact
+from label_sheet import (FEATURE_VECTORIZER, LABEL_COLUMNS, extract_name,
+                         estimate_manual_labels, generate_label_sheet)
+
+SHEET_PATH = "ready_to_label.csv"
+PREVIEW_ROWS = 1000
+
+# --- MODEL ---
+XGB_PARAMS = {
+    "n_estimators": 150,
+    "max_depth": 5,
+    "learning_rate": 0.07,
+    "random_state": 42,
+}
+
+MODEL_KINDS = {
+    "native": "Native multi-output XGBoost",
+    "per_label": "Per-label XGBoost (MultiOutputRegressor)",
+}
+
+def build_model(kind="native"):
+    """
+    Both kinds take the (n, 3) label matrix in fit() and return (n, 3) from predict(),
+    so inference does not need to know which one it got.
+    """
+    # Imported here: xgboost pulls in sklearn and takes seconds, and only training needs it
+    from xgboost import XGBRegressor
+    from sklearn.multioutput import MultiOutputRegressor
+
+    if kind == "native":
+        return XGBRegressor(
+            **XGB_PARAMS,
+            tree_method="hist",
+            multi_strategy="multi_output_tree",
+            n_jobs=-1
+        )
+    if kind == "per_label":
+        return MultiOutputRegressor(XGBRegressor(**XGB_PARAMS))
+
+    raise ValueError(f"Unknown model kind: {kind}")
 
 def clean_key(text):
     return text.strip().upper().replace(" ", "_")
@@ -66,38 +54,58 @@ def clean_signal(text):
         return text.split("(+")[0].strip()
     return text.strip()
 
-def build_feature_vector(fp_signals, sp_signals, expected_columns=None):
+@lru_cache(maxsize=8192)
+def feature_key(prefix, line):
+    return f"{prefix}_HAS_{clean_key(clean_signal(line))}"
+
+def feature_keys(signals, prefix):
     """
-    Builds consistent binary feature vector.
-    If expected_columns is provided, ensures perfect alignment.
+    Column names for a structured signal list; rendering happens once per distinct signal.
     """
-    features = {}
+    return [feature_key(prefix, line) for line in render(signals)]
 
-    for sig in fp_signals:
-        cleaned = clean_signal(sig)
-        key = f"FP_HAS_{clean_key(cleaned)}"
-        features[key] = 1
+def build_feature_vector(fp_signals, sp_signals, vectorizer=FEATURE_VECTORIZER):
+    """
+    Single-lead feature row in the vectorizer's fixed layout.
+    """
+    return pd.DataFrame(vectorizer.transform([fp_signals], [sp_signals]), columns=vectorizer.columns)
 
-    for sig in sp_signals:
-        cleaned = clean_signal(sig)
-        key = f"SP_HAS_{clean_key(cleaned)}"
-        features[key] = 1
+def build_legacy_matrix(fp_signal_lists, sp_signal_lists, expected_columns):
+    """
+    Rendered-text FP_HAS_* / SP_HAS_* features, for models trained before the vectorizer.
+    Keys the model has never seen are dropped.
+    """
+    column_index = {col: j for j, col in enumerate(expected_columns)}
+    X = np.zeros((len(fp_signal_lists), len(expected_columns)))
 
-    df = pd.DataFrame([features]).fillna(0)
+    for i, (fp_signals, sp_signals) in enumerate(zip(fp_signal_lists, sp_signal_lists)):
+        for key in feature_keys(fp_signals, "FP") + feature_keys(sp_signals, "SP"):
+            j = column_index.get(key)
+            if j is not None:
+                X[i, j] = 1
 
-    # If training phase → no expected columns yet
-    if expected_columns is None:
-        return df
+    return pd.DataFrame(X, columns=expected_columns)
 
-    # If inference phase → force alignment
-    for col in expected_columns:
-        if col not in df.columns:
-            df[col] = 0
+def predict_scores(model, fp_signal_lists, sp_signal_lists, expected_columns, vectorizer=None):
+    """
+    One predict call for all leads. Returns an (n, 3) array of
+    identity / behavior / geo predictions clipped to 1..10.
+    """
+    if not len(fp_signal_lists):
+        return np.zeros((0, 3))
 
-    return df[expected_columns]
+    if vectorizer is None:
+        X = build_legacy_matrix(fp_signal_lists, sp_signal_lists, expected_columns)
+    else:
+        X = pd.DataFrame(vectorizer.transform(fp_signal_lists, sp_signal_lists), columns=vectorizer.columns)
+
+    return np.clip(model.predict(X), 1, 10)
 
 
 def run_ml_trainer():
+    # Imported here so the batch pipeline can use predict_scores without Streamlit
+    import streamlit as st
+
     st.title("machine learning training")
 
     st.header("Generate sheet")
@@ -108,88 +116,77 @@ def run_ml_trainer():
     )
 
     if raw_file and st.button("Generate Sheet"):
-        raw_df = pd.read_csv(raw_file)
-        rows = []
-
-        for _, row in raw_df.iterrows():
-            title = str(row.get("Title", row.get("title", "")))
-            snippet = str(row.get("Snippet", row.get("snippet", "")))
-            url = str(row.get("URL", row.get("url", "")))
-            name = extract_name(title)
-            if not name or len(name.split()) < 2:
-                continue
-
-            # Run Logic
-            combined_text = f"{title} {snippet}"
-            fp_score, _, fp_signals, _ = first_pass.score_text(combined_text, name, url)
-            
-            state = {"linkedin_hits": 0, "domain_hits": set(), "identity_confirmed": False, "geo_hits": 0, "expected_name": name.lower()}
-            sp_score, sp_signals, _ = second_pass.score_second_pass(combined_text, url, state)
-
-            feature_df = build_feature_vector(fp_signals, sp_signals)
-            binary_feats = feature_df.iloc[0].to_dict()
-
-            est_id, est_beh, est_geo = estimate_manual_labels(row, fp_score, sp_score, fp_signals, sp_signals)
-
-            entry = {
-                "Name": name,
-                "Title": title,
-                "Snippet": snippet,
-                "URL": url,
-                "FP_Score": round(fp_score, 2),
-                "SP_Score": round(sp_score, 2),
-                "FP_Signals": ", ".join(fp_signals),
-                "SP_Signals": ", ".join(sp_signals),
-                **binary_feats,
-                "LABEL_Identity": est_id,
-                "LABEL_Behavior": est_beh,
-                "LABEL_Geo": est_geo
-            }
-            rows.append(entry)
-
-        df = pd.DataFrame(rows).fillna(0)
-        st.success("Labeling sheet generated")
-        st.dataframe(df, use_container_width=True)
-
-        st.download_button(
-            "Download ready_to_label.csv",
-            df.to_csv(index=False),
-            file_name="ready_to_label.csv"
-        )
+        status = st.empty()
+        progress_bar = st.progress(0)
+        total_bytes = raw_file.size or 1
+
+        def report(rows_read, rows_written):
+            # Position in the upload approximates how much of the export has been read
+            progress_bar.progress(min(raw_file.tell() / total_bytes, 1.0))
+            status.write(f"Scored {rows_read:,} rows, {rows_written:,} leads written")
+
+        rows_written = generate_label_sheet(raw_file, SHEET_PATH, progress=report)
+        progress_bar.progress(1.0)
+
+        st.success(f"Labeling sheet generated ({rows_written:,} leads)")
+        st.dataframe(pd.read_csv(SHEET_PATH, nrows=PREVIEW_ROWS), use_container_width=True)
+
+        with open(SHEET_PATH, "rb") as f:
+            st.download_button(
+                "Download ready_to_label.csv",
+                f,
+                file_name="ready_to_label.csv"
+            )
 
     st.divider()
     st.header("AI training module")
     labeled_file = st.file_uploader("Upload labeled CSV", type=["csv"])
 
+    model_kind = st.radio(
+        "Model type",
+        list(MODEL_KINDS),
+        format_func=MODEL_KINDS.get,
+        help="Native: one XGBoost model predicts all three labels with shared trees. "
+             "Per-label: three separate XGBoost models (previous behaviour)."
+    )
+
     if labeled_file and st.button("Train Model"):
         data = pd.read_csv(labeled_file)
 
-        label_cols = ["LABEL_Identity", "LABEL_Behavior", "LABEL_Geo"]
-
-        X = data.drop(columns=label_cols).select_dtypes(include=["number"])
-        y = data[label_cols]
+        label_cols = LABEL_COLUMNS
 
-        model = MultiOutputRegressor(
-            XGBRegressor(
-                n_estimators=150,
-                max_depth=5,
-                learning_rate=0.07,
-                random_state=42
+        vectorizer = FEATURE_VECTORIZER
+        missing = [col for col in vectorizer.columns if col not in data.columns]
+        if missing:
+            st.error(
+                f"The sheet is missing {len(missing)} feature columns (e.g. {missing[0]}). "
+                "Regenerate it with 'Generate Sheet' and copy the labels over."
             )
-        )
+            return
+
+        # Only the fixed layout is trained on, so inference can rebuild it exactly
+        X = data[vectorizer.columns].astype(np.float32)
+        y = data[label_cols]
 
+        model = build_model(model_kind)
         model.fit(X, y)
 
         model_package = {
             "model": model,
-            "feature_columns": X.columns.tolist()
+            "model_kind": model_kind,
+            "feature_columns": X.columns.tolist(),
+            "vectorizer": vectorizer,
+            "schema_version": vectorizer.version
         }
 
-        joblib.dump(model_package, "model.pkl")
+        # Atomic writes; the registry picks the new files up on the next rerun in every session.
+        # The compact export goes last so it is the newer artifact and gets served.
+        get_registry().save(model_package)
+        export_compact(model, model_kind, vectorizer, get_registry().compact_path)
 
         st.success("Model trained successfully")
 
-        with open("model.pkl", "rb") as f:
+        with open(get_registry().path, "rb") as f:
             st.download_button(
                 "Download model.pkl",
                 f,
@@ -0,0 +1,151 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from compact_model import COMPACT_SCHEMA_PATH, load_compact
+
+MODEL_PATH = "model.pkl"
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class LoadedModel:
+    model: object
+    feature_columns: list
+    vectorizer: object    # SignalVectorizer, None for models trained on rendered signal text
+    version: int          # bumps every time a new file is loaded
+    load_seconds: float
+    file_bytes: int
+    memory_bytes: object  # resident memory growth during load, None if unknown
+    source: str = "pickle"  # "compact" when served from the exported boosters
+
+
+def _rss_bytes():
+    # Resident set size from /proc (Linux); None elsewhere
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ModelRegistry:
+    """
+    Loads the model once per process and shares it across Streamlit sessions.
+    Every get() compares the file's mtime/size with the loaded copy and reloads
+    when the trainer has written a new one.
+    Of model.pkl and the compact export, the newer one wins; the compact export
+    needs neither sklearn nor xgboost to load.
+    """
+
+    def __init__(self, path=MODEL_PATH, compact_path=COMPACT_SCHEMA_PATH):
+        self.path = path
+        self.compact_path = compact_path
+        self.current = None
+        self.error = None   # last load failure, shown instead of being swallowed
+
+        self._stamp = None
+        self._versions = 0
+        self._lock = threading.Lock()
+
+    def _file_stamp(self):
+        stamps = []
+        for source, path in (("compact", self.compact_path), ("pickle", self.path)):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stamps.append((st.st_mtime_ns, st.st_size, source))
+
+        return max(stamps) if stamps else None
+
+    def get(self):
+        """
+        Current LoadedModel, or None if there is no usable model file.
+        """
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return self.current
+
+        with self._lock:
+            if stamp != self._stamp:
+                self._load(stamp)
+
+        return self.current
+
+    def _load(self, stamp):
+        self._stamp = stamp
+
+        if stamp is None:
+            self.current = None
+            self.error = None
+            return
+
+        rss_before = _rss_bytes()
+        start = time.perf_counter()
+
+        source = stamp[2]
+        path = self.compact_path if source == "compact" else self.path
+        file_bytes = stamp[1]
+
+        try:
+            if source == "compact":
+                model, vectorizer, schema = load_compact(path)
+                feature_columns = schema["feature_columns"]
+                folder = os.path.dirname(path)
+                file_bytes += sum(os.path.getsize(os.path.join(folder, name)) for name in schema["boosters"])
+            else:
+                import joblib  # pulls in sklearn / xgboost through the pickle
+                package = joblib.load(path)
+                model = package["model"]
+                feature_columns = package["feature_columns"]
+                vectorizer = package.get("vectorizer")
+        except Exception as e:
+            # Keep serving the previous model if the new file is unreadable
+            self.error = f"{type(e).__name__}: {e}"
+            log.warning("Could not load %s: %s", path, self.error)
+            return
+
+        load_seconds = time.perf_counter() - start
+        rss_after = _rss_bytes()
+
+        self._versions += 1
+        self.error = None
+        self.current = LoadedModel(
+            model=model,
+            feature_columns=feature_columns,
+            vectorizer=vectorizer,
+            version=self._versions,
+            load_seconds=load_seconds,
+            file_bytes=file_bytes,
+            memory_bytes=rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+            source=source,
+        )
+        log.info("Loaded %s v%d in %.3fs", path, self._versions, load_seconds)
+
+    def save(self, package):
+        """
+        Writes a model package atomically so concurrent sessions never read a partial file.
+        """
+        import joblib
+        tmp = f"{self.path}.tmp"
+        joblib.dump(package, tmp)
+        os.replace(tmp, self.path)
+
+
+_default_registry = None
+_default_lock = threading.Lock()
+
+
+def get_registry():
+    """
+    Process-wide registry, created on first use.
+    """
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = ModelRegistry()
+    return _default_registry
@@ -0,0 +1,90 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every search worker.
+    rate = queries per second, burst = queries allowed back to back.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        # Caller holds the lock
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """
+        Takes one token and returns how long the caller must wait before using it.
+        """
+        with self._lock:
+            self._refill()
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+
+class AdaptivePacer(TokenBucket):
+    """
+    Token bucket whose rate follows what the search backend tolerates (AIMD):
+    every successful call adds `increase` queries/s up to max_rate, an error or
+    timeout multiplies the rate by `backoff` and a rate-limit response by
+    `ratelimit_backoff`, down to min_rate. A rate limit also empties the bucket,
+    so calls already queued wait at the lower rate.
+    """
+
+    FAILURES = ("ratelimit", "timeout", "error")
+
+    def __init__(self, rate=1.0, burst=2, min_rate=0.2, max_rate=5.0,
+                 increase=0.1, backoff=0.5, ratelimit_backoff=0.25):
+        super().__init__(rate, burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.backoff = backoff
+        self.ratelimit_backoff = ratelimit_backoff
+
+        self.successes = 0
+        self.failures = dict.fromkeys(self.FAILURES, 0)
+
+    def _set_rate(self, rate):
+        # Caller holds the lock; tokens earned so far are kept at the old rate
+        self._refill()
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+
+    def success(self):
+        with self._lock:
+            self.successes += 1
+            self._set_rate(self.rate + self.increase)
+
+    def failure(self, kind="error"):
+        """
+        kind: "ratelimit", "timeout" or "error".
+        """
+        with self._lock:
+            self.failures[kind] += 1
+            if kind == "ratelimit":
+                self._set_rate(self.rate * self.ratelimit_backoff)
+                self.tokens = min(self.tokens, 0)
+            else:
+                self._set_rate(self.rate * self.backoff)
+
+    def stats(self):
+        with self._lock:
+            return {"rate": self.rate, "successes": self.successes, **self.failures}
+
+
+# One pacer per process: every live search shares the backend's budget
+SEARCH_PACER = AdaptivePacer()
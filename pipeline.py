@@ -0,0 +1,379 @@
+import re
+import threading
+
+import pandas as pd
+
+from consolidation import consolidate
+from engine import Pipeline, Stage
+from first_pass import score_text
+from verifier import build_queries, verify_candidate
+from signals import Code, Signal, merge
+from search_cache import iter_cached_text
+from search_provider import get_provider
+from lead_index import LeadIndex
+from lead_store import canonical_url
+from model_registry import get_registry
+from resilience import SearchError
+
+BLOCKED_URLS = [
+    "bing.com/aclick",
+    "bing.com/ck/a",
+    "doubleclick.net"
+]
+
+# Filter: Only verify leads that scored reasonably well in Pass 1
+SECOND_PASS_THRESHOLD = 5.0
+
+
+# --- HELPERS ---
+
+def is_blocked(url):
+    return any(bad in canonical_url(url) for bad in BLOCKED_URLS)
+
+
+def soft_truncate_ellipsis(text: str) -> str:
+    if not text: return text
+    if "..." in text: return text.split("...")[0].strip()
+    return text
+
+
+def is_valid_person_name(name):
+    if not name: return False
+    if len(name.split()) < 2: return False
+    if re.fullmatch(r"[A-Z][a-z]+\s*\.", name): return False
+    if name.lower() in {"angel investor", "venture capital"}: return False
+    return True
+
+
+def extract_name(title):
+    for sep in [" - ", " | ", " – ", " — "]:
+        if sep in title:
+            return title.split(sep)[0].strip()
+    return title.strip()
+
+
+def clean_linkedin_title(title):
+    # Cut everything after "| LinkedIn"
+    if " | LinkedIn" in title:
+        match = re.search(r'(\s*[-–—]?\s*\|\s*LinkedIn)', title)
+        if match:
+            cut_idx = match.start()
+            title = title[:cut_idx + len(match.group(0))].strip()
+        else:
+            parts = title.split(" | LinkedIn")
+            title = parts[0].strip() + " | LinkedIn"
+    return title
+
+
+# --- STAGES ---
+# Steps for engine.Pipeline; each takes one item and yields what the next step needs
+
+def search_stage(max_results, backend="lite", failed=None, on_done=None, provider=None):
+    """
+    query -> (query, result) for every SERP result, as soon as the provider yields it.
+    With a failed list, queries that still fail after retries are appended to it as
+    (query, SearchError) and skipped instead of stopping the pipeline.
+    on_done(query) is called from the worker thread once a query has no more results.
+    provider: search_provider.SearchProvider to use instead of the process-wide one.
+    """
+    def search(query):
+        with provider or get_provider() as ddgs:
+            try:
+                for r in iter_cached_text(ddgs, query, max_results=max_results, backend=backend):
+                    yield query, r
+            except SearchError as e:
+                if failed is None:
+                    raise
+                failed.append((query, e))
+        if on_done is not None:
+            on_done(query)
+    return search
+
+
+def clean_result(item):
+    """
+    (query, result) -> hit with a cleaned title and snippet; ads and URL-less results are dropped.
+    """
+    query, r = item
+    url = r.get("href", "")
+    if not url or is_blocked(url):
+        return
+
+    yield {
+        "query": query,
+        "url": url,
+        "title": clean_linkedin_title(soft_truncate_ellipsis(r.get("title", ""))),
+        "snippet": soft_truncate_ellipsis(r.get("body", "")),
+    }
+
+
+def score_hit(hit):
+    """
+    First-pass score for a hit; hits whose title does not start with a person's name are dropped.
+    """
+    name = extract_name(hit["title"])
+    if not is_valid_person_name(name):
+        return
+
+    combined = f"{hit['title']} {hit['snippet']}"
+    score, conf, breakdown, enriched_company = score_text(combined, hit["query"], hit["url"])
+    yield dict(hit, name=name, score=score, conf=conf, breakdown=breakdown, company=enriched_company)
+
+
+def dedupe_stage(lead_index):
+    """
+    Merges scored hits into lead_index: new leads are added, repeats are merged into
+    the lead they repeat. Yields (position in lead_index.records, is_new) for every
+    lead that changed. Keeps state, so it must run on a single worker.
+    """
+    def dedupe(hit):
+        url, snippet = hit["url"], hit["snippet"]
+
+        # If text is very similar, it's a dupe
+        if lead_index.is_duplicate(url, hit["title"], snippet):
+            return
+
+        existing_idx = lead_index.find(url)
+        if existing_idx is not None:
+            existing = lead_index.records[existing_idx]
+            existing["Snippet"] += "\n---\n" + snippet
+            existing["Score"] = max(existing["Score"], hit["score"])
+            existing["Signals"] = merge(existing["Signals"], hit["breakdown"])
+
+            if hit["conf"] == "High":
+                existing["Confidence"] = "High"
+            elif hit["conf"] == "Medium" and existing["Confidence"] == "Low":
+                existing["Confidence"] = "Medium"
+
+            yield existing_idx, False
+
+        else:
+            lead_index.add({
+                "Name": hit["name"],
+                "Title": hit["title"],
+                "Snippet": snippet,
+                "URL": url,
+                "Score": hit["score"],
+                "Confidence": hit["conf"],
+                "Signals": hit["breakdown"],
+                "Enriched Company": hit["company"]
+            })
+            yield len(lead_index.records) - 1, True
+    return dedupe
+
+
+def anchor_stage(candidate):
+    """
+    candidate -> (candidate, second-pass queries built from its snippet anchors).
+    """
+    yield candidate, build_queries(candidate)
+
+
+def verify_stage(**verify_options):
+    """
+    (candidate, queries) -> (candidate, evidence rows). verify_options go to verifier.verify_candidate.
+    rows is None when a search failed for good; such a candidate gets no evidence at
+    all, so it stays unverified (and is retried next run) instead of being judged on part of it.
+    """
+    def verify(item):
+        candidate, queries = item
+        try:
+            yield verify_candidate(candidate, queries=queries, **verify_options)
+        except SearchError:
+            yield candidate, None
+    return verify
+
+
+def discovery_pipeline(lead_index, max_results, backend="lite", search_workers=1, failed=None, on_query_done=None,
+                       provider=None):
+    """
+    search -> cleanup -> first-pass scoring -> dedup. run(queries) yields what dedupe_stage yields.
+    Scoring is pure Python, so more workers there would only contend for the GIL.
+    failed, on_query_done, provider: see search_stage (failed, on_done, provider).
+    """
+    return Pipeline(
+        Stage("search", search_stage(max_results, backend, failed, on_query_done, provider), workers=search_workers),
+        Stage("cleanup", clean_result),
+        Stage("score", score_hit),
+        Stage("dedup", dedupe_stage(lead_index)),
+    )
+
+
+def verification_pipeline(max_concurrency=8, **verify_options):
+    """
+    anchors -> verification. run(candidates) yields (candidate, rows) as each candidate
+    finishes, with up to max_concurrency candidates being verified at once; a slow
+    candidate does not hold back the ones done after it. Rows carry the candidate's
+    name, and consolidation groups by it, so the order does not change any verdict.
+    Workers are threads rather than asyncio tasks because the ddgs client blocks; the
+    query rate is bounded by the provider's shared token bucket (pacing.SEARCH_PACER).
+    """
+    return Pipeline(
+        Stage("anchors", anchor_stage),
+        Stage("verify", verify_stage(**verify_options), workers=max_concurrency, ordered=False),
+    )
+
+
+# --- CONSOLIDATION ---
+# Works on the whole table (verdicts depend on every evidence row of a name), so it
+# runs once at the end instead of as a streaming stage
+
+def model_scorer(loaded_model):
+    """
+    ml_score callable for consolidate() from a model_registry.LoadedModel, or None.
+    """
+    if not loaded_model or not loaded_model.feature_columns:
+        return None
+
+    from ml import predict_scores
+
+    def ml_score(first_pass_signals, second_pass_signals):
+        return predict_scores(
+            loaded_model.model, first_pass_signals, second_pass_signals,
+            loaded_model.feature_columns, loaded_model.vectorizer
+        )
+    return ml_score
+
+
+def consolidate_workspace(store, workspace, ml_score=None):
+    """
+    Consolidates everything the workspace holds and stores the verdicts.
+    """
+    # Read first: writes that land while consolidating leave the verdicts stale
+    revision = store.revision(workspace)
+    df_consolidated = consolidate(
+        pd.DataFrame(store.leads(workspace)), pd.DataFrame(store.evidence(workspace)), ml_score
+    )
+    store.put_verdicts(workspace, df_consolidated.to_dict("records"), revision=revision)
+    return df_consolidated
+
+
+# --- JOBS ---
+# Run by jobs.JobRunner outside the Streamlit script; results go straight to the lead store
+
+def run_discovery(job, store, workspace, queries, max_results_per_query=10, search_workers=1):
+    """
+    First pass over every query. Each lead is saved as soon as it is found or
+    merged into, so the UI shows it while the rest of the SERP is still loading.
+    """
+    # Indexed once per run; lookups no longer rescan every stored lead
+    lead_index = LeadIndex(store.leads(workspace), canonical_url)
+    failed = []
+    done = [0]
+    done_lock = threading.Lock()
+
+    def query_done(query):
+        # Search workers finish queries concurrently; the count only moves forward
+        with done_lock:
+            done[0] += 1
+            job.progress(done[0], len(queries))
+
+    pipeline = discovery_pipeline(lead_index, max_results_per_query, search_workers=search_workers,
+                                  failed=failed, on_query_done=query_done)
+    added = 0
+
+    job.progress(0, len(queries), f"Running {len(queries)} queries...")
+
+    for position, is_new in pipeline.run(queries):
+        lead = lead_index.records[position]
+        store.save_leads(workspace, [lead])
+
+        if is_new:
+            added += 1
+            job.progress(message=f"Found: **{lead['Name']}** ({added} new leads)")
+
+    # One bad query should not cost the others' leads, but a backend that answered none is an error
+    if queries and len(failed) == len(queries):
+        raise failed[-1][1]
+
+    job.progress(len(queries), len(queries), f"{len(queries)} queries: {added} new leads")
+    return {
+        "queries": len(queries),
+        "new_leads": added,
+        "failed_queries": [q for q, _ in failed],
+        "stages": pipeline.stats_table(),
+    }
+
+
+def verification_candidates(df_first, processed_names, threshold=SECOND_PASS_THRESHOLD):
+    """
+    Splits leads above threshold that have no evidence yet into (to_verify, skipped_rows).
+    Incomplete or repeated names are not searched; they get a SKIPPED_NAME evidence row.
+    """
+    candidates = df_first[df_first["Score"] >= threshold]
+
+    to_verify = []
+    skipped = []
+    for _, row in candidates.iterrows():
+        name = row["Name"]
+        if name in processed_names: continue
+
+        # Skip incomplete or duplicate names
+        name_parts = name.strip().split()
+        last_name = name_parts[-1] if len(name_parts) > 1 else ""
+        first_name = name_parts[0] if len(name_parts) > 0 else ""
+
+        # Single-letter last name
+        # First name == last name (repeated name)
+        if len(name_parts) < 2 or len(last_name) == 1 or first_name.lower() == last_name.lower():
+            # Directly add to consolidation (first-pass only)
+            skipped.append({
+                "Name": name,
+                "Query Used": "",
+                "Title": row.get("Title",""),
+                "Snippet": row.get("Snippet",""),
+                "Second Pass Score": 0.0,
+                "Score Breakdown": [Signal(Code.SKIPPED_NAME)],
+                "Source URL": row.get("URL","")
+            })
+            continue
+
+        to_verify.append(row.to_dict())
+
+    return to_verify, skipped
+
+
+def run_verification(job, store, workspace, threshold=SECOND_PASS_THRESHOLD, **verify_options):
+    """
+    Second pass for every lead above threshold that has no evidence yet.
+    Each candidate's evidence is stored as soon as that candidate is done.
+    verify_options (max_concurrency, max_queries, ...) go to verification_pipeline.
+    """
+    df_first = pd.DataFrame(store.leads(workspace))
+    if df_first.empty:
+        return {"verified": 0}
+
+    to_verify, skipped = verification_candidates(df_first, store.verified_names(workspace), threshold)
+    store.add_evidence(workspace, skipped)
+    job.progress(0, len(to_verify), "Verifying...")
+
+    # Candidates are verified concurrently; the provider's shared pacer
+    # keeps the overall query rate at what the backend tolerates
+    pipeline = verification_pipeline(max_results=20, backend="html", skip_url=is_blocked, **verify_options)
+    failed = []
+    for done, (person, rows) in enumerate(pipeline.run(to_verify), 1):
+        if rows is None:
+            failed.append(person["Name"])
+            job.progress(done, len(to_verify), f"Search failed for **{person['Name']}**; left for the next run")
+            continue
+
+        store.add_evidence(workspace, rows)
+        job.progress(done, len(to_verify), f"Verified: **{person['Name']}** ({done}/{len(to_verify)})")
+
+    return {
+        "verified": len(to_verify) - len(failed),
+        "skipped": len(skipped),
+        "failed": failed,
+        "stages": pipeline.stats_table(),
+    }
+
+
+def run_consolidation(job, store, workspace):
+    """
+    Recomputes the workspace's verdicts, with ML scores when a model is available.
+    The model is loaded here, in the job thread, not by the page that asked for it.
+    """
+    job.progress(0, 1, "Consolidating...")
+    df_consolidated = consolidate_workspace(store, workspace, model_scorer(get_registry().get()))
+    job.progress(1, 1, f"{len(df_consolidated)} verdicts")
+    return {"verdicts": len(df_consolidated)}
@@ -0,0 +1,179 @@
+import random
+import threading
+import time
+
+KINDS = ("ratelimit", "timeout", "parse", "error")
+
+# Worth another attempt; a response we could not parse will not parse next time either
+RETRYABLE = ("ratelimit", "timeout", "error")
+
+
+class SearchError(Exception):
+    """
+    A search that still failed after retries. kind is one of KINDS.
+    """
+
+    def __init__(self, kind, cause):
+        super().__init__(f"{kind}: {cause}")
+        self.kind = kind
+        self.cause = cause
+
+
+def classify(exc):
+    """
+    "empty" for DDGS's "No results found." (not a failure), else one of KINDS.
+    """
+    from ddgs.exceptions import DDGSException, RatelimitException, TimeoutException
+
+    if isinstance(exc, SearchError):
+        return exc.kind
+    if isinstance(exc, RatelimitException):
+        return "ratelimit"
+    if isinstance(exc, (TimeoutException, TimeoutError)):
+        return "timeout"
+    if isinstance(exc, DDGSException) and "no results found" in str(exc).lower():
+        return "empty"
+    if isinstance(exc, (ValueError, KeyError, IndexError, AttributeError, TypeError)):
+        return "parse"
+    return "error"
+
+
+class SearchGuard:
+    """
+    Retries failed searches with jittered exponential backoff and trips a circuit
+    breaker after failure_threshold failures in a row. While the breaker is open
+    every caller waits (all workers pause) until cooldown has passed; then one
+    trial call goes through and either closes it or opens it again.
+    A "parse" failure is counted but, as for the pacer, says nothing about the
+    backend's health: it neither trips the breaker nor breaks a run of failures,
+    and a trial call that gets one closes the breaker, since the backend answered.
+    """
+
+    def __init__(self, retries=2, base_delay=1.0, max_delay=20.0, failure_threshold=5, cooldown=30.0):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_until = 0.0
+        self._cond = threading.Condition()
+
+        self.calls = 0
+        self.retried = 0
+        self.trips = 0
+        self.failures = dict.fromkeys(KINDS, 0)
+        self.gave_up = 0
+
+    def backoff(self, attempt):
+        # Full jitter: workers that failed together do not retry together
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _wait_until_closed(self):
+        with self._cond:
+            while True:
+                if self.state == "closed":
+                    return
+                now = time.monotonic()
+                if self.state == "open" and now >= self.opened_until:
+                    # This caller is the trial call
+                    self.state = "half_open"
+                    return
+                timeout = self.opened_until - now if self.state == "open" else 0.5
+                self._cond.wait(max(0.05, timeout))
+
+    def _close(self):
+        # Caller holds the condition
+        if self.state != "closed":
+            self.state = "closed"
+            self._cond.notify_all()
+
+    def _record_success(self):
+        with self._cond:
+            self.consecutive_failures = 0
+            self._close()
+
+    def _record_failure(self, kind):
+        with self._cond:
+            self.failures[kind] += 1
+            if kind == "parse":
+                if self.state == "half_open":
+                    self._close()
+                return
+            self.consecutive_failures += 1
+            if self.state == "half_open" or (
+                self.state == "closed" and self.consecutive_failures >= self.failure_threshold
+            ):
+                self.state = "open"
+                self.opened_until = time.monotonic() + self.cooldown
+                self.trips += 1
+                self._cond.notify_all()
+
+    def call(self, fn, *args, **kwargs):
+        """
+        fn(*args, **kwargs) with retries; raises SearchError once they are used up.
+        """
+        with self._cond:
+            self.calls += 1
+
+        for attempt in range(self.retries + 1):
+            self._wait_until_closed()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                kind = classify(e)
+                self._record_failure(kind)
+                if kind not in RETRYABLE or attempt == self.retries:
+                    with self._cond:
+                        self.gave_up += 1
+                    raise SearchError(kind, e) from e
+            else:
+                self._record_success()
+                return result
+
+            with self._cond:
+                self.retried += 1
+            time.sleep(self.backoff(attempt))
+
+    def stats(self):
+        with self._cond:
+            return {
+                "state": self.state,
+                "calls": self.calls,
+                "retries": self.retried,
+                "gave_up": self.gave_up,
+                "trips": self.trips,
+                **self.failures,
+            }
+
+
+# One guard per backend and process: when a backend fails, every worker using it
+# pauses together, while the others stay available for failover
+_guards = {}
+_guards_lock = threading.Lock()
+
+
+def get_guard(backend):
+    with _guards_lock:
+        if backend not in _guards:
+            _guards[backend] = SearchGuard()
+        return _guards[backend]
+
+
+def guard_stats():
+    """
+    Counters summed over backends; "open" lists the backends whose breaker is not closed.
+    """
+    with _guards_lock:
+        guards = dict(_guards)
+
+    totals = {"open": [], "calls": 0, "retries": 0, "gave_up": 0, "trips": 0, **dict.fromkeys(KINDS, 0)}
+    for backend, guard in guards.items():
+        stats = guard.stats()
+        if stats.pop("state") != "closed":
+            totals["open"].append(backend)
+        for key, value in stats.items():
+            totals[key] += value
+    return totals
@@ -0,0 +1,142 @@
+"""
+Discovery -> verification -> consolidation without Streamlit, for cron jobs and workers.
+
+    python run_pipeline.py queries.txt -o leads.jsonl
+    python run_pipeline.py queries.txt -o leads.csv --concurrency 16 --rate 2 --ml
+    python run_pipeline.py queries.txt -o leads.parquet --store lead_store.sqlite3
+
+queries.txt holds one search query per line; blank lines and lines starting with # are skipped.
+With --store, leads and evidence are kept in that lead store, so a rerun only
+verifies names it has not seen before. Progress goes to stderr.
+"""
+import argparse
+import os
+import sys
+import time
+
+from lead_store import LeadStore
+from pipeline import SECOND_PASS_THRESHOLD, consolidate_workspace, model_scorer, run_discovery, run_verification
+from pacing import SEARCH_PACER
+from resilience import guard_stats
+from search_provider import HedgedProvider, get_provider
+
+FORMATS = ("jsonl", "csv", "parquet")
+
+
+class ConsoleProgress:
+    """
+    Stands in for jobs.Job: prints progress to stderr instead of persisting it.
+    """
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.start = time.perf_counter()
+
+    def progress(self, done=None, total=None, message=None):
+        if message is None:
+            return
+        elapsed = time.perf_counter() - self.start
+        print(f"[{self.stage} {elapsed:6.1f}s] {message.replace('**', '')}", file=sys.stderr, flush=True)
+
+
+def read_queries(path):
+    with open(path, encoding="utf-8") as f:
+        return [q.strip() for q in f if q.strip() and not q.lstrip().startswith("#")]
+
+
+def ml_scorer(model_path):
+    """
+    ml_score callable for consolidate(), or None if there is no usable model.
+    The compact export loads without sklearn / xgboost.
+    """
+    from model_registry import ModelRegistry
+    from compact_model import COMPACT_SCHEMA_PATH
+
+    folder = os.path.dirname(model_path)
+    registry = ModelRegistry(model_path, os.path.join(folder, COMPACT_SCHEMA_PATH))
+    loaded = registry.get()
+    if loaded is None:
+        print(f"No model at {model_path}: {registry.error or 'file not found'}", file=sys.stderr)
+        return None
+    return model_scorer(loaded)
+
+
+def print_summary(label, summary):
+    # Per-stage counters from engine.Pipeline.stats_table() go on their own lines
+    stages = summary.pop("stages", [])
+    print(f"{label}: {summary}", file=sys.stderr)
+    for s in stages:
+        print(
+            f"  {s['stage']:<8} x{s['workers']:<2} in {s['in']:>5}  out {s['out']:>5}  "
+            f"busy {s['busy_s']:7.2f}s  wall {s['wall_s']:7.2f}s  {s['out_per_s']:7.1f}/s",
+            file=sys.stderr
+        )
+
+
+def write_output(df, path, fmt=None):
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt == "jsonl":
+        df.to_json(path, orient="records", lines=True, force_ascii=False)
+    elif fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        df.to_parquet(path, index=False)  # needs pyarrow or fastparquet
+    else:
+        raise SystemExit(f"Unknown output format {fmt!r}; use one of {', '.join(FORMATS)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("queries", help="file with one search query per line")
+    parser.add_argument("-o", "--output", required=True, help="consolidated table (.jsonl, .csv or .parquet)")
+    parser.add_argument("--format", choices=FORMATS, help="output format when the extension does not say")
+    parser.add_argument("--max-results", type=int, default=10, help="results per discovery query")
+    parser.add_argument("--search-workers", type=int, default=1, help="discovery queries searched at once")
+    parser.add_argument("--concurrency", type=int, default=8, help="candidates verified at once")
+    parser.add_argument("--rate", type=float, help="most search queries per second the pacer may reach")
+    parser.add_argument("--threshold", type=float, default=SECOND_PASS_THRESHOLD, help="first-pass score to verify")
+    parser.add_argument("--store", default=":memory:", help="lead store to read and extend (default: in memory)")
+    parser.add_argument("--workspace", default="batch", help="lead store workspace")
+    parser.add_argument("--skip-verification", action="store_true", help="first pass only")
+    parser.add_argument("--ml", nargs="?", const="model.pkl", help="add ML scores from this model (default model.pkl)")
+    args = parser.parse_args()
+
+    queries = read_queries(args.queries)
+    if not queries:
+        raise SystemExit(f"No queries in {args.queries}")
+
+    store = LeadStore(args.store)
+
+    if args.rate:
+        SEARCH_PACER.max_rate = args.rate
+        SEARCH_PACER.min_rate = min(SEARCH_PACER.min_rate, args.rate)
+        SEARCH_PACER.rate = min(SEARCH_PACER.rate, args.rate)
+
+    summary = run_discovery(
+        ConsoleProgress("discovery"), store, args.workspace, queries, args.max_results, args.search_workers
+    )
+    print_summary("Discovery", summary)
+
+    if not args.skip_verification:
+        summary = run_verification(
+            ConsoleProgress("verification"), store, args.workspace, args.threshold,
+            max_concurrency=args.concurrency
+        )
+        print_summary("Verification", summary)
+
+    if not store.count_leads(args.workspace):
+        raise SystemExit("No leads found")
+
+    ml_score = ml_scorer(args.ml) if args.ml else None
+    df_consolidated = consolidate_workspace(store, args.workspace, ml_score)
+
+    write_output(df_consolidated, args.output, args.format)
+    print(f"Wrote {len(df_consolidated)} rows to {args.output}", file=sys.stderr)
+    print(f"Search pacing: {SEARCH_PACER.stats()}", file=sys.stderr)
+    print(f"Search retries: {guard_stats()}", file=sys.stderr)
+    if isinstance(get_provider(), HedgedProvider):
+        print(f"Search hedging: {get_provider().stats()}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import json
+import sqlite3
+import threading
+import time
+
+from search_provider import get_provider
+
+CACHE_PATH = "search_cache.sqlite3"
+DEFAULT_TTL = 24 * 3600               # seconds a SERP stays fresh
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # evict least recently used rows above this
+
+
+class SearchCache:
+    """
+    SQLite-backed cache of search results keyed by (query, backend, max_results).
+    Shared by every Streamlit session in the process and across restarts.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                query TEXT NOT NULL,
+                backend TEXT NOT NULL,
+                max_results INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL,
+                PRIMARY KEY (query, backend, max_results)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_accessed ON results (accessed)")
+        self._conn.commit()
+
+    def get(self, query, backend, max_results):
+        """
+        Returns the cached result list, or None on a miss / expired entry.
+        """
+        now = time.time()
+        key = (query, backend, max_results)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created FROM results WHERE query = ? AND backend = ? AND max_results = ?",
+                key
+            ).fetchone()
+
+            if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE results SET accessed = ? WHERE query = ? AND backend = ? AND max_results = ?",
+                (now,) + key
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def put(self, query, backend, max_results, results):
+        payload = json.dumps(results)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (query, backend, max_results, payload, len(payload), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # Expired rows first, then least recently used until under the size cap
+        if self.ttl is not None:
+            cur = self._conn.execute("DELETE FROM results WHERE created < ?", (time.time() - self.ttl,))
+            self.evictions += cur.rowcount
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for rowid, size in self._conn.execute("SELECT rowid, size FROM results ORDER BY accessed").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM results WHERE rowid = ?", (rowid,))
+            total -= size
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_cache():
+    """
+    Process-wide cache instance, created on first use.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SearchCache()
+    return _default_cache
+
+
+def cached_text(provider, query, max_results=10, backend="auto", cache=None):
+    """
+    Drop-in for list(provider.text(...)) that serves repeated queries from the cache.
+    Providers that opt out of caching (record / replay) are always called.
+    """
+    if not getattr(provider, "cacheable", True):
+        return list(provider.text(query, max_results=max_results, backend=backend))
+
+    cache = cache or get_cache()
+
+    results = cache.get(query, backend, max_results)
+    if results is None:
+        results = list(provider.text(query, max_results=max_results, backend=backend))
+        cache.put(query, backend, max_results, results)
+
+    return results
+
+
+def iter_cached_text(provider, query, max_results=10, backend="auto", cache=None):
+    """
+    Streaming cached_text: yields results as the provider produces them and
+    caches the full list once the stream has been read to the end. A search that
+    raises, or a stream the caller stops reading, is not cached.
+    """
+    if not getattr(provider, "cacheable", True):
+        yield from provider.iter_text(query, max_results=max_results, backend=backend)
+        return
+
+    cache = cache or get_cache()
+
+    results = cache.get(query, backend, max_results)
+    if results is not None:
+        yield from results
+        return
+
+    results = []
+    for r in provider.iter_text(query, max_results=max_results, backend=backend):
+        results.append(r)
+        yield r
+    cache.put(query, backend, max_results, results)
+
+
+def search_text(query, max_results=10, backend="auto", cache=None, provider=None):
+    """
+    cached_text against the process-wide provider. Safe to call from worker threads.
+    """
+    return cached_text(provider or get_provider(), query, max_results, backend, cache)
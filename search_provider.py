@@ -0,0 +1,355 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from pacing import SEARCH_PACER
+from resilience import classify, get_guard
+
+SEARCH_LOG = "search_log.jsonl"
+
+class SearchProvider:
+    """
+    Anything that answers text(query, max_results, backend) with a list of
+    {"title", "href", "body"} dicts, like DDGS.text; other keyword arguments
+    are DDGS.text options (region, page, ...) that a provider may ignore.
+    Providers are context managers so they can replace `with DDGS(...) as ddgs:`.
+    """
+
+    # Whether results may be served from / written to the search cache
+    cacheable = True
+
+    def text(self, query, max_results=10, backend="auto", **kwargs):
+        raise NotImplementedError
+
+    def iter_text(self, query, max_results=10, backend="auto"):
+        """
+        Results one at a time as they become available, from a single text() call,
+        so the answer is the same one text() gives (and cached_text caches).
+        """
+        yield from self.text(query, max_results=max_results, backend=backend)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class DDGSProvider(SearchProvider):
+    """
+    Live DuckDuckGo search. Inside a `with` block the calling thread reuses one
+    session; outside of it every call opens its own, so worker threads stay independent.
+    Every attempt waits for the pacer and reports back how the backend answered;
+    the backend's guard (resilience.get_guard unless one is given) retries failed
+    attempts and raises SearchError when it gives up.
+    """
+
+    def __init__(self, timeout=10, pacer=SEARCH_PACER, guard=None):
+        self.timeout = timeout
+        self.pacer = pacer
+        self.guard = guard
+        self._local = threading.local()
+
+    def _open(self):
+        from ddgs import DDGS
+        return DDGS(timeout=self.timeout)
+
+    def __enter__(self):
+        self._local.session = self._open().__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        session, self._local.session = self._local.session, None
+        return session.__exit__(*exc)
+
+    def text(self, query, max_results=10, backend="auto", **kwargs):
+        guard = self.guard or get_guard(backend)
+        return guard.call(self._paced_text, query, max_results=max_results, backend=backend, **kwargs)
+
+    def _paced_text(self, query, **kwargs):
+        self.pacer.acquire()
+        try:
+            results = self._text(query, **kwargs)
+        except Exception as e:
+            kind = classify(e)
+            if kind == "empty":
+                # DDGS raises when a query has no results; the backend answered fine
+                self.pacer.success()
+                return []
+            # An unparsable page says nothing about load
+            if kind != "parse":
+                self.pacer.failure(kind)
+            raise
+
+        self.pacer.success()
+        return results
+
+    def _text(self, query, **kwargs):
+        session = getattr(self._local, "session", None)
+        if session is not None:
+            return list(session.text(query, **kwargs))
+
+        with self._open() as ddgs:
+            return list(ddgs.text(query, **kwargs))
+
+
+def normalize_results(results):
+    """
+    {"title", "href", "body"} string dicts whatever the backend called them;
+    results without a link and repeated links are dropped.
+    """
+    out = []
+    seen = set()
+    for r in results:
+        href = str(r.get("href") or r.get("url") or r.get("link") or "").strip()
+        if not href or href in seen:
+            continue
+        seen.add(href)
+        out.append({
+            "title": str(r.get("title") or "").strip(),
+            "href": href,
+            "body": str(r.get("body") or r.get("snippet") or r.get("description") or "").strip(),
+        })
+    return out
+
+
+class HedgedProvider(SearchProvider):
+    """
+    Sends each query to the requested backend (the first of `backends` when the
+    request names one outside them) and, if it has not answered within
+    that backend's p90 latency (default_delay until min_samples calls are known),
+    a second copy to the next backend in `backends`; the first good answer wins.
+    Only the slowest ~10% of calls are hedged, so the extra load stays small.
+    A backend whose circuit breaker is open is skipped, and a backend that fails
+    before the hedge delay is replaced by the next one right away (failover).
+    Results are normalised, so callers cannot tell which backend answered.
+    """
+
+    def __init__(self, provider, backends, percentile=0.9, min_samples=10,
+                 default_delay=2.0, window=200, max_workers=32):
+        self.provider = provider
+        self.backends = tuple(backends)
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+
+        self._latency = defaultdict(lambda: deque(maxlen=window))  # backend -> seconds of recent successes
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search")
+
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+    @property
+    def cacheable(self):
+        return self.provider.cacheable
+
+    def hedge_delay(self, backend):
+        with self._lock:
+            samples = sorted(self._latency[backend])
+        if len(samples) < self.min_samples:
+            return self.default_delay
+        return samples[min(len(samples) - 1, int(self.percentile * len(samples)))]
+
+    def _route(self, backend):
+        # Requested backend first, then the others; backends with an open breaker go last.
+        # Callers ask for "lite"/"html", which DDGS serves from the same engines as "auto",
+        # so a request outside the hedged set starts on the first of them instead
+        first = backend if backend in self.backends else self.backends[0]
+        order = [first] + [b for b in self.backends if b != first]
+        healthy = [b for b in order if get_guard(b).state != "open"] or order
+        return first, healthy[0], healthy[1] if len(healthy) > 1 else None
+
+    def _timed(self, backend, query, max_results, kwargs):
+        start = time.perf_counter()
+        results = self.provider.text(query, max_results=max_results, backend=backend, **kwargs)
+        with self._lock:
+            self._latency[backend].append(time.perf_counter() - start)
+        return results
+
+    def text(self, query, max_results=10, backend="auto", **kwargs):
+        preferred, primary, alternate = self._route(backend)
+        with self._lock:
+            self.requests += 1
+            if primary != preferred:
+                self.failovers += 1
+
+        futures = {self._pool.submit(self._timed, primary, query, max_results, kwargs): primary}
+
+        if alternate is not None:
+            done, _ = wait(futures, timeout=self.hedge_delay(primary))
+            failed = bool(done) and next(iter(done)).exception() is not None
+            if not done or failed:
+                with self._lock:
+                    if failed:
+                        self.failovers += 1
+                    else:
+                        self.hedged += 1
+                futures[self._pool.submit(self._timed, alternate, query, max_results, kwargs)] = alternate
+
+        # The slower copy keeps running; its latency still feeds the percentile
+        error = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                if f.exception() is None:
+                    if futures[f] != primary:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return normalize_results(f.result())
+                error = error or f.exception()
+        raise error
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "failovers": self.failovers,
+            }
+        for backend in self.backends:
+            stats[f"hedge_after_{backend}"] = round(self.hedge_delay(backend), 2)
+        return stats
+
+
+class RecordingProvider(SearchProvider):
+    """
+    Passes every query through to another provider and appends the query,
+    results and wall time to a JSONL log that ReplayProvider can serve later.
+    """
+
+    # Cache hits would never reach the log
+    cacheable = False
+
+    def __init__(self, provider, path=SEARCH_LOG):
+        self.provider = provider
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.provider.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self.provider.__exit__(*exc)
+
+    def text(self, query, max_results=10, backend="auto", **kwargs):
+        start = time.perf_counter()
+        results = self.provider.text(query, max_results=max_results, backend=backend, **kwargs)
+        self._record(query, backend, max_results, time.perf_counter() - start, results)
+        return results
+
+    def iter_text(self, query, max_results=10, backend="auto"):
+        # Logged once the stream is complete, as one entry like text() writes
+        start = time.perf_counter()
+        results = []
+        for r in self.provider.iter_text(query, max_results=max_results, backend=backend):
+            results.append(r)
+            yield r
+        self._record(query, backend, max_results, time.perf_counter() - start, results)
+
+    def _record(self, query, backend, max_results, elapsed, results):
+        line = json.dumps({
+            "query": query,
+            "backend": backend,
+            "max_results": max_results,
+            "elapsed": round(elapsed, 4),
+            "results": results,
+        })
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class ReplayProvider(SearchProvider):
+    """
+    Serves results from a RecordingProvider log without touching the network.
+    latency=None sleeps for the recorded time, a number sleeps that many seconds,
+    0 replays as fast as possible. Unrecorded queries return no results.
+    Recordings are keyed by (query, backend, max_results) only; other DDGS options
+    are accepted and ignored.
+    """
+
+    # Replays must pay the simulated latency every time
+    cacheable = False
+
+    def __init__(self, path=SEARCH_LOG, latency=None):
+        self.latency = latency
+        self.records = {}
+        self.misses = 0
+
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                rec = json.loads(line)
+                # Last recording of a query wins
+                self.records[(rec["query"], rec["backend"], rec["max_results"])] = rec
+
+    def text(self, query, max_results=10, backend="auto", **kwargs):
+        rec = self.records.get((query, backend, max_results))
+        if rec is None:
+            self.misses += 1
+            return []
+
+        delay = rec.get("elapsed", 0.0) if self.latency is None else self.latency
+        if delay:
+            time.sleep(delay)
+
+        return [dict(r) for r in rec["results"]]
+
+
+_default_provider = None
+_default_lock = threading.Lock()
+
+
+def provider_from_env():
+    """
+    SEARCH_PROVIDER=ddgs (default) | record | replay
+    SEARCH_LOG=path of the JSONL log, SEARCH_REPLAY_LATENCY=seconds per query.
+    SEARCH_BACKENDS=comma-separated DDGS engines to hedge / fail over across,
+    e.g. duckduckgo,brave,mojeek. They must be distinct engines: "lite", "html"
+    and "auto" all map to the same ones. Unset or a single backend: no hedging.
+    """
+    mode = os.environ.get("SEARCH_PROVIDER", "ddgs").lower()
+    path = os.environ.get("SEARCH_LOG", SEARCH_LOG)
+    backends = [b.strip() for b in os.environ.get("SEARCH_BACKENDS", "").split(",") if b.strip()]
+
+    def live():
+        if len(backends) < 2:
+            return DDGSProvider()
+        return HedgedProvider(DDGSProvider(), backends)
+
+    if mode == "record":
+        return RecordingProvider(live(), path)
+    if mode == "replay":
+        latency = os.environ.get("SEARCH_REPLAY_LATENCY")
+        return ReplayProvider(path, latency=float(latency) if latency else None)
+    if mode == "ddgs":
+        return live()
+
+    raise ValueError(f"Unknown SEARCH_PROVIDER: {mode}")
+
+
+def get_provider():
+    """
+    Process-wide provider, chosen from the environment on first use.
+    """
+    global _default_provider
+    with _default_lock:
+        if _default_provider is None:
+            _default_provider = provider_from_env()
+    return _default_provider
+
+
+def set_provider(provider):
+    global _default_provider
+    with _default_lock:
+        _default_provider = provider
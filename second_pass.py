@@ -1,11 +1,6 @@
 import re
-from first_pass import (
-    identity_keywords, 
-    behavior_keywords, 
-    uae_keywords, 
-    mena_keywords,
-    seniority_keywords
-)
+from first_pass import KEYWORD_MATCHER
+from signals import Code, Signal
 
 # --- CONFIGURATION ---
 
@@ -39,17 +34,15 @@ def extract_anchors(text):
     Extracts keywords from the First Pass snippet to build targeted queries.
     """
     anchors = {"identity": [], "behavior": [], "company": []}
-    t = text.lower()
+    hits = KEYWORD_MATCHER.match(text.lower())
 
     # 1. Identity Anchors (e.g. Angel Investor)
-    for kw in identity_keywords:
-        if kw in t and kw not in QUERY_BLOCKLIST:
+    for kw in hits["identity"]:
+        if kw not in QUERY_BLOCKLIST:
             anchors["identity"].append(kw)
 
     # 2. Behavior Anchors (e.g. "invested in")
-    for kw in behavior_keywords:
-        if kw in t:
-            anchors["behavior"].append(kw)
+    anchors["behavior"].extend(hits["behavior"])
 
     # 3. Company Anchors (Regex extraction)
     # Looks for "at [Company]" or "CEO of [Company]"
@@ -104,6 +97,19 @@ def build_second_pass_queries(name, anchors, enriched_company=""):
     return list(dict.fromkeys(final_queries))[:2]
 
 
+def new_state(name):
+    """
+    Fresh per-candidate verification state; never share one between candidates.
+    """
+    return {
+        "identity_confirmed": False,
+        "geo_hits": 0,
+        "linkedin_hits": 0,
+        "domain_hits": set(),
+        "expected_name": name.lower()
+    }
+
+
 def score_second_pass(text, url, state):
     """
     Scores verification results using the new 1-10 Scale.
@@ -112,7 +118,7 @@ def score_second_pass(text, url, state):
 
     # Block Google's "Missing:" and "Show results with:" artifacts
     if "missing:" in t or "show results with:" in t:
-        return 0, ["Search artifact ignored"], False
+        return 0, [Signal(Code.SEARCH_ARTIFACT)], False
     
     # --- NAME INTEGRITY FILTER ---
     if state.get("expected_name"):
@@ -129,12 +135,12 @@ def score_second_pass(text, url, state):
 
             # Require full name OR both first AND last
             if not full_present and not (first_present and last_present):
-                return 0, ["Name integrity fail – person not mentioned in snippet"], False
+                return 0, [Signal(Code.NAME_MISSING)], False
 
         else:
             # single-name fallback (rare edge case)
             if expected not in t:
-                return 0, ["Name integrity fail – name not mentioned"], False
+                return 0, [Signal(Code.SINGLE_NAME_MISSING)], False
 
     score = 0
     breakdown = []
@@ -142,26 +148,25 @@ def score_second_pass(text, url, state):
     # --- BLOCKING LOGIC ---
     
     if any(d in url for d in NOISE_DOMAINS):
-        return 0, ["Noise domain"], False
+        return 0, [Signal(Code.NOISE_DOMAIN)], False
     
     if "linkedin.com/pub/dir" in url:
-        return 0, ["LinkedIn directory page ignored"], False
+        return 0, [Signal(Code.LINKEDIN_DIRECTORY)], False
+
+    # One pass over the snippet for every keyword bucket
+    hits = KEYWORD_MATCHER.match(t)
 
     if "linkedin.com/in" in url:
         # Check if this LinkedIn profile adds NEW info compared to first pass
-        new_info = False
         # We check if any significant keywords exist here that we are looking for
-        for k in identity_keywords + behavior_keywords + seniority_keywords + uae_keywords + mena_keywords:
-            if k in t:
-                new_info = True
-                break
+        new_info = any(hits[b] for b in ("identity", "behavior", "seniority", "geo"))
         
         if not new_info:
-            return 0, ["LinkedIn adds no new information"], False
+            return 0, [Signal(Code.LINKEDIN_NO_NEW_INFO)], False
         
     if "linkedin.com" in url:
         if state["linkedin_hits"] >= 4:
-            return 0, ["LinkedIn limit reached"], False
+            return 0, [Signal(Code.LINKEDIN_LIMIT)], False
         state["linkedin_hits"] += 1
 
     if "tracxn.com/d/people/" in url:
@@ -170,7 +175,7 @@ def score_second_pass(text, url, state):
 
         if state.get("expected_name"):
             if state["expected_name"].lower() not in name_slug.lower():
-                return 0, ["Tracxn non-matching person ignored"], False
+                return 0, [Signal(Code.TRACXN_MISMATCH)], False
 
     # --- SCORING LOGIC (1-10 Scale) ---
 
@@ -178,33 +183,33 @@ def score_second_pass(text, url, state):
     for d in BONUS_DOMAINS:
         if d in url and d not in state["domain_hits"]:
             score += 1.0
-            breakdown.append(f"External confirmation via {d} (+1.0)")
-            breakdown.append("Public contact information likely available")
+            breakdown.append(Signal(Code.EXTERNAL_CONFIRMATION, -1, 1.0, d))
+            breakdown.append(Signal(Code.CONTACT_INFO))
             state["domain_hits"].add(d)
 
     # 1. Identity Confirmation (+4.0) - BIG BOOST
     # If we find "Angel Investor" in a second source, that's nearly a pass.
-    if any(k in t for k in identity_keywords):
+    if hits["identity"]:
         if not state["identity_confirmed"]:
             score += 4.0
-            breakdown.append("Confirmed investor identity (+4.0)")
+            breakdown.append(Signal(Code.INVESTOR_IDENTITY, -1, 4.0))
             state["identity_confirmed"] = True
 
     # 2. Behavior Signals (+3.0) - BIG BOOST
-    if any(k in t for k in behavior_keywords):
+    if hits["behavior"]:
         score += 3.0
-        breakdown.append("Investment behavior language (+3.0)")
+        breakdown.append(Signal(Code.BEHAVIOR_LANGUAGE, -1, 3.0))
 
-    if any(k in t for k in seniority_keywords):
+    if hits["seniority"]:
         score += 1.0
-        breakdown.append("Seniority language (+1.0)")
+        breakdown.append(Signal(Code.SENIORITY_LANGUAGE, -1, 1.0))
 
     # 3. Geography Verification (+3.0) - BIG BOOST
-    if any(k in t for k in uae_keywords + mena_keywords):
+    if hits["geo"]:
         if state["geo_hits"] < 2:
             # We allow up to 2 hits for geo to accumulate confidence
             score += 1.5 
-            breakdown.append("Supporting geography signal (+1.5)")
+            breakdown.append(Signal(Code.GEO_SUPPORT, -1, 1.5))
             state["geo_hits"] += 1
 
     # Cap score at 10.0
@@ -0,0 +1,189 @@
+from enum import IntEnum
+from functools import lru_cache
+from typing import NamedTuple
+
+
+class Code(IntEnum):
+    # --- First pass ---
+    GROUPS_FIRED = 1
+    HASHTAG_IDENTITY = 2
+    HASHTAG_BEHAVIOR = 3
+    HASHTAG_SENIORITY = 4
+    HASHTAG_GEO = 5
+    MENA_LOCATION = 6
+    NON_MENA_LOCATION = 7
+    SUSPICIOUS_LOCATION = 8
+    PRIMARY_IDENTITY = 9
+    ADDITIONAL_IDENTITY = 10
+    BEHAVIOR_KEYWORD = 11
+    BEHAVIOR_SYNERGY = 12
+    SENIORITY_KEYWORD = 13
+    SENIORITY_BONUS = 14
+    COMPANY_AFFILIATION = 15
+    UAE_CITY = 16
+    GEO_SIGNALS = 17
+    UAE_DOMAIN = 18
+    NO_GEO_PENALTY = 19
+    OUTSIDE_REGION_DOMAIN = 20
+
+    # --- Second pass ---
+    SEARCH_ARTIFACT = 101
+    NAME_MISSING = 102
+    SINGLE_NAME_MISSING = 103
+    NOISE_DOMAIN = 104
+    LINKEDIN_DIRECTORY = 105
+    LINKEDIN_NO_NEW_INFO = 106
+    LINKEDIN_LIMIT = 107
+    TRACXN_MISMATCH = 108
+    EXTERNAL_CONFIRMATION = 109
+    CONTACT_INFO = 110
+    INVESTOR_IDENTITY = 111
+    BEHAVIOR_LANGUAGE = 112
+    SENIORITY_LANGUAGE = 113
+    GEO_SUPPORT = 114
+    SKIPPED_NAME = 115
+    SIMULATED = 116
+
+
+class Signal(NamedTuple):
+    code: int
+    keyword: int = -1    # id into KEYWORDS, -1 when the signal has no keyword
+    weight: float = 0.0
+    detail: object = ""  # free text (location, company, domain, tag) or group count
+
+
+# Keyword vocabulary shared by both passes; ids are assigned on first use
+KEYWORDS = []
+KEYWORD_IDS = {}
+
+
+def keyword_id(word):
+    idx = KEYWORD_IDS.get(word)
+    if idx is None:
+        idx = len(KEYWORDS)
+        KEYWORDS.append(word)
+        KEYWORD_IDS[word] = idx
+    return idx
+
+
+def keyword_text(signal):
+    return KEYWORDS[signal.keyword] if signal.keyword >= 0 else ""
+
+
+HASHTAG_LABELS = {
+    Code.HASHTAG_IDENTITY: "identity",
+    Code.HASHTAG_BEHAVIOR: "behavior",
+    Code.HASHTAG_SENIORITY: "seniority",
+    Code.HASHTAG_GEO: "geography",
+}
+
+TEMPLATES = {
+    Code.GROUPS_FIRED: "Signal groups fired: {d}",
+    Code.MENA_LOCATION: "Confirmed MENA Location: {d} ({w:+.1f})",
+    Code.NON_MENA_LOCATION: "Non-MENA Country ({d}) ({w:+.1f})",
+    Code.SUSPICIOUS_LOCATION: "Suspicious Location: {d} ({w:+.1f})",
+    Code.PRIMARY_IDENTITY: "Primary identity '{k}' (+{w})",
+    Code.ADDITIONAL_IDENTITY: "Additional identity '{k}' (+{w})",
+    Code.BEHAVIOR_KEYWORD: "Behavior keyword '{k}' (+{w})",
+    Code.BEHAVIOR_SYNERGY: "Identity + behavior synergy (+{w})",
+    Code.SENIORITY_KEYWORD: "Seniority keyword '{k}' (+{w})",
+    Code.SENIORITY_BONUS: "Seniority group bonus (+{w})",
+    Code.COMPANY_AFFILIATION: "Company affiliation: {d} (+{w})",
+    Code.UAE_CITY: "Explicit UAE city mentioned ({w:+.1f})",
+    Code.GEO_SIGNALS: "Geography signals (+{r})",
+    Code.UAE_DOMAIN: "UAE LinkedIn domain ({w:+.1f})",
+    Code.NO_GEO_PENALTY: "High score without geography confirmation ({w:+.1f})",
+    Code.OUTSIDE_REGION_DOMAIN: "Outside Region LinkedIn country domain ({w:+.1f})",
+
+    Code.SEARCH_ARTIFACT: "Search artifact ignored",
+    Code.NAME_MISSING: "Name integrity fail – person not mentioned in snippet",
+    Code.SINGLE_NAME_MISSING: "Name integrity fail – name not mentioned",
+    Code.NOISE_DOMAIN: "Noise domain",
+    Code.LINKEDIN_DIRECTORY: "LinkedIn directory page ignored",
+    Code.LINKEDIN_NO_NEW_INFO: "LinkedIn adds no new information",
+    Code.LINKEDIN_LIMIT: "LinkedIn limit reached",
+    Code.TRACXN_MISMATCH: "Tracxn non-matching person ignored",
+    Code.EXTERNAL_CONFIRMATION: "External confirmation via {d} (+{w})",
+    Code.CONTACT_INFO: "Public contact information likely available",
+    Code.INVESTOR_IDENTITY: "Confirmed investor identity (+{w})",
+    Code.BEHAVIOR_LANGUAGE: "Investment behavior language (+{w})",
+    Code.SENIORITY_LANGUAGE: "Seniority language (+{w})",
+    Code.GEO_SUPPORT: "Supporting geography signal (+{w})",
+    Code.SKIPPED_NAME: "Skipped second pass due to incomplete/common name",
+    Code.SIMULATED: "Simulated verification",
+}
+
+# Groups used by heuristics that used to grep the breakdown text
+IDENTITY_CODES = {Code.PRIMARY_IDENTITY, Code.ADDITIONAL_IDENTITY, Code.HASHTAG_IDENTITY}
+SENIORITY_CODES = {Code.SENIORITY_KEYWORD, Code.HASHTAG_SENIORITY}
+GEO_KEYWORD_CODES = {Code.GEO_SIGNALS, Code.UAE_CITY, Code.HASHTAG_GEO}
+
+
+@lru_cache(maxsize=4096)
+def render_signal(signal):
+    """
+    Human-readable text for one signal. Only called for display/export.
+    """
+    if signal.code in HASHTAG_LABELS:
+        tag = signal.detail
+        return f"#{tag} = {HASHTAG_LABELS[signal.code]} (+{round(signal.weight, 1)})"
+
+    return TEMPLATES[signal.code].format(
+        k=keyword_text(signal),
+        w=signal.weight,
+        r=round(signal.weight, 1),
+        d=signal.detail,
+    )
+
+
+def render(signals):
+    """
+    Renders a signal list into the breakdown lines shown in the tables.
+    Consecutive hashtag hits share one "Hashtag signals:" line.
+    """
+    lines = []
+    hashtags = []
+
+    for sig in signals:
+        if sig.code in HASHTAG_LABELS:
+            hashtags.append(render_signal(sig))
+            continue
+        if hashtags:
+            lines.append("Hashtag signals: " + " | ".join(hashtags))
+            hashtags = []
+        lines.append(render_signal(sig))
+
+    if hashtags:
+        lines.append("Hashtag signals: " + " | ".join(hashtags))
+
+    return lines
+
+
+def render_text(signals, sep=" | "):
+    return sep.join(render(signals))
+
+
+def has_code(signals, codes):
+    if isinstance(codes, int):
+        codes = {codes}
+    return any(sig.code in codes for sig in signals)
+
+
+def signal_keywords(signals, codes):
+    """
+    Keyword texts carried by signals with one of the given codes, in order.
+    """
+    found = []
+    for sig in signals:
+        if sig.code in codes and sig.keyword >= 0:
+            word = KEYWORDS[sig.keyword]
+            if word not in found:
+                found.append(word)
+    return found
+
+
+def merge(old, new):
+    """
+    Union of two signal lists, keeping first-seen order.
+    """
+    return list(dict.fromkeys(list(old) + list(new)))
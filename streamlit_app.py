@@ -1,7 +1,17 @@
 import streamlit as st
-from ddgs import DDGS
 import pandas as pd
+import numpy as np
 import re
+from collections import namedtuple
+
+from first_pass import confidence_label
+from search_cache import cached_text
+from search_provider import get_provider
+from lead_index import LeadIndex
+from engine import Pipeline, Stage
+from pipeline import search_stage
+from job_view import show_stage_stats
+from resilience import SearchError
 
 if "results" not in st.session_state:
     st.session_state.results = []
@@ -59,54 +69,64 @@ QUERY_BLOCKLIST = {"partner", "ceo", "co-founder"}
 def normalize_url(url):
     return url.split("?")[0].lower().strip()
 
-def score_text(text, query, url=""):
-    text = text.lower()
-    query = query.lower()
-    score = BASE_SCORE
-    breakdown = []
-    signal_groups = set()
+# The playground keeps its own rules instead of first_pass's: the keyword lists
+# above, matched as plain substrings. Each lead's hits are extracted once; the
+# sliders only change PLAYGROUND_WEIGHTS, so stored leads are re-scored from their counts.
+PLAYGROUND_FEATURES = (
+    "base", "primary_identity", "additional_identity", "behavior_keyword",
+    "behavior_synergy", "seniority_keyword", "seniority_bonus", "geo_group",
+)
 
-    identity_hits = [k for k in identity_keywords if k in text]
-    if identity_hits:
-        score += IDENTITY_WEIGHT
-        breakdown.append(f"Primary identity '{identity_hits[0]}' (+{IDENTITY_WEIGHT})")
-        for k in identity_hits[1:]:
-            score += IDENTITY_DIMINISHING_WEIGHT
-            breakdown.append(f"Additional identity '{k}' (+{IDENTITY_DIMINISHING_WEIGHT})")
-        signal_groups.add("Identity")
+PLAYGROUND_WEIGHTS = np.array([
+    BASE_SCORE, IDENTITY_WEIGHT, IDENTITY_DIMINISHING_WEIGHT, BEHAVIOR_WEIGHT,
+    BEHAVIOR_GROUP_BONUS, SENIORITY_WEIGHT, SENIORITY_GROUP_BONUS, GEO_GROUP_BONUS,
+])
+
+PlaygroundFeatures = namedtuple("PlaygroundFeatures", "counts group_count identity behavior seniority")
 
+def extract_playground_features(text):
+    text = text.lower()
+    identity_hits = [k for k in identity_keywords if k in text]
     behavior_hits = [k for k in behavior_keywords if k in text]
-    for k in behavior_hits:
-        score += BEHAVIOR_WEIGHT
+    seniority_hits = [k for k in seniority_keywords if k in text]
+    geo = any(k in text for k in uae_keywords + mena_keywords)
+    synergy = bool(behavior_hits and identity_hits)
+
+    counts = np.array([
+        1, bool(identity_hits), max(len(identity_hits) - 1, 0), len(behavior_hits),
+        synergy, len(seniority_hits), bool(seniority_hits), geo,
+    ], dtype=float)
+    group_count = bool(identity_hits) + synergy + bool(seniority_hits) + geo
+    return PlaygroundFeatures(counts, group_count, identity_hits, behavior_hits, seniority_hits)
+
+def score_playground(X):
+    # Adds the weights term by term in rule order, as the old per-lead running sum did.
+    # X @ PLAYGROUND_WEIGHTS rounds differently and moves some scores across the
+    # 4.0 second-pass cut-off; the loop is over weights, not leads, so it stays cheap
+    X = np.atleast_2d(X)
+    score = np.zeros(len(X))
+    for j, weight in enumerate(PLAYGROUND_WEIGHTS):
+        for k in range(int(X[:, j].max(initial=0))):
+            score = score + (X[:, j] > k) * weight
+    return np.minimum(score, 10.0)
+
+def playground_breakdown(features):
+    breakdown = [f"Signal groups fired: {features.group_count}"]
+    if features.identity:
+        breakdown.append(f"Primary identity '{features.identity[0]}' (+{IDENTITY_WEIGHT})")
+        for k in features.identity[1:]:
+            breakdown.append(f"Additional identity '{k}' (+{IDENTITY_DIMINISHING_WEIGHT})")
+    for k in features.behavior:
         breakdown.append(f"Behavior keyword '{k}' (+{BEHAVIOR_WEIGHT})")
-
-    if behavior_hits and "Identity" in signal_groups:
-        score += BEHAVIOR_GROUP_BONUS
+    if features.behavior and features.identity:
         breakdown.append(f"Identity + behavior synergy (+{BEHAVIOR_GROUP_BONUS})")
-        signal_groups.add("Behavior")
-
-    seniority_hits = [k for k in seniority_keywords if k in text]
-    for k in seniority_hits:
-        score += SENIORITY_WEIGHT
+    for k in features.seniority:
         breakdown.append(f"Seniority keyword '{k}' (+{SENIORITY_WEIGHT})")
-
-    if seniority_hits:
-        score += SENIORITY_GROUP_BONUS
+    if features.seniority:
         breakdown.append(f"Seniority group bonus (+{SENIORITY_GROUP_BONUS})")
-        signal_groups.add("Seniority")
-
-    if any(k in text for k in uae_keywords + mena_keywords):
-        signal_groups.add("Geography")
-
-    if "Geography" in signal_groups:
-        score += GEO_GROUP_BONUS
+    if features.counts[PLAYGROUND_FEATURES.index("geo_group")]:
         breakdown.append(f"Geography group bonus (+{GEO_GROUP_BONUS})")
-
-    score = min(score, 10.0)
-    group_count = len(signal_groups)
-    confidence = "High" if group_count >= 3 else "Medium" if group_count == 2 else "Low"
-    breakdown.insert(0, f"Signal groups fired: {group_count}")
-    return score, confidence, breakdown
+    return " | ".join(breakdown)
 
 def extract_anchors(text):
     anchors = {"identity": [], "behavior": [], "company": []}
@@ -189,78 +209,107 @@ queries = [
     'angel investor "UAE" site:linkedin.com/in'
 ]
 
+def playground_score_stage(lead_index):
+    # Raw titles, first URL wins, scored from playground feature counts
+    def score(item):
+        query, r = item
+        title = r.get("title", "")
+        snippet = r.get("body", "")
+        url = r.get("href", "")
+        if not url:
+            return
+        if lead_index.find(url) is not None:
+            return
+        combined = f"{title} {snippet}"
+        features = extract_playground_features(combined)
+        lead_index.add({
+            "Name": title.split("-")[0].strip(),
+            "Title": title,
+            "Snippet": snippet,
+            "URL": url,
+            "Score": float(score_playground(features.counts)[0]),
+            "Confidence": confidence_label(features.group_count),
+            "Signals": playground_breakdown(features),
+            "Features": features
+        })
+        yield url
+    return score
+
 if st.button("Run Discovery"):
-    with DDGS(timeout=10) as ddgs:
-        for query in queries:
-            for r in ddgs.text(query, max_results=5, backend="html"):
-                title = r.get("title", "")
-                snippet = r.get("body", "")
-                url = r.get("href", "")
-                if not url:
-                    continue
-                norm_url = normalize_url(url)
-                if norm_url in {normalize_url(x["URL"]) for x in st.session_state.results}:
-                    continue
-                combined = f"{title} {snippet}"
-                score, conf, breakdown = score_text(combined, query, url)
-                st.session_state.results.append({
-                    "Name": title.split("-")[0].strip(),
-                    "Title": title,
-                    "Snippet": snippet,
-                    "URL": url,
-                    "Score": score,
-                    "Confidence": conf,
-                    "Signals": " | ".join(breakdown)
-                })
+    lead_index = LeadIndex(st.session_state.results, normalize_url)
+    discovery = Pipeline(
+        Stage("search", search_stage(max_results=5, backend="html")),
+        Stage("score", playground_score_stage(lead_index)),
+    )
+    for _ in discovery.run(queries):
+        pass
+    st.session_state.discovery_stages = discovery.stats_table()
+
+show_stage_stats(st.session_state.get("discovery_stages"))
+
+# Re-score every stored lead against the current sliders (no text processing, no search)
+if st.session_state.results and not freeze_scoring:
+    X = np.vstack([r["Features"].counts for r in st.session_state.results])
+    for r, score in zip(st.session_state.results, score_playground(X)):
+        r["Score"] = float(score)
+        r["Signals"] = playground_breakdown(r["Features"])
 
 df_first = pd.DataFrame(st.session_state.results)
-st.dataframe(df_first, use_container_width=True)
+st.dataframe(df_first.drop(columns=["Features"], errors="ignore"), use_container_width=True)
 
 st.subheader("Identity Verification")
 
+def verify_playground(row):
+    name = row["Name"]
+    anchors = extract_anchors(row["Snippet"])
+    queries_2 = build_second_pass_queries(name, anchors)
+
+    state = {
+        "linkedin_seen": False,
+        "geo_hits": 0,
+        "identity_confirmed": False,
+        "domain_hits": set()
+    }
+
+    partial_alignment = False
+    rows = []
+
+    with get_provider() as ddgs:
+        for idx, q in enumerate(queries_2):
+            if idx == 1 and not partial_alignment:
+                break
+
+            try:
+                results = cached_text(ddgs, q, max_results=20, backend="html")
+            except SearchError:
+                # Failed after retries: drop the candidate rather than judge half its evidence
+                return []
+
+            for r in results:
+                text = f"{r.get('title','')} {r.get('body','')}"
+                url = r.get("href", "")
+                score2, breakdown2, identity_seen = score_second_pass(text, url, state)
+
+                if score2 > 0:
+                    partial_alignment = True
+                    rows.append({
+                        "Name": name,
+                        "Query Used": q,
+                        "Snippet": text,
+                        "Second Pass Score": score2,
+                        "Score Breakdown": " | ".join(breakdown2),
+                        "Source URL": url
+                    })
+
+    return rows
+
 if st.button("Run Second Pass"):
-    with DDGS(timeout=10) as ddgs:
-        for _, row in df_first.iterrows():
-            if row["Score"] < 4.0: continue
-
-            name = row["Name"]
-            anchors = extract_anchors(row["Snippet"])
-            queries_2 = build_second_pass_queries(name, anchors)
-
-            state = {
-                "linkedin_seen": False,
-                "geo_hits": 0,
-                "identity_confirmed": False,
-                "domain_hits": set()
-            }
-
-            partial_alignment = False
-
-            for idx, q in enumerate(queries_2):
-                if idx == 1 and not partial_alignment:
-                    break
-
-                try:
-                    results = ddgs.text(q, max_results=20, backend="html")
-                except Exception:
-                    continue
-
-                for r in results:
-                    text = f"{r.get('title','')} {r.get('body','')}"
-                    url = r.get("href", "")
-                    score2, breakdown2, identity_seen = score_second_pass(text, url, state)
-
-                    if score2 > 0:
-                        partial_alignment = True
-                        st.session_state.second_pass_results.append({
-                            "Name": name,
-                            "Query Used": q,
-                            "Snippet": text,
-                            "Second Pass Score": score2,
-                            "Score Breakdown": " | ".join(breakdown2),
-                            "Source URL": url
-                        })
+    candidates = [row for row in df_first.to_dict("records") if row["Score"] >= 4.0]
+    verification = Pipeline(Stage("verify", verify_playground))
+    st.session_state.second_pass_results.extend(verification.run(candidates))
+    st.session_state.verification_stages = verification.stats_table()
 
+show_stage_stats(st.session_state.get("verification_stages"))
 
 df_second = pd.DataFrame(st.session_state.second_pass_results)
 st.dataframe(df_second, use_container_width=True)
@@ -329,26 +378,27 @@ if not df_second.empty:
     st.subheader("Presence & Contact Enrichment")
 
     if st.button("Run Third Pass Enrichment"):
-        with DDGS(timeout=10) as ddgs:
-            eligible = df_consolidated[df_consolidated["Final Verdict"] != "REJECT"]["Name"].tolist()
-
-            for name in eligible:
-                queries_3 = [
-                    f'site:instagram.com "{name}"',
-                    f'site:x.com "{name}"',
-                    f'site:facebook.com "{name}"',
-                    f'"{name}" email',
-                    f'"{name}" phone'
-                ]
-
-                for q in queries_3:
-                    for r in ddgs.text(q, max_results=2, backend="html"):
-                        st.session_state.third_pass_results.append({
-                            "Name": name,
-                            "Query Used": q,
-                            "Snippet": f"{r.get('title','')} {r.get('body','')}",
-                            "Source URL": r.get("href","")
-                        })
+        eligible = df_consolidated[df_consolidated["Final Verdict"] != "REJECT"]["Name"].tolist()
+
+        queries_3 = {}
+        for name in eligible:
+            for q in [
+                f'site:instagram.com "{name}"',
+                f'site:x.com "{name}"',
+                f'site:facebook.com "{name}"',
+                f'"{name}" email',
+                f'"{name}" phone'
+            ]:
+                queries_3[q] = name
+
+        enrichment = Pipeline(Stage("search", search_stage(max_results=2, backend="html")))
+        for q, r in enrichment.run(list(queries_3)):
+            st.session_state.third_pass_results.append({
+                "Name": queries_3[q],
+                "Query Used": q,
+                "Snippet": f"{r.get('title','')} {r.get('body','')}",
+                "Source URL": r.get("href","")
+            })
 
     df_third = pd.DataFrame(st.session_state.third_pass_results)
     st.dataframe(df_third, use_container_width=True)
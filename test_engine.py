@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+from engine import Pipeline, Stage
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def double(x):
+    yield x * 2
+
+
+def slow_first(x):
+    # Item 0 finishes last
+    time.sleep(0.2 if x == 0 else 0.01)
+    yield x
+
+
+def test_stages_run_in_sequence():
+    pipeline = Pipeline(Stage("double", double), Stage("split", lambda x: [x, x + 1]))
+
+    assert list(pipeline.run(range(3))) == [0, 1, 2, 3, 4, 5]
+    assert [(s["stage"], s["in"], s["out"]) for s in pipeline.stats_table()] == [("double", 3, 3), ("split", 3, 6)]
+
+
+def test_none_output_drops_the_item():
+    pipeline = Pipeline(Stage("odd", lambda x: [x] if x % 2 else None))
+
+    assert list(pipeline.run(range(6))) == [1, 3, 5]
+
+
+def test_ordered_stage_keeps_input_order_with_many_workers():
+    pipeline = Pipeline(Stage("slow", slow_first, workers=4))
+
+    assert list(pipeline.run(range(4))) == [0, 1, 2, 3]
+
+
+def test_unordered_stage_yields_in_completion_order():
+    pipeline = Pipeline(Stage("slow", slow_first, workers=4, ordered=False))
+
+    results = list(pipeline.run(range(4)))
+
+    assert results[-1] == 0
+    assert sorted(results) == [0, 1, 2, 3]
+
+
+def test_stage_error_is_raised_in_the_consumer():
+    def fail_on_two(x):
+        if x == 2:
+            raise ValueError("bad item")
+        yield x
+
+    with pytest.raises(ValueError, match="bad item"):
+        list(Pipeline(Stage("double", double), Stage("fail", fail_on_two, workers=2)).run(range(10)))
+
+
+def test_source_error_is_raised_in_the_consumer():
+    def source():
+        yield 1
+        raise KeyError("source")
+
+    with pytest.raises(KeyError):
+        list(Pipeline(Stage("double", double)).run(source()))
+
+
+def test_closing_early_stops_the_stage_generators():
+    produced = []
+    closed = []
+
+    def searches(query):
+        try:
+            for page in range(100):
+                produced.append((query, page))
+                yield query, page
+        finally:
+            closed.append(query)
+
+    pipeline = Pipeline(Stage("search", searches, queue_size=1))
+    results = pipeline.run(["a", "b"])
+    assert next(results) == ("a", 0)
+    results.close()
+
+    assert wait_for(lambda: closed)
+    # Closed while blocked on the full output queue, long before its 100 pages
+    assert closed == ["a"]
+    assert len(produced) < 100
+    assert ("b", 0) not in produced
+    assert wait_for(lambda: not [t for t in threading.enumerate() if t.name.startswith("search-")])
@@ -0,0 +1,31 @@
+from first_pass import ScoringConfig, score_text, score_text_batch
+from signals import Code, render_text
+
+# 3 behavior keywords + 1 seniority keyword + company, no geography: the terms
+# add up to 4.999..., just under the no-geo threshold of 5.0
+NEAR_THRESHOLD_LEAD = "Jane Doe - Partner at Acme Holdings | LinkedIn. Manages a portfolio, seed funding."
+
+
+def test_lead_just_under_threshold_gets_no_no_geo_penalty():
+    score, confidence, signals = score_text(NEAR_THRESHOLD_LEAD, "")[:3]
+
+    assert score == 4.999999999999999
+    assert confidence == "Low"
+    assert Code.NO_GEO_PENALTY not in {s.code for s in signals}
+
+
+def test_batch_scores_match_single_scores():
+    texts = [NEAR_THRESHOLD_LEAD, NEAR_THRESHOLD_LEAD + " Based in Dubai."]
+    batch = score_text_batch(texts)
+
+    assert list(batch["score"]) == [score_text(t, "")[0] for t in texts]
+
+
+def test_signal_text_shows_configured_weights():
+    text = "Jane Doe - Angel investor | LinkedIn. Location: Dubai"
+    config = ScoringConfig(geo_group_bonus=0.7, mena_location_bonus=1.5)
+    signals = score_text(text, "", "https://ae.linkedin.com/in/jane", config)[2]
+
+    rendered = render_text(signals)
+    assert "UAE LinkedIn domain (+0.7)" in rendered
+    assert "Confirmed MENA Location: dubai (+1.5)" in rendered
@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+
+import resilience
+from resilience import get_guard
+from search_provider import HedgedProvider, SearchProvider
+
+
+class StubBackends(SearchProvider):
+    """
+    Answers with one result naming the backend. Backends in `slow` block until
+    released; backends in `failing` raise.
+    """
+
+    def __init__(self, slow=(), failing=()):
+        self.slow = set(slow)
+        self.failing = set(failing)
+        self.release = threading.Event()
+        self.calls = []
+
+    def text(self, query, max_results=10, backend="auto", **kwargs):
+        self.calls.append(backend)
+        if backend in self.slow:
+            self.release.wait(5)
+        if backend in self.failing:
+            raise ConnectionError(backend)
+        return [{"title": backend, "href": f"https://{backend}.example.com/{query}", "body": ""}]
+
+
+@pytest.fixture(autouse=True)
+def guards(monkeypatch):
+    monkeypatch.setattr(resilience, "_guards", {})
+
+
+def hedged(stub, default_delay=0.5, **options):
+    return HedgedProvider(stub, ["duckduckgo", "brave"], default_delay=default_delay, **options)
+
+
+def answered_by(results):
+    return results[0]["title"]
+
+
+def test_fast_backend_is_not_hedged():
+    stub = StubBackends()
+    provider = hedged(stub)
+
+    assert answered_by(provider.text("q", backend="duckduckgo")) == "duckduckgo"
+    assert stub.calls == ["duckduckgo"]
+    assert provider.stats()["hedged"] == 0
+
+
+def test_request_outside_the_hedged_backends_starts_on_the_first():
+    stub = StubBackends()
+
+    hedged(stub).text("q", backend="lite")
+
+    assert stub.calls == ["duckduckgo"]
+
+
+def test_slow_backend_is_hedged_and_the_backup_wins():
+    stub = StubBackends(slow=["duckduckgo"])
+    provider = hedged(stub)
+
+    try:
+        assert answered_by(provider.text("q", backend="duckduckgo")) == "brave"
+    finally:
+        stub.release.set()
+
+    stats = provider.stats()
+    assert (stats["hedged"], stats["hedge_wins"], stats["failovers"]) == (1, 1, 0)
+
+
+def test_failing_backend_fails_over_before_the_hedge_delay():
+    stub = StubBackends(failing=["duckduckgo"])
+    provider = hedged(stub, default_delay=5.0)
+
+    assert answered_by(provider.text("q", backend="duckduckgo")) == "brave"
+    assert provider.stats()["failovers"] == 1
+
+
+def test_error_when_every_backend_fails():
+    provider = hedged(StubBackends(failing=["duckduckgo", "brave"]))
+
+    with pytest.raises(ConnectionError):
+        provider.text("q", backend="duckduckgo")
+
+
+def test_backend_with_open_breaker_is_skipped():
+    stub = StubBackends()
+    provider = hedged(stub)
+    get_guard("duckduckgo").state = "open"
+
+    assert answered_by(provider.text("q", backend="duckduckgo")) == "brave"
+    assert stub.calls == ["brave"]
+    assert provider.stats()["failovers"] == 1
+
+
+def test_hedge_delay_follows_the_backends_latency_percentile():
+    provider = hedged(StubBackends(), min_samples=10)
+    assert provider.hedge_delay("duckduckgo") == 0.5
+
+    provider._latency["duckduckgo"].extend(i / 100 for i in range(1, 11))
+
+    assert provider.hedge_delay("duckduckgo") == 0.1
+    assert provider.hedge_delay("brave") == 0.5
@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+
+from jobs import JobRunner
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "jobs.sqlite3")
+
+
+def blocked_job(release, started=None):
+    def run(job):
+        if started is not None:
+            started.set()
+        release.wait(5)
+        return {"ok": True}
+    return run
+
+
+def test_result_and_progress_are_stored(path):
+    runner = JobRunner(path)
+
+    def run(job, n):
+        job.progress(n, n, "halfway there")
+        return {"n": n}
+
+    job = runner.wait(runner.submit("discovery", "ws", run, 3), timeout=5)
+
+    assert job["status"] == "done"
+    assert job["result"] == {"n": 3}
+    assert (job["done"], job["total"], job["message"]) == (3, 3, "halfway there")
+
+
+def test_failures_are_recorded(path):
+    runner = JobRunner(path)
+
+    def run(job):
+        raise ValueError("bad query")
+
+    job = runner.wait(runner.submit("discovery", "ws", run), timeout=5)
+
+    assert job["status"] == "failed"
+    assert job["error"] == "ValueError: bad query"
+
+
+def test_unserializable_result_fails_the_job(path):
+    runner = JobRunner(path)
+
+    job = runner.wait(runner.submit("discovery", "ws", lambda job: {"leads": {object()}}), timeout=5)
+
+    assert job["status"] == "failed"
+    assert not runner.active("ws")
+
+
+def test_jobs_left_active_by_a_previous_process_are_interrupted(path):
+    release = threading.Event()
+    started = threading.Event()
+    old = JobRunner(path)
+    running = old.submit("discovery", "ws", blocked_job(release, started))
+    queued = old.submit("verification", "ws", blocked_job(release))
+    assert started.wait(5)
+
+    # A restart: the new runner cannot finish the old process's jobs
+    new = JobRunner(path)
+
+    assert new.get(running)["status"] == "interrupted"
+    assert new.get(queued)["status"] == "interrupted"
+    assert new.active("ws") == []
+    release.set()
+    old.wait(queued, timeout=5)
+
+
+def test_jobs_of_a_workspace_run_one_after_another(path):
+    runner = JobRunner(path, max_workers=2)
+    release = threading.Event()
+    started = threading.Event()
+    first = runner.submit("discovery", "a", blocked_job(release, started))
+    second = runner.submit("verification", "a", blocked_job(release))
+    assert started.wait(5)
+
+    # Workspace "a" holds one pool worker; "b" gets the other
+    other = runner.wait(runner.submit("discovery", "b", lambda job: {}), timeout=5)
+
+    assert other["status"] == "done"
+    assert runner.get(first)["status"] == "running"
+    assert runner.get(second)["status"] == "queued"
+
+    release.set()
+    assert runner.wait(second, timeout=5)["status"] == "done"
+    assert runner.latest("a")["id"] == second
@@ -0,0 +1,105 @@
+import pytest
+
+from lead_store import LeadStore, canonical_url
+from signals import Code, Signal, keyword_id, keyword_text
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LeadStore(str(tmp_path / "leads.sqlite3"))
+
+
+def lead(name, url, score=5.0, **extra):
+    return {"Name": name, "URL": url, "Score": score, **extra}
+
+
+def test_canonical_url_ignores_protocol_query_and_country_subdomain():
+    assert canonical_url("https://ae.linkedin.com/in/jane/?trk=x") == "linkedin.com/in/jane"
+    assert canonical_url("http://www.Example.com/Jane/") == "example.com/jane"
+
+
+def test_save_leads_inserts_then_updates_in_place(store):
+    record = lead("Jane Doe", "https://linkedin.com/in/jane")
+    store.save_leads("ws", [record])
+    assert record["_id"] is not None
+
+    record["Score"] = 7.5
+    store.save_leads("ws", [record])
+
+    assert store.count_leads("ws") == 1
+    assert store.leads("ws")[0]["Score"] == 7.5
+
+
+def test_find_lead_matches_canonical_url(store):
+    store.save_leads("ws", [lead("Jane Doe", "https://ae.linkedin.com/in/jane")])
+
+    assert store.find_lead("ws", "linkedin.com/in/jane/?trk=x")["Name"] == "Jane Doe"
+    assert store.find_lead("ws", "linkedin.com/in/john") is None
+
+
+def test_workspaces_are_separate(store):
+    store.save_leads("a", [lead("Jane Doe", "https://example.com/jane")])
+    store.add_evidence("a", [{"Name": "Jane Doe", "Source URL": "https://example.com/jane"}])
+
+    assert store.leads("b") == []
+    assert store.evidence("b") == []
+    assert store.verified_names("a") == {"Jane Doe"}
+
+
+def test_signals_survive_a_restart(tmp_path):
+    path = str(tmp_path / "leads.sqlite3")
+    signals = [Signal(Code.GEO_SUPPORT, keyword_id("dubai"), 1.5), Signal(Code.NO_GEO_PENALTY, weight=-1.0)]
+    LeadStore(path).save_leads("ws", [lead("Jane Doe", "https://example.com/jane", Signals=signals)])
+
+    stored = LeadStore(path).leads("ws")[0]["Signals"]
+
+    assert stored == signals
+    assert keyword_text(stored[0]) == "dubai"
+
+
+def test_replace_leads_swaps_the_workspace(store):
+    store.save_leads("ws", [lead("Jane Doe", "https://example.com/jane")])
+    store.replace_leads("ws", [lead("John Roe", "https://example.com/john")])
+
+    assert [r["Name"] for r in store.leads("ws")] == ["John Roe"]
+
+
+def test_verdicts_are_upserted_by_name(store):
+    store.put_verdicts("ws", [{"Name": "Jane Doe", "Final Score": 6.0, "Final Verdict": "GOOD"}])
+    store.put_verdicts("ws", [
+        {"Name": "Jane Doe", "Final Score": 9.0, "Final Verdict": "GREAT"},
+        {"Name": "John Roe", "Final Score": 2.0, "Final Verdict": "REJECT"},
+    ])
+
+    assert store.verdict_counts("ws") == {"GREAT": 1, "REJECT": 1}
+    assert [r["Name"] for r in store.verdicts("ws", "GREAT")] == ["Jane Doe"]
+
+
+def test_verdicts_go_stale_when_leads_or_evidence_change(store):
+    assert store.verdicts_stale("ws")
+
+    store.save_leads("ws", [lead("Jane Doe", "https://example.com/jane")])
+    store.put_verdicts("ws", [], revision=store.revision("ws"))
+    assert not store.verdicts_stale("ws")
+
+    store.add_evidence("ws", [{"Name": "Jane Doe"}])
+    assert store.verdicts_stale("ws")
+
+
+def test_verdicts_computed_before_a_write_stay_stale(store):
+    revision = store.revision("ws")
+    store.save_leads("ws", [lead("Jane Doe", "https://example.com/jane")])
+    store.put_verdicts("ws", [], revision=revision)
+
+    assert store.verdicts_stale("ws")
+
+
+def test_clear_empties_the_workspace(store):
+    store.save_leads("ws", [lead("Jane Doe", "https://example.com/jane")])
+    store.add_evidence("ws", [{"Name": "Jane Doe"}])
+    store.put_verdicts("ws", [{"Name": "Jane Doe", "Final Verdict": "GOOD"}], revision=store.revision("ws"))
+
+    store.clear("ws")
+
+    assert store.leads("ws") == [] and store.evidence("ws") == [] and store.verdicts("ws") == []
+    assert store.verdicts_stale("ws")
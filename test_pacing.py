@@ -0,0 +1,93 @@
+import pytest
+
+import pacing
+from pacing import AdaptivePacer, TokenBucket
+
+
+class FakeClock:
+    """
+    Stands in for the time module inside pacing: sleeping only moves the clock.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(pacing, "time", clock)
+    return clock
+
+
+def test_bucket_allows_a_burst_then_paces(clock):
+    bucket = TokenBucket(rate=2.0, burst=2)
+
+    waits = [bucket.reserve() for _ in range(4)]
+
+    assert waits == [0.0, 0.0, 0.5, 1.0]
+
+
+def test_acquire_sleeps_until_the_token_is_due(clock):
+    bucket = TokenBucket(rate=4.0, burst=1)
+
+    for _ in range(3):
+        bucket.acquire()
+
+    assert clock.sleeps == [0.25, 0.25]
+    assert clock.now == 0.5
+
+
+def test_success_increases_the_rate_additively_up_to_max(clock):
+    pacer = AdaptivePacer(rate=1.0, max_rate=1.25, increase=0.1)
+
+    pacer.success()
+    assert pacer.rate == pytest.approx(1.1)
+    pacer.success()
+    pacer.success()
+    assert pacer.rate == 1.25
+    assert pacer.stats()["successes"] == 3
+
+
+def test_failures_decrease_the_rate_multiplicatively_down_to_min(clock):
+    pacer = AdaptivePacer(rate=4.0, min_rate=0.2, backoff=0.5, ratelimit_backoff=0.25)
+
+    pacer.failure("timeout")
+    assert pacer.rate == 2.0
+    pacer.failure("error")
+    assert pacer.rate == 1.0
+    pacer.failure("ratelimit")
+    assert pacer.rate == 0.25
+    pacer.failure("ratelimit")
+    assert pacer.rate == 0.2
+
+    stats = pacer.stats()
+    assert (stats["timeout"], stats["error"], stats["ratelimit"]) == (1, 1, 2)
+
+
+def test_rate_limit_empties_the_bucket(clock):
+    pacer = AdaptivePacer(rate=1.0, burst=2, ratelimit_backoff=0.5)
+
+    pacer.failure("ratelimit")
+
+    # No burst left: the next call waits a full interval at the lower rate
+    assert pacer.reserve() == 2.0
+
+
+def test_rate_change_keeps_tokens_earned_at_the_old_rate(clock):
+    pacer = AdaptivePacer(rate=1.0, burst=1, backoff=0.5)
+    pacer.reserve()
+
+    clock.now = 0.5
+    pacer.failure("timeout")
+
+    # Half a token earned at 1/s; the other half takes a second at 0.5/s
+    assert pacer.reserve() == pytest.approx(1.0)
@@ -0,0 +1,24 @@
+from search_provider import RecordingProvider, ReplayProvider, SearchProvider
+
+
+class StubProvider(SearchProvider):
+    def text(self, query, max_results=10, backend="auto", **kwargs):
+        return [{"title": query, "href": f"https://example.com/{backend}", "body": ""}]
+
+
+def test_replay_serves_what_was_recorded(tmp_path):
+    log = str(tmp_path / "search_log.jsonl")
+    recorded = RecordingProvider(StubProvider(), log).text("q", max_results=5, backend="html")
+
+    replay = ReplayProvider(log, latency=0)
+
+    assert replay.text("q", max_results=5, backend="html") == recorded
+    assert replay.text("q", max_results=10, backend="html") == []
+    assert replay.misses == 1
+
+
+def test_replay_ignores_other_search_options(tmp_path):
+    log = str(tmp_path / "search_log.jsonl")
+    recorded = RecordingProvider(StubProvider(), log).text("q", region="ae-en")
+
+    assert ReplayProvider(log, latency=0).text("q", region="ae-en", page=2) == recorded
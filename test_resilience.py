@@ -0,0 +1,173 @@
+import pytest
+
+import resilience
+from resilience import SearchError, SearchGuard, get_guard, guard_stats
+from search_provider import DDGSProvider
+
+
+class FakeClock:
+    """
+    Stands in for the time module inside resilience: sleeping only moves the clock.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakePacer:
+    def __init__(self):
+        self.reports = []
+
+    def acquire(self):
+        pass
+
+    def success(self):
+        self.reports.append("success")
+
+    def failure(self, kind="error"):
+        self.reports.append(kind)
+
+
+class ScriptedProvider(DDGSProvider):
+    """
+    DDGSProvider whose backend answers with the given outcomes in turn:
+    an exception is raised, anything else is returned as the results.
+    """
+
+    def __init__(self, *outcomes, guard=None):
+        super().__init__(pacer=FakePacer(), guard=guard)
+        self.outcomes = list(outcomes)
+        self.attempts = 0
+
+    def _text(self, query, **kwargs):
+        self.attempts += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+RESULTS = [{"title": "Jane Doe", "href": "https://example.com/jane", "body": ""}]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resilience, "time", clock)
+    # Largest delay full jitter can pick, so backoff is deterministic
+    monkeypatch.setattr(resilience.random, "uniform", lambda low, high: high)
+    monkeypatch.setattr(resilience, "_guards", {})
+    return clock
+
+
+def test_retries_with_exponential_backoff(clock):
+    guard = SearchGuard(retries=2, base_delay=1.0)
+    provider = ScriptedProvider(TimeoutError(), TimeoutError(), RESULTS, guard=guard)
+
+    assert provider.text("q") == RESULTS
+    assert provider.attempts == 3
+    assert clock.sleeps == [1.0, 2.0]
+    assert provider.pacer.reports == ["timeout", "timeout", "success"]
+    assert guard.stats()["retries"] == 2
+
+
+def test_backoff_is_capped(clock):
+    guard = SearchGuard(base_delay=1.0, max_delay=20.0)
+
+    assert [guard.backoff(attempt) for attempt in range(7)] == [1.0, 2.0, 4.0, 8.0, 16.0, 20.0, 20.0]
+
+
+def test_gives_up_after_retries(clock):
+    guard = SearchGuard(retries=1, failure_threshold=10)
+    provider = ScriptedProvider(ConnectionError(), ConnectionError(), guard=guard)
+
+    with pytest.raises(SearchError) as error:
+        provider.text("q")
+
+    assert error.value.kind == "error"
+    assert provider.attempts == 2
+    assert guard.stats()["gave_up"] == 1
+
+
+def test_parse_errors_are_not_retried_and_do_not_trip_the_breaker(clock):
+    guard = SearchGuard(retries=2, failure_threshold=2)
+    provider = ScriptedProvider(ValueError(), ValueError(), ValueError(), guard=guard)
+
+    for _ in range(3):
+        with pytest.raises(SearchError) as error:
+            provider.text("q")
+        assert error.value.kind == "parse"
+
+    assert provider.attempts == 3
+    assert guard.state == "closed"
+    assert guard.stats()["parse"] == 3
+    # An unparsable page says nothing about load either
+    assert provider.pacer.reports == []
+
+
+def test_breaker_opens_then_half_open_trial_closes_it(clock):
+    guard = SearchGuard(retries=0, failure_threshold=2, cooldown=30.0)
+    provider = ScriptedProvider(TimeoutError(), TimeoutError(), RESULTS, guard=guard)
+
+    for _ in range(2):
+        with pytest.raises(SearchError):
+            provider.text("q")
+    assert guard.state == "open"
+    assert guard.opened_until == 30.0
+
+    clock.now = 30.0
+    assert provider.text("q") == RESULTS
+    assert guard.state == "closed"
+    assert guard.stats()["trips"] == 1
+
+
+def test_failed_half_open_trial_opens_the_breaker_again(clock):
+    guard = SearchGuard(retries=0, failure_threshold=1, cooldown=30.0)
+    provider = ScriptedProvider(TimeoutError(), TimeoutError(), guard=guard)
+
+    with pytest.raises(SearchError):
+        provider.text("q")
+    clock.now = 30.0
+    with pytest.raises(SearchError):
+        provider.text("q")
+
+    assert guard.state == "open"
+    assert guard.opened_until == 60.0
+    assert guard.stats()["trips"] == 2
+
+
+def test_parse_error_on_half_open_trial_closes_the_breaker(clock):
+    guard = SearchGuard(retries=0, failure_threshold=1, cooldown=30.0)
+    provider = ScriptedProvider(TimeoutError(), ValueError(), guard=guard)
+
+    with pytest.raises(SearchError):
+        provider.text("q")
+    clock.now = 30.0
+    with pytest.raises(SearchError):
+        provider.text("q")
+
+    assert guard.state == "closed"
+
+
+def test_guards_are_per_backend(clock):
+    failing = ScriptedProvider(TimeoutError(), TimeoutError(), TimeoutError())
+    healthy = ScriptedProvider(RESULTS)
+    get_guard("bing").retries = 0
+    get_guard("bing").failure_threshold = 3
+
+    for _ in range(3):
+        with pytest.raises(SearchError):
+            failing.text("q", backend="bing")
+
+    assert get_guard("bing").state == "open"
+    assert healthy.text("q", backend="brave") == RESULTS
+    assert get_guard("brave").state == "closed"
+    assert guard_stats()["open"] == ["bing"]
@@ -0,0 +1,128 @@
+import json
+
+import pytest
+
+import search_cache
+from search_cache import SearchCache, cached_text, iter_cached_text
+from search_provider import SearchProvider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+class StubProvider(SearchProvider):
+    """
+    Answers every query with `count` results and counts the calls.
+    """
+
+    def __init__(self, count=3, error=None):
+        self.count = count
+        self.error = error
+        self.calls = 0
+
+    def text(self, query, max_results=10, backend="auto", **kwargs):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return [{"title": f"{query} {i}", "href": f"https://example.com/{i}", "body": ""} for i in range(self.count)]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(search_cache, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return SearchCache(str(tmp_path / "cache.sqlite3"), ttl=60)
+
+
+def test_repeated_query_is_served_from_cache(cache):
+    provider = StubProvider()
+
+    first = cached_text(provider, "q", cache=cache)
+    second = cached_text(provider, "q", cache=cache)
+
+    assert first == second
+    assert provider.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_key_includes_backend_and_max_results(cache):
+    provider = StubProvider()
+
+    cached_text(provider, "q", max_results=10, backend="lite", cache=cache)
+    cached_text(provider, "q", max_results=20, backend="lite", cache=cache)
+    cached_text(provider, "q", max_results=10, backend="html", cache=cache)
+
+    assert provider.calls == 3
+
+
+def test_entries_expire_after_ttl(cache, clock):
+    cache.put("q", "auto", 10, [{"href": "a"}])
+
+    clock.now += 60
+    assert cache.get("q", "auto", 10) == [{"href": "a"}]
+
+    clock.now += 1
+    assert cache.get("q", "auto", 10) is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    entry_size = len(json.dumps([{"href": "a"}]))
+    cache = SearchCache(str(tmp_path / "cache.sqlite3"), ttl=None, max_bytes=2 * entry_size)
+
+    cache.put("old", "auto", 10, [{"href": "a"}])
+    clock.now += 1
+    cache.put("newer", "auto", 10, [{"href": "a"}])
+    clock.now += 1
+    # Reading "old" makes "newer" the least recently used
+    cache.get("old", "auto", 10)
+    clock.now += 1
+    cache.put("newest", "auto", 10, [{"href": "a"}])
+
+    assert cache.get("newer", "auto", 10) is None
+    assert cache.get("old", "auto", 10) is not None
+    assert cache.get("newest", "auto", 10) is not None
+    assert cache.evictions == 1
+
+
+def test_stream_read_to_the_end_is_cached(cache):
+    provider = StubProvider()
+
+    streamed = list(iter_cached_text(provider, "q", cache=cache))
+
+    assert cache.get("q", "auto", 10) == streamed
+
+
+def test_stream_closed_early_is_not_cached(cache):
+    stream = iter_cached_text(StubProvider(), "q", cache=cache)
+    next(stream)
+    stream.close()
+
+    assert cache.get("q", "auto", 10) is None
+
+
+def test_failed_search_is_not_cached(cache):
+    with pytest.raises(TimeoutError):
+        list(iter_cached_text(StubProvider(error=TimeoutError()), "q", cache=cache))
+
+    assert cache.get("q", "auto", 10) is None
+
+
+def test_uncacheable_provider_bypasses_the_cache(cache):
+    provider = StubProvider()
+    provider.cacheable = False
+
+    cached_text(provider, "q", cache=cache)
+    list(iter_cached_text(provider, "q", cache=cache))
+
+    assert provider.calls == 2
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,67 @@
+import second_pass
+from search_cache import search_text
+
+
+def build_queries(candidate):
+    """
+    Second-pass queries for a candidate, built from the anchors in its snippet.
+    """
+    anchors = second_pass.extract_anchors(candidate.get("Snippet", ""))
+    return second_pass.build_second_pass_queries(candidate["Name"], anchors, candidate.get("Enriched Company", ""))
+
+
+def verify_candidate(candidate, queries=None, search=search_text, max_results=20, backend="html", max_queries=None,
+                     stop_early=True, skip_url=None, dedupe_urls=True):
+    """
+    Runs one candidate's second-pass queries in order and scores every result.
+    Queries for a single candidate stay sequential because early stopping
+    depends on the state built by earlier results; concurrency across
+    candidates comes from the pipeline's verify stage workers, paced by the
+    search provider.
+    queries: precomputed by build_queries, built here when None.
+    skip_url: optional predicate for URLs that should never be scored.
+    Returns (candidate, evidence_rows). A query that still fails after the provider's
+    retries raises resilience.SearchError: scoring on the remaining queries would
+    understate the candidate.
+    """
+    name = candidate["Name"]
+    if queries is None:
+        queries = build_queries(candidate)
+
+    state = second_pass.new_state(name)
+    seen_urls = set()
+    rows = []
+
+    for q in queries[:max_queries]:
+        # Rate Limiting / optimization
+        if stop_early and state["identity_confirmed"] and state["geo_hits"] >= 1:
+            break
+
+        results = search(q, max_results, backend)
+
+        for r in results:
+            url = r.get("href", "")
+            if not url:
+                continue
+
+            if skip_url and skip_url(url):
+                continue
+            if dedupe_urls:
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+
+            text = f"{r.get('title', '')} {r.get('body', '')}"
+            score2, breakdown2, _ = second_pass.score_second_pass(text, url, state)
+
+            if score2 > 0:
+                rows.append({
+                    "Name": name,
+                    "Query Used": q,
+                    "Snippet": text,
+                    "Second Pass Score": score2,
+                    "Score Breakdown": breakdown2,
+                    "Source URL": url
+                })
+
+    return candidate, rows